@@ -0,0 +1,217 @@
+"""
+Reproducible benchmarks of the delivery_network package.
+
+For each network (the network.x.in files of input/ and generated random graphs), times the loading,
+the component index and connected_components_set (both built from scratch at each run), kruskal,
+single min_power / min_power_kruskal queries and batch queries on a seeded set of queries, after warm-up runs. The point-to-point searches (get_path_with_power and its
+bidirectional and landmark variants) are timed with two power limits, the min_power of each query (operation@min_power)
+and the median power of the edges (operation@median), and also report the mean number of nodes expanded per query.
+Results are written as JSON or CSV (depending on the extension of --output) and can be compared with
+a previous run with --compare.
+
+Usage (from the root folder):
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --output bench2.json --compare bench.json
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "delivery_network"))
+
+from graph import BASE_PATH, graph_from_file
+from csr_graph import CSRGraph
+from tree_index import TreeIndex
+import instrumentation
+
+
+def timings(function, repeat=3, warmup=1):
+    """Runs function warmup times, then returns the durations (in seconds) of repeat more runs."""
+    for _ in range(warmup):
+        function()
+    durations = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - t0)
+    return durations
+
+
+def record(network, g, operation, durations, nb_queries=None, **extra):
+    result = {
+        "network": network,
+        "nb_nodes": g.nb_nodes,
+        "nb_edges": g.nb_edges,
+        "operation": operation,
+        "repeat": len(durations),
+        "min_s": min(durations),
+        "median_s": float(np.median(durations)),
+        "mean_s": float(np.mean(durations)),
+    }
+    if nb_queries:
+        result["per_query_s"] = result["median_s"] / nb_queries
+    result.update(extra)
+    return result
+
+
+def expansions(function, name):
+    """Runs function once with the instrumentation enabled and returns the number of nodes expanded by the searches name."""
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        function()
+        return instrumentation.counters[name + ".expanded"]
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+
+def cold(g, function):
+    """
+    Returns a function which forgets the component index of g (see Graph.component_index) before calling function,
+    so that each timed run builds it again instead of reading the index cached by the warm-up run.
+    """
+    def run():
+        g.components = None
+        return function()
+    return run
+
+
+def random_graph(nb_nodes, nb_edges, seed=0):
+    """
+    Returns a connected random CSRGraph: a random tree plus nb_edges - nb_nodes + 1 random edges, with random powers and distances.
+    """
+    rng = np.random.default_rng(seed)
+    # Arbre aléatoire : chaque node i > 0 est reliée à une node de numéro plus petit
+    tree_parent = (rng.random(nb_nodes - 1) * np.arange(1, nb_nodes)).astype(np.int64)
+    extra = max(0, nb_edges - nb_nodes + 1)
+    node1 = np.concatenate((np.arange(1, nb_nodes), rng.integers(0, nb_nodes, extra)))
+    node2 = np.concatenate((tree_parent, rng.integers(0, nb_nodes, extra)))
+    power = rng.integers(1, 10 ** 6, len(node1))
+    dist = rng.integers(1, 10 ** 4, len(node1)).astype(np.float64)
+    return CSRGraph(list(range(1, nb_nodes + 1)), node1, node2, power, dist)
+
+
+def bench_graph(network, g, load=None, nb_queries=1000, nb_single=10, repeat=3, seed=0):
+    """
+    Benchmarks one graph (a CSRGraph). load is an optional function reloading the graph from its file.
+    nb_single queries are timed one by one with min_power (full search) and min_power_kruskal,
+    nb_queries are answered together with TreeIndex.power_batch.
+    """
+    results = []
+    if load is not None:
+        results.append(record(network, g, "load", timings(load, repeat)))
+    results.append(record(network, g, "component_labels", timings(g.component_labels, repeat)))
+    results.append(record(network, g, "component_index", timings(cold(g, g.component_index), repeat)))
+    results.append(record(network, g, "connected_components_set", timings(cold(g, g.connected_components_set), repeat)))
+    results.append(record(network, g, "kruskal", timings(g.kruskal, repeat)))
+    tree = g.kruskal()
+    results.append(record(network, g, "tree_index", timings(lambda: TreeIndex(tree), repeat)))
+    tree.tree_index = TreeIndex(tree)
+    rng = np.random.default_rng(seed)
+    queries = rng.integers(0, g.nb_nodes, size=(nb_queries, 2))
+    srcs = [g.nodes[i] for i in queries[:, 0].tolist()]
+    dests = [g.nodes[i] for i in queries[:, 1].tolist()]
+    single = list(zip(srcs, dests))[:nb_single]
+    # Sans cache des requêtes, chaque répétition refait vraiment les recherches
+    g.cache_queries(0)
+    results.append(record(network, g, "min_power", timings(lambda: [g.min_power(a, b) for a, b in single], repeat), len(single)))
+    # Plus court chemin sous contrainte de puissance : recherche simple, bidirectionnelle et A* avec landmarks.
+    # Deux limites réalistes : la puissance minimale de chaque trajet (la plus serrée possible) et la puissance médiane
+    # des arêtes. Avec la puissance maximale, aucune arête ne serait jamais écartée.
+    min_powers = tree.tree_index.power_batch([a for a, b in single], [b for a, b in single]).tolist()
+    median = np.median(g.edge_power).item()
+    limits = {"min_power": [max(p, 0) for p in min_powers], "median": [median] * len(single)}
+    results.append(record(network, g, "build_landmarks", timings(g.build_landmarks, repeat)))
+    for method in ("get_path_with_power", "bidirectional_path_with_power", "alt_path_with_power"):
+        search = getattr(g, method)
+        for limit, powers in limits.items():
+            function = lambda: [search(a, b, power) for (a, b), power in zip(single, powers)]
+            results.append(record(network, g, method + "@" + limit, timings(function, repeat), len(single),
+                                  expanded=expansions(function, method) / len(single)))
+    results.append(record(network, g, "min_power_kruskal", timings(lambda: [tree.min_power_kruskal(a, b) for a, b in single], repeat), len(single)))
+    results.append(record(network, g, "power_batch", timings(lambda: tree.tree_index.power_batch(srcs, dests), repeat), nb_queries))
+    return results
+
+
+def run(networks=None, synthetic=((10 ** 5, 3 * 10 ** 5),), nb_queries=1000, nb_single=10, repeat=3, seed=0):
+    """
+    Runs the benchmarks on the given network files (all the input/network.*.in files by default)
+    and on random graphs of the given (nb_nodes, nb_edges) sizes. Returns the list of the results.
+    """
+    if networks is None:
+        networks = sorted(os.path.relpath(path, BASE_PATH) for path in glob.glob(os.path.join(BASE_PATH, "input", "network.*.in")))
+    results = []
+    for filename in networks:
+        g = graph_from_file(filename, csr=True)
+        results.append(record(filename, g, "load_graph", timings(lambda: graph_from_file(filename), repeat)))
+        results += bench_graph(filename, g, lambda: graph_from_file(filename, csr=True), nb_queries, nb_single, repeat, seed)
+    for nb_nodes, nb_edges in synthetic:
+        g = random_graph(nb_nodes, nb_edges, seed)
+        results += bench_graph(f"random-{nb_nodes}-{nb_edges}", g, None, nb_queries, nb_single, repeat, seed)
+    return results
+
+
+def save(results, filename):
+    """Writes the results in filename, as CSV if its extension is .csv and as JSON otherwise."""
+    if filename.endswith(".csv"):
+        fields = sorted({key for result in results for key in result})
+        with open(filename, "w", newline="") as fichier:
+            writer = csv.DictWriter(fichier, fields)
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(filename, "w") as fichier:
+            json.dump(results, fichier, indent=1)
+
+
+def load(filename):
+    """Reads results written by save."""
+    if filename.endswith(".csv"):
+        with open(filename, newline="") as fichier:
+            return [{key: value if key in ("network", "operation") else float(value) for key, value in row.items() if value != ""} for row in csv.DictReader(fichier)]
+    with open(filename) as fichier:
+        return json.load(fichier)
+
+
+def compare(results, previous):
+    """Returns the lines (network, operation, previous median, new median, ratio) of the operations present in both runs."""
+    before = {(result["network"], result["operation"]): result["median_s"] for result in previous}
+    lines = []
+    for result in results:
+        key = (result["network"], result["operation"])
+        if key in before:
+            lines.append((key[0], key[1], before[key], result["median_s"], result["median_s"] / before[key] if before[key] else float("inf")))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--networks", nargs="*", help="network files (default: all input/network.*.in)")
+    parser.add_argument("--synthetic", nargs="*", default=["100000x300000"], help="sizes of random graphs, as NODESxEDGES")
+    parser.add_argument("--queries", type=int, default=1000, help="number of batch queries")
+    parser.add_argument("--single", type=int, default=10, help="number of single queries")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", help="previous results to compare with")
+    args = parser.parse_args(argv)
+    synthetic = [tuple(int(x) for x in size.split("x")) for size in args.synthetic]
+    results = run(args.networks, synthetic, args.queries, args.single, args.repeat, args.seed)
+    save(results, args.output)
+    for result in results:
+        expanded = f" ({result['expanded']:.0f} nodes expanded per query)" if "expanded" in result else ""
+        print(f"{result['network']:>24} {result['operation']:>26} {result['median_s']:.6f} s{expanded}")
+    if args.compare:
+        for network, operation, before, after, ratio in compare(results, load(args.compare)):
+            print(f"{network:>24} {operation:>26} {before:.6f} s -> {after:.6f} s (x{ratio:.2f})")
+    return results
+
+
+if __name__ == "__main__":
+    main()
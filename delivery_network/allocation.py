@@ -0,0 +1,159 @@
+import sys
+import numpy as np
+from graph import routes_from_file, trucks_from_file
+from network_cache import load_network
+
+# Budget de l'entreprise pour acheter les camions
+BUDGET = 25 * 10 ** 9
+
+
+def prune_trucks(power, cost):
+    """
+    Removes the dominated trucks of a catalog: a truck is dominated when another one has at least its power for no more cost.
+
+    Outputs:
+    -----------
+    models: numpy.ndarray
+        The positions in the catalog of the remaining trucks, sorted by increasing power (and then increasing cost).
+    """
+    power, cost = np.asarray(power), np.asarray(cost)
+    # Par puissance décroissante (et coût croissant), un camion est gardé s'il est strictement moins cher que tous les précédents
+    order = np.lexsort((cost, -power))
+    cheapest_before = np.minimum.accumulate(cost[order])
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = cost[order][1:] < cheapest_before[:-1]
+    return order[keep][::-1]
+
+
+def cheapest_trucks(route_power, power, cost, models=None):
+    """
+    Returns for each route the position in the catalog of the cheapest truck whose power is at least route_power,
+    with a binary search on the pruned catalog. Routes that no truck can cover (or with a negative power,
+    i.e. unreachable) get -1.
+    """
+    if models is None:
+        models = prune_trucks(power, cost)
+    route_power = np.asarray(route_power)
+    # Dans le catalogue élagué, coûts et puissances sont croissants : le premier camion assez puissant est le moins cher
+    position = np.searchsorted(np.asarray(power)[models], route_power, side='left')
+    covered = (position < len(models)) & (route_power >= 0)
+    truck = np.full(len(route_power), -1, dtype=np.int64)
+    truck[covered] = models[position[covered]]
+    return truck
+
+
+def greedy_selection(utility, cost, budget):
+    """
+    Selects routes by decreasing utility / cost ratio, as long as they fit in the budget.
+    Returns the positions of the selected routes.
+    """
+    utility, cost = np.asarray(utility, dtype=np.float64), np.asarray(cost, dtype=np.float64)
+    # Un trajet gratuit a un ratio infini : il passe en premier
+    with np.errstate(divide='ignore', invalid='ignore'):
+        order = np.argsort(-utility / cost, kind='stable')
+    # Tant que tout rentre, on prend un préfixe entier d'un coup
+    total = np.cumsum(cost[order])
+    nb = int(np.searchsorted(total, budget, side='right'))
+    selected = order[:nb].tolist()
+    remaining = budget - (total[nb - 1] if nb else 0)
+    for i in order[nb:].tolist():
+        if cost[i] <= remaining:
+            selected.append(i)
+            remaining -= cost[i]
+    return np.array(selected, dtype=np.int64)
+
+
+def knapsack_selection(utility, cost, budget, precision=None):
+    """
+    Selects the routes of maximal total utility within the budget with a dynamic programming knapsack.
+    Costs are rounded up to multiples of precision (budget / 10 000 by default), hence the selection always fits
+    in the budget and is optimal for the rounded costs (exact with precision=1 for integer costs), then the budget
+    left by the rounding is filled with greedy_selection. Routes of zero cost are always selected when their utility
+    is positive. The cost of the dynamic programming is O(number of routes * budget / precision).
+    Returns the positions of the selected routes.
+    """
+    if np.sum(cost) <= budget:
+        return np.arange(len(cost), dtype=np.int64)
+    if precision is None:
+        precision = max(1, budget / 10000)
+    capacity = int(budget // precision)
+    utility = np.asarray(utility, dtype=np.float64)
+    weight = np.ceil(np.asarray(cost, dtype=np.float64) / precision).astype(np.int64)
+    # Les trajets gratuits (poids nul) n'entrent pas dans la programmation dynamique : ils sont pris s'ils rapportent
+    free = weight <= 0
+    taken = np.flatnonzero(free & (utility > 0))
+    # Parmi les trajets de même poids, seuls les capacity // poids plus utiles peuvent être pris ensemble
+    candidates = []
+    order = np.lexsort((-utility, weight))
+    weights_sorted = weight[order]
+    for w in np.unique(weights_sorted).tolist():
+        if w <= 0:
+            continue
+        if w > capacity:
+            break
+        a, b = np.searchsorted(weights_sorted, [w, w + 1])
+        candidates.extend(order[a:min(b, a + capacity // w)].tolist())
+    best = np.zeros(capacity + 1)
+    choices = []
+    for i in candidates:
+        w = weight[i]
+        gain = best[:capacity + 1 - w] + utility[i]
+        take = gain > best[w:]
+        best[w:] = np.where(take, gain, best[w:])
+        choices.append(np.packbits(take))
+    # On remonte les choix en partant de la capacité totale
+    selected = []
+    c = capacity
+    for i, packed in zip(reversed(candidates), reversed(choices)):
+        w = weight[i]
+        if c >= w and np.unpackbits(packed, count=capacity + 1 - w)[c - w]:
+            selected.append(i)
+            c -= w
+    # Les coûts réels sont plus petits que les coûts arrondis : on complète avec le budget restant
+    left = ~free
+    left[selected] = False
+    remaining = budget - np.sum(np.asarray(cost)[selected])
+    others = np.flatnonzero(left)
+    extra = others[greedy_selection(utility[others], np.asarray(cost)[others], remaining)]
+    return np.sort(np.concatenate((np.array(selected, dtype=np.int64), extra, taken)))
+
+
+def allocate(network_file, routes_file, trucks_file, budget=BUDGET, method="greedy", precision=None, base_path=None):
+    """
+    Chooses the trucks to buy to maximize the total utility of the covered routes within the budget.
+    Each route is covered by one truck, the cheapest one with at least the minimal power of the route.
+
+    Parameters:
+    -----------
+    method: str, optional
+        "greedy" (ratio utility / cost, fast) or "knapsack" (exact up to the rounding of the costs to precision).
+
+    Outputs:
+    -----------
+    fleet: list
+        The pairs (route, truck): position of the route in the routes file and of the truck in the trucks file.
+    utility: numeric
+        The total utility of the covered routes.
+    cost: numeric
+        The total cost of the fleet.
+    """
+    g, tree = load_network(network_file, base_path)
+    src, dest, route_utility = routes_from_file(routes_file, base_path)
+    power, cost = trucks_from_file(trucks_file, base_path)
+    truck = cheapest_trucks(tree.tree_index.power_batch(src, dest), power, cost)
+    routes = np.flatnonzero(truck >= 0)
+    if method == "greedy":
+        chosen = greedy_selection(route_utility[routes], cost[truck[routes]], budget)
+    elif method == "knapsack":
+        chosen = knapsack_selection(route_utility[routes], cost[truck[routes]], budget, precision)
+    else:
+        raise ValueError(f"Unknown method {method}")
+    chosen = routes[chosen]
+    fleet = list(zip(chosen.tolist(), truck[chosen].tolist()))
+    return fleet, route_utility[chosen].sum().item(), cost[truck[chosen]].sum().item()
+
+
+# Utilisation : python delivery_network/allocation.py input/network.2.in input/routes.2.in input/trucks.2.in [greedy|knapsack]
+if __name__ == "__main__":
+    fleet, utility, cost = allocate(sys.argv[1], sys.argv[2], sys.argv[3], method=sys.argv[4] if len(sys.argv) > 4 else "greedy")
+    print(f"{len(fleet)} camions achetés pour un coût de {cost}, utilité totale : {utility}")
@@ -0,0 +1,521 @@
+import heapq
+from collections.abc import Mapping
+import numpy as np
+from graph import Graph
+import instrumentation
+from instrumentation import instrumented
+from query_cache import cached_query
+from union_find import kruskal_edges
+from reconstruction_tree import ReconstructionTree
+
+
+class AdjacencyView(Mapping):
+    """
+    Read-only view of the adjacency of a CSRGraph with the same layout as Graph.graph,
+    i.e. view[node] = [[neighbor1, p1, d1], [neighbor2, p2, d2], ...].
+    The lists are built on demand, nothing is stored.
+    """
+
+    def __init__(self, csr):
+        self.csr = csr
+
+    def __getitem__(self, node):
+        csr = self.csr
+        i = csr.index[node]
+        a, b = csr.offsets[i], csr.offsets[i + 1]
+        nodes = csr.nodes
+        return [[nodes[v], p, d] for v, p, d in zip(csr.neighbors[a:b].tolist(), csr.powers[a:b].tolist(), csr.dists[a:b].tolist())]
+
+    def __iter__(self):
+        return iter(self.csr.nodes)
+
+    def __len__(self):
+        return self.csr.nb_nodes
+
+
+class CSRGraph(Graph):
+    """
+    A compact and read-only version of Graph, stored in CSR (compressed sparse row) format.
+    Nodes are mapped to dense integer ids 0, ..., n-1 and the adjacency lives in contiguous NumPy arrays:
+    the neighbors of the node of id i are neighbors[offsets[i]:offsets[i+1]], with the powers and distances
+    of the corresponding edges at the same positions in powers and dists.
+    The neighbors of a node are in the order in which the edges were added, as in Graph.
+    Attributes:
+    -----------
+    nodes: list
+        The nodes. Node nodes[i] has the dense id i.
+    index: dict
+        The dense id of each node.
+    nb_nodes: int
+        The number of nodes.
+    nb_edges: int
+        The number of (undirected) edges.
+    offsets: numpy.ndarray
+        Array of size nb_nodes + 1.
+    neighbors, powers, dists: numpy.ndarray
+        Arrays of size 2 * nb_edges (each edge appears in the adjacency of both end nodes).
+    edge_node1, edge_node2, edge_power, edge_dist: numpy.ndarray
+        The raw list of edges (dense ids of the end nodes, power, distance), in the order they were added.
+    graph: AdjacencyView
+        The adjacency with the same layout as Graph.graph, so that all the methods of Graph still work.
+    scratch: tuple or None
+        The arrays (dist, pred, done) of size nb_nodes reused by every power-constrained Dijkstra, allocated on the first one.
+        They are reset after each search, hence a CSRGraph must not be searched by several threads at once.
+    landmarks: tuple or None
+        The landmarks of alt_path_with_power and their distances to every node, see build_landmarks.
+    """
+
+    def __init__(self, nodes, node1, node2, power, dist):
+        """
+        Builds the CSR arrays from the raw list of edges.
+        Parameters:
+        -----------
+        nodes: list
+            The nodes of the graph.
+        node1, node2: array-like of int
+            Dense ids (positions in nodes) of the end nodes of each edge.
+        power, dist: array-like
+            Minimal power and distance of each edge.
+        """
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.nb_nodes = len(self.nodes)
+        self.edge_node1 = np.asarray(node1, dtype=np.int64)
+        self.edge_node2 = np.asarray(node2, dtype=np.int64)
+        self.edge_power = np.asarray(power)
+        self.edge_dist = np.asarray(dist, dtype=np.float64)
+        self.nb_edges = len(self.edge_node1)
+        self.tree_index = None
+        self.version = 0
+        self.query_cache = None
+        self.scratch = None
+        self.landmarks = None
+        self.mst_index = None
+        self.dynamic_tree = None
+        self.components = None
+        # Chaque arête (u, v) donne les entrées u -> v et v -> u, entrelacées pour garder l'ordre d'ajout
+        heads = np.column_stack((self.edge_node1, self.edge_node2)).ravel()
+        tails = np.column_stack((self.edge_node2, self.edge_node1)).ravel()
+        order = np.argsort(heads, kind='stable')
+        self.neighbors = tails[order]
+        self.powers = np.repeat(self.edge_power, 2)[order]
+        self.dists = np.repeat(self.edge_dist, 2)[order]
+        self.offsets = np.zeros(self.nb_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(heads, minlength=self.nb_nodes), out=self.offsets[1:])
+        self.graph = AdjacencyView(self)
+
+    # Noms des tableaux qui définissent entièrement un CSRGraph
+    ARRAYS = ("offsets", "neighbors", "powers", "dists", "edge_node1", "edge_node2", "edge_power", "edge_dist")
+
+    def arrays(self):
+        """
+        Returns the arrays of the graph as a dictionary {name: array}.
+        """
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    @classmethod
+    def from_arrays(cls, nodes, arrays):
+        """
+        Builds a CSRGraph from arrays returned by arrays(), without any computation.
+        The arrays are used as they are (they can be memory-mapped).
+        """
+        g = cls.__new__(cls)
+        g.nodes = list(nodes)
+        g.index = {node: i for i, node in enumerate(g.nodes)}
+        g.nb_nodes = len(g.nodes)
+        for name in cls.ARRAYS:
+            setattr(g, name, arrays[name])
+        g.nb_edges = len(g.edge_node1)
+        g.tree_index = None
+        g.version = 0
+        g.query_cache = None
+        g.scratch = None
+        g.landmarks = None
+        g.mst_index = None
+        g.dynamic_tree = None
+        g.components = None
+        g.graph = AdjacencyView(g)
+        return g
+
+    @classmethod
+    def from_edges(cls, nodes, edges):
+        """
+        Builds a CSRGraph from a list of nodes and a list of edges (node1, node2, power_min, dist).
+        """
+        nodes = list(nodes)
+        if nodes == list(range(1, len(nodes) + 1)):
+            # Cas usuel des fichiers network.x.in : l'id de la node i est i - 1
+            ids = lambda x: x - 1
+        else:
+            index = {node: i for i, node in enumerate(nodes)}
+            ids = index.__getitem__
+        node1 = [ids(edge[0]) for edge in edges]
+        node2 = [ids(edge[1]) for edge in edges]
+        power = [edge[2] for edge in edges]
+        dist = [edge[3] for edge in edges]
+        return cls(nodes, node1, node2, power, dist)
+
+    def add_edge(self, node1, node2, power_min, dist=1):
+        raise TypeError("A CSRGraph is read-only, use to_graph() to get a modifiable Graph")
+
+    def edges(self):
+        nodes = self.nodes
+        return [(nodes[u], nodes[v], p, d) for u, v, p, d in zip(self.edge_node1.tolist(), self.edge_node2.tolist(), self.edge_power.tolist(), self.edge_dist.tolist())]
+
+    def to_csr(self):
+        return self
+
+    def to_graph(self):
+        """
+        Returns a modifiable Graph with the same nodes and edges.
+        """
+        g = Graph(list(self.nodes))
+        for node1, node2, p, d in self.edges():
+            g.add_edge(node1, node2, p, d)
+        return g
+
+    def _path(self, pred, src, dest):
+        # On reconstruit le chemin (en nodes) grâce aux prédécesseurs (en ids)
+        path = []
+        node = dest
+        while node != src:
+            path.append(self.nodes[node])
+            node = pred[node]
+        path.append(self.nodes[src])
+        path.reverse()
+        return path
+
+    def _dijkstra_ids(self, s, power, targets=None, name="shortest_path_tree"):
+        """
+        Dijkstra from the id s on the edges of power at most power, in the scratch arrays self.scratch
+        (dist, pred, done), allocated on the first call and reused by the next ones instead of new dictionaries.
+        The search stops as soon as all the ids of targets are settled (it explores everything if targets is None).
+        Returns the list of the ids reached: their entries must be reset with _reset_scratch once read
+        (if the search raises, they are reset before the exception is propagated).
+        """
+        if self.scratch is None:
+            self.scratch = ([float('inf')] * self.nb_nodes, [-1] * self.nb_nodes, bytearray(self.nb_nodes))
+        dist, pred, done = self.scratch
+        offsets, neighbors = memoryview(self.offsets), memoryview(self.neighbors)
+        powers, dists = memoryview(self.powers), memoryview(self.dists)
+        remaining = None if targets is None else set(targets)
+        inf = float('inf')
+        dist[s] = 0
+        touched = [s]
+        heap = [(0, s)]
+        expanded, pushes = 0, 0
+        try:
+            while heap:
+                (d, u) = heapq.heappop(heap)
+                if done[u]:
+                    continue
+                done[u] = 1
+                expanded += 1
+                if remaining is not None:
+                    remaining.discard(u)
+                    if not remaining:
+                        break
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = neighbors[i]
+                    if done[v] or powers[i] > power:
+                        continue
+                    alt = d + dists[i]
+                    if alt < dist[v]:
+                        if dist[v] == inf:
+                            touched.append(v)
+                        dist[v] = alt
+                        pred[v] = u
+                        heapq.heappush(heap, (alt, v))
+                        pushes += 1
+        except BaseException:
+            # Une recherche interrompue (puissance invalide, KeyboardInterrupt...) ne doit pas laisser
+            # les tableaux partagés sales pour les recherches suivantes
+            self._reset_scratch(touched)
+            raise
+        if instrumentation.enabled:
+            instrumentation.record(name, expanded=expanded, pushes=pushes)
+        return touched
+
+    def _reset_scratch(self, touched):
+        dist, pred, done = self.scratch
+        inf = float('inf')
+        for v in touched:
+            dist[v] = inf
+            pred[v] = -1
+            done[v] = 0
+
+    @instrumented("get_path_with_power")
+    @cached_query("get_path_with_power")
+    def get_path_with_power(self, src, dest, power):
+        if not self.same_component(src, dest):
+            return None
+        s, t = self.index[src], self.index[dest]
+        touched = self._dijkstra_ids(s, power, (t,), "get_path_with_power")
+        try:
+            dist, pred, done = self.scratch
+            # done[t] vaut 1 si et seulement si t a été atteinte (la recherche s'arrête alors)
+            return self._path(pred, s, t) if done[t] else None
+        finally:
+            self._reset_scratch(touched)
+
+    @instrumented("shortest_path_tree")
+    def shortest_path_tree(self, src, power):
+        touched = self._dijkstra_ids(self.index[src], power)
+        try:
+            dist, pred, done = self.scratch
+            nodes = self.nodes
+            pred_nodes = {nodes[v]: nodes[pred[v]] for v in touched[1:]}
+            pred_nodes[src] = None
+            return {nodes[v]: dist[v] for v in touched}, pred_nodes
+        finally:
+            self._reset_scratch(touched)
+
+    @instrumented("get_paths_with_power")
+    def get_paths_with_power(self, src, dests, power):
+        if not any(self.same_component(src, dest) for dest in dests):
+            return [None] * len(dests)
+        s = self.index[src]
+        targets = [self.index[dest] for dest in dests]
+        touched = self._dijkstra_ids(s, power, targets, "get_paths_with_power")
+        try:
+            dist, pred, done = self.scratch
+            return [self._path(pred, s, t) if done[t] else None for t in targets]
+        finally:
+            self._reset_scratch(touched)
+
+    @instrumented("bidirectional_path_with_power")
+    def bidirectional_path_with_power(self, src, dest, power):
+        """
+        Same result as get_path_with_power (a shortest path using edges of power at most power, or None),
+        with two Dijkstra searches, from src and from dest, which meet in the middle: each of them only explores
+        about half of the radius of the usual search.
+        """
+        if not self.same_component(src, dest):
+            return None
+        s, t = self.index[src], self.index[dest]
+        if s == t:
+            return [src]
+        offsets, neighbors = memoryview(self.offsets), memoryview(self.neighbors)
+        powers, dists = memoryview(self.powers), memoryview(self.dists)
+        inf = float('inf')
+        # Indice 0 : recherche depuis s, indice 1 : recherche depuis t (le graphe n'est pas orienté)
+        dist = ({s: 0}, {t: 0})
+        pred = ({s: -1}, {t: -1})
+        visite = (set(), set())
+        heaps = ([(0, s)], [(0, t)])
+        best, meet = inf, None
+        while heaps[0] and heaps[1]:
+            # Aucun chemin passant par une node pas encore visitée ne peut être plus court que best
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            dist_side, dist_other, pred_side, visite_side = dist[side], dist[1 - side], pred[side], visite[side]
+            (d, u) = heapq.heappop(heaps[side])
+            if u in visite_side:
+                continue
+            visite_side.add(u)
+            for i in range(offsets[u], offsets[u + 1]):
+                v = neighbors[i]
+                if v in visite_side or powers[i] > power:
+                    continue
+                alt = d + dists[i]
+                if alt < dist_side.get(v, inf):
+                    dist_side[v] = alt
+                    pred_side[v] = u
+                    heapq.heappush(heaps[side], (alt, v))
+                if v in dist_other and alt + dist_other[v] < best:
+                    best, meet = alt + dist_other[v], v
+        if instrumentation.enabled:
+            instrumentation.record("bidirectional_path_with_power", expanded=len(visite[0]) + len(visite[1]))
+        if meet is None:
+            return None
+        # Chemin s -> meet puis meet -> t
+        path = self._path(pred[0], s, meet)
+        node = pred[1][meet]
+        while node != -1:
+            path.append(self.nodes[node])
+            node = pred[1][node]
+        return path
+
+    def build_landmarks(self, nb_landmarks=8, seed=0):
+        """
+        Chooses nb_landmarks landmarks (the first one at random, then each time the node farthest from the landmarks
+        already chosen) and computes their distances to every node, ignoring the powers.
+        Since a path of bounded power is a path, |d(l, dest) - d(l, node)| is a lower bound of the distance from node
+        to dest whatever the power: it is the potential of the A* search of alt_path_with_power.
+        The cost is nb_landmarks full Dijkstra searches, once per graph.
+        """
+        rng = np.random.default_rng(seed)
+        landmarks = [int(rng.integers(self.nb_nodes))]
+        distances = []
+        closest = np.full(self.nb_nodes, np.inf)
+        while True:
+            touched = self._dijkstra_ids(landmarks[-1], float('inf'), name="build_landmarks")
+            try:
+                distances.append(np.array(self.scratch[0]))
+            finally:
+                self._reset_scratch(touched)
+            if len(landmarks) == nb_landmarks:
+                break
+            closest = np.minimum(closest, distances[-1])
+            # On ne choisit que parmi les nodes atteintes : les distances infinies sont ignorées
+            candidates = np.where(np.isfinite(closest), closest, -1)
+            landmarks.append(int(np.argmax(candidates)))
+        self.landmarks = (landmarks, np.array(distances))
+        return landmarks
+
+    def _landmark_bounds(self, t):
+        distances = self.landmarks[1]
+        with np.errstate(invalid='ignore'):
+            gap = np.abs(distances - distances[:, t:t + 1])
+        # Si l'une des deux distances est infinie, le landmark ne donne aucune borne
+        return np.where(np.isfinite(gap), gap, 0).max(axis=0).tolist()
+
+    @instrumented("alt_path_with_power")
+    def alt_path_with_power(self, src, dest, power):
+        """
+        Same result as get_path_with_power, with an A* search guided by the landmark lower bounds (ALT):
+        nodes leading away from dest are explored much later, or not at all.
+        The landmarks are built by build_landmarks on the first call.
+        """
+        if not self.same_component(src, dest):
+            return None
+        if self.landmarks is None:
+            self.build_landmarks()
+        s, t = self.index[src], self.index[dest]
+        h = self._landmark_bounds(t)
+        offsets, neighbors = memoryview(self.offsets), memoryview(self.neighbors)
+        powers, dists = memoryview(self.powers), memoryview(self.dists)
+        inf = float('inf')
+        dist = {s: 0}
+        pred = {}
+        visite = set()
+        heap = [(h[s], s)]
+        while heap:
+            (f, u) = heapq.heappop(heap)
+            if u == t:
+                if instrumentation.enabled:
+                    instrumentation.record("alt_path_with_power", expanded=len(visite) + 1)
+                return self._path(pred, s, t)
+            if u in visite:
+                continue
+            visite.add(u)
+            d = dist[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = neighbors[i]
+                if v in visite or powers[i] > power:
+                    continue
+                alt = d + dists[i]
+                if alt < dist.get(v, inf):
+                    dist[v] = alt
+                    pred[v] = u
+                    heapq.heappush(heap, (alt + h[v], v))
+        if instrumentation.enabled:
+            instrumentation.record("alt_path_with_power", expanded=len(visite))
+        return None
+
+    def _shortest_bottleneck_path(self, src, dest, power):
+        s, t = self.index[src], self.index[dest]
+        offsets, neighbors = memoryview(self.offsets), memoryview(self.neighbors)
+        powers, dists = memoryview(self.powers), memoryview(self.dists)
+        label = {s: (0, 0)}
+        pred = {}
+        visite = set()
+        heap = [(0, 0, s)]
+        while heap:
+            (d, p, u) = heapq.heappop(heap)
+            if u in visite:
+                continue
+            if u == t:
+                return d, p, self._path(pred, s, t)
+            visite.add(u)
+            for i in range(offsets[u], offsets[u + 1]):
+                v = neighbors[i]
+                p_edge = powers[i]
+                if v in visite or p_edge > power:
+                    continue
+                alt = (d + dists[i], p if p >= p_edge else p_edge)
+                if v not in label or alt < label[v]:
+                    label[v] = alt
+                    pred[v] = u
+                    heapq.heappush(heap, (alt[0], alt[1], v))
+        return None
+
+    def distinct_powers(self):
+        return np.unique(self.edge_power)
+
+    def component_labels(self):
+        offsets, neighbors = memoryview(self.offsets), memoryview(self.neighbors)
+        labels = [-1] * self.nb_nodes
+        for s in range(self.nb_nodes):
+            if labels[s] != -1:
+                continue
+            labels[s] = s
+            pile = [s]
+            while pile:
+                u = pile.pop()
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = neighbors[i]
+                    if labels[v] == -1:
+                        labels[v] = s
+                        pile.append(v)
+        return labels
+
+    def _bottleneck_ids(self, s, t=None):
+        offsets, neighbors, powers = memoryview(self.offsets), memoryview(self.neighbors), memoryview(self.powers)
+        power = {s: 0}
+        pred = {}
+        visite = set()
+        heap = [(0, s)]
+        pushes = 0
+        while heap:
+            (p, u) = heapq.heappop(heap)
+            if u in visite:
+                continue
+            if u == t:
+                break
+            visite.add(u)
+            for i in range(offsets[u], offsets[u + 1]):
+                v = neighbors[i]
+                if v in visite:
+                    continue
+                alt = p if p >= powers[i] else powers[i]
+                if v not in power or alt < power[v]:
+                    power[v] = alt
+                    pred[v] = u
+                    heapq.heappush(heap, (alt, v))
+                    pushes += 1
+        if instrumentation.enabled:
+            instrumentation.record("bottleneck_search", expanded=len(visite), pushes=pushes)
+        return power, pred
+
+    def bottleneck_search(self, src, dest=None):
+        power, pred = self._bottleneck_ids(self.index[src], None if dest is None else self.index[dest])
+        nodes = self.nodes
+        pred_nodes = {nodes[v]: nodes[u] for v, u in pred.items()}
+        pred_nodes[src] = None
+        return {nodes[v]: p for v, p in power.items()}, pred_nodes
+
+    @instrumented("min_power")
+    @cached_query("min_power")
+    def min_power(self, src, dest, tie_break=False):
+        if not self.same_component(src, dest):
+            return None
+        s, t = self.index[src], self.index[dest]
+        power, pred = self._bottleneck_ids(s, t)
+        if t not in power:
+            return None
+        if tie_break:
+            return (self.get_path_with_power(src, dest, power[t]), power[t])
+        return (self._path(pred, s, t), power[t])
+
+    def reconstruction_tree(self):
+        return ReconstructionTree(self.nodes, self.edge_node1, self.edge_node2, self.edge_power)
+
+    @instrumented("kruskal")
+    def kruskal(self):
+        """
+        Returns a minimal spanning tree (or forest) as a CSRGraph (see union_find.kruskal_edges).
+        """
+        selected = kruskal_edges(self.nb_nodes, self.edge_node1, self.edge_node2, self.edge_power)
+        return CSRGraph(self.nodes, self.edge_node1[selected], self.edge_node2[selected], self.edge_power[selected], self.edge_dist[selected])
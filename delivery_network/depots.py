@@ -0,0 +1,114 @@
+import heapq
+import numpy as np
+import instrumentation
+
+
+class DepotIndex:
+    """
+    The result of a multi-source search from a set of depots: for every node, its best depot, the value of the best
+    path from this depot (its distance for nearest_depots, the minimal power needed for depot_min_power) and the
+    predecessor of the node on this path.
+    Attributes:
+    -----------
+    nodes: list
+        The nodes. Node nodes[i] has the dense id i.
+    index: dict
+        The dense id of each node.
+    depot: numpy.ndarray
+        depot[i] is the dense id of the best depot of node i, -1 if no depot can be reached.
+    value: numpy.ndarray
+        value[i] is the distance (or the power) of the best path between node i and its depot, inf if there is none.
+    pred: numpy.ndarray
+        pred[i] is the dense id of the predecessor of node i on this path (-1 for the depots and the unreached nodes).
+    """
+
+    def __init__(self, nodes, depot, value, pred):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.depot = np.asarray(depot, dtype=np.int64)
+        self.value = np.asarray(value)
+        self.pred = np.asarray(pred, dtype=np.int64)
+
+    def ids(self, cities):
+        return np.fromiter((self.index[city] for city in cities), dtype=np.int64, count=len(cities))
+
+    def lookup(self, cities):
+        """
+        Returns the best depots of a list of cities (None for the cities no depot can serve)
+        and the NumPy array of their values, with a single NumPy indexing.
+        """
+        ids = self.ids(cities)
+        depot = self.depot[ids]
+        nodes = self.nodes
+        return [None if d == -1 else nodes[d] for d in depot.tolist()], self.value[ids]
+
+    def nearest(self, city):
+        """Returns (depot, value) for city, or None if no depot can serve it."""
+        i = self.index[city]
+        if self.depot[i] == -1:
+            return None
+        return self.nodes[self.depot[i]], self.value[i].item()
+
+    def path(self, city):
+        """Returns the path from the best depot of city to city, or None if no depot can serve it."""
+        i = self.index[city]
+        if self.depot[i] == -1:
+            return None
+        pred = self.pred
+        path = []
+        while i != -1:
+            path.append(self.nodes[i])
+            i = pred[i]
+        path.reverse()
+        return path
+
+
+def multi_source_search(g, depots, power=None):
+    """
+    Dijkstra seeded with all the depots at once: every node is labelled by the first depot that reaches it.
+    If power is given, only the edges of power at most power are used and the value of a path is its distance
+    (nearest reachable depot). If power is None, the value of a path is its maximal power (bottleneck version:
+    minimal power needed to reach a depot). The graph is searched through its CSR arrays (see Graph.to_csr).
+    """
+    csr = g.to_csr()
+    offsets, neighbors = memoryview(csr.offsets), memoryview(csr.neighbors)
+    powers, dists = memoryview(csr.powers), memoryview(csr.dists)
+    n = csr.nb_nodes
+    inf = float('inf')
+    value = [inf] * n
+    owner = [-1] * n
+    pred = [-1] * n
+    done = bytearray(n)
+    heap = []
+    for depot in depots:
+        s = csr.index[depot]
+        value[s] = 0
+        owner[s] = s
+        heap.append((0, s))
+    heapq.heapify(heap)
+    bottleneck = power is None
+    pushes = 0
+    while heap:
+        (d, u) = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        for i in range(offsets[u], offsets[u + 1]):
+            v = neighbors[i]
+            if done[v]:
+                continue
+            if bottleneck:
+                alt = d if d >= powers[i] else powers[i]
+            elif powers[i] > power:
+                continue
+            else:
+                alt = d + dists[i]
+            if alt < value[v]:
+                value[v] = alt
+                owner[v] = owner[u]
+                pred[v] = u
+                heapq.heappush(heap, (alt, v))
+                pushes += 1
+    if instrumentation.enabled:
+        instrumentation.record("multi_source_search", expanded=sum(done), pushes=pushes)
+    return DepotIndex(csr.nodes, owner, value, pred)
@@ -0,0 +1,153 @@
+import instrumentation
+from tree_index import TreeIndex
+
+
+class DynamicTreeIndex(TreeIndex):
+    """
+    A TreeIndex on a minimal spanning tree (or forest) kept minimal while edges are added to the graph,
+    without running kruskal again (see Graph.maintain_spanning_tree).
+    When an edge (u, v, p) is added:
+        - if u and v are in different components, the edge links them: the smaller component is re-rooted at its end
+          of the edge and hung below the other end;
+        - otherwise the edge closes a cycle with the path between u and v in the tree: if the maximal power on this path
+          is greater than p, the edge of maximal power is removed and the subtree it held is hung through the new edge.
+    Only the nodes that were moved get new depths, components and binary lifting tables, all the others are unchanged.
+    The queries of TreeIndex (power, path, min_power, power_batch) stay valid after each update.
+    Attributes (in addition to those of TreeIndex):
+    -----------
+    children: list
+        children[i] is the set of the dense ids of the children of node i.
+    dist: list
+        dist[i] is the distance of the edge between node i and its parent (0 for roots).
+    sizes: dict
+        sizes[r] is the number of nodes of the component of root r.
+    """
+
+    def __init__(self, tree):
+        super().__init__(tree)
+        parent, power = self.up[0], self.max_power[0]
+        n = self.nb_nodes
+        self.children = [set() for _ in range(n)]
+        self.dist = [0] * n
+        self.sizes = {}
+        for i in range(n):
+            root = self.component[i]
+            self.sizes[root] = self.sizes.get(root, 0) + 1
+            if parent[i] == i:
+                continue
+            self.children[parent[i]].add(i)
+            # On retrouve la distance de l'arête (i, parent) dans l'arbre
+            for neighbor, p, d in tree.graph[self.nodes[i]]:
+                if neighbor == self.nodes[parent[i]] and p == power[i]:
+                    self.dist[i] = d
+                    break
+
+    def _add_node(self, node):
+        i = self.nb_nodes
+        self.nodes.append(node)
+        self.index[node] = i
+        self.nb_nodes += 1
+        self.depth.append(0)
+        self.component.append(i)
+        for k in range(self.log):
+            self.up[k].append(i)
+            self.max_power[k].append(0)
+        self.children.append(set())
+        self.dist.append(0)
+        self.sizes[i] = 1
+        # Les tableaux NumPy de power_batch n'ont pas de place pour la nouvelle node
+        self.tables = None
+
+    def edges(self):
+        """Returns the list of the edges (node1, node2, power, dist) of the current spanning tree."""
+        parent = self.up[0]
+        return [(self.nodes[i], self.nodes[parent[i]], self.max_power[0][i], self.dist[i])
+                for i in range(self.nb_nodes) if parent[i] != i]
+
+    def add_edge(self, node1, node2, power, dist=1):
+        """
+        Updates the spanning tree after the edge (node1, node2, power, dist) was added to the graph.
+        Returns True if the edge entered the tree, False if the tree did not change.
+        """
+        for node in (node1, node2):
+            if node not in self.index:
+                self._add_node(node)
+        u, v = self.index[node1], self.index[node2]
+        if u == v:
+            return False
+        parent = self.up[0]
+        if self.component[u] != self.component[v]:
+            # On accroche la plus petite composante à l'autre
+            if self.sizes[self.component[u]] > self.sizes[self.component[v]]:
+                u, v = v, u
+            root = self.component[u]
+            moved = self._hang(u, v, root, power, dist)
+            self.sizes[self.component[v]] += self.sizes.pop(root)
+        else:
+            lca, best = self._climb(u, v)
+            if best <= power:
+                return False
+            # Arête de puissance maximale sur le cycle : on remonte de u et de v jusqu'à l'ancêtre commun
+            x, side = None, None
+            for end in (u, v):
+                a = end
+                while a != lca:
+                    if x is None or self.max_power[0][a] > self.max_power[0][x]:
+                        x, side = a, end
+                    a = parent[a]
+            # Le sous-arbre de x, qui contient side, est raccroché par la nouvelle arête
+            other = v if side == u else u
+            self.children[parent[x]].discard(x)
+            moved = self._hang(side, other, x, power, dist)
+        self.tables = None
+        if instrumentation.enabled:
+            instrumentation.record("dynamic_tree", updates=1, moved=moved)
+        return True
+
+    def _hang(self, a, b, top, power, dist):
+        """
+        Re-roots at a the subtree of root top (which contains a and is detached from its parent), then makes
+        a a child of b with an edge of the given power and distance, and patches the index of the moved nodes.
+        Returns the number of moved nodes.
+        """
+        parent, edge_power = self.up[0], self.max_power[0]
+        # On inverse les arêtes sur le chemin de a à top
+        chemin = [a]
+        while chemin[-1] != top:
+            chemin.append(parent[chemin[-1]])
+        for child, node in zip(reversed(chemin[:-1]), reversed(chemin[1:])):
+            # L'arête (child, node) était portée par child, elle est désormais portée par node
+            self.children[node].discard(child)
+            self.children[child].add(node)
+            parent[node] = child
+            edge_power[node] = edge_power[child]
+            self.dist[node] = self.dist[child]
+        parent[a] = b
+        edge_power[a] = power
+        self.dist[a] = dist
+        self.children[b].add(a)
+        # Parcours en largeur des nodes déplacées : les ancêtres d'une node sont mis à jour avant elle
+        root = self.component[b]
+        order = [a]
+        self.depth[a] = self.depth[b] + 1
+        for x in order:
+            self.component[x] = root
+            for y in self.children[x]:
+                self.depth[y] = self.depth[x] + 1
+                order.append(y)
+        if max(self.depth[x] for x in order) >= 1 << self.log:
+            self._add_levels()
+        for x in order:
+            for k in range(1, self.log):
+                middle = self.up[k - 1][x]
+                self.up[k][x] = self.up[k - 1][middle]
+                self.max_power[k][x] = max(self.max_power[k - 1][x], self.max_power[k - 1][middle])
+        return len(order)
+
+    def _add_levels(self):
+        # La profondeur dépasse 2^log : on ajoute des niveaux aux tables pour toutes les nodes
+        while max(self.depth) >= 1 << self.log:
+            prev_up, prev_power = self.up[-1], self.max_power[-1]
+            self.up.append([prev_up[u] for u in prev_up])
+            self.max_power.append([a if a >= b else b for a, b in zip(prev_power, [prev_power[u] for u in prev_up])])
+            self.log += 1
@@ -0,0 +1,194 @@
+"""
+Generator of large synthetic input files, in the formats of network.x.in, routes.x.in and trucks.x.in.
+The edges are generated and written by chunks: the whole graph is never held in memory (the sparse graphs only keep
+the sorted array of the keys of their edges, to avoid duplicates). Each column is drawn from its own random stream,
+as floats, so that the same seed gives the same file whatever the chunk size.
+
+Usage (from the root folder):
+    python delivery_network/generator.py network input/network.big.in --kind sparse --nodes 1000000 --edges 3000000 --seed 1
+    python delivery_network/generator.py routes input/routes.big.in --nodes 1000000 --routes 1000000
+    python delivery_network/generator.py trucks input/trucks.big.in --trucks 1000
+"""
+import argparse
+import numpy as np
+from graph import full_path
+
+KINDS = ("tree", "sparse", "grid", "path")
+
+
+def uniform_ints(rng, low, high, size):
+    """
+    Uniform integers of low, ..., high drawn from rng.random: unlike rng.integers, drawing them in several chunks
+    gives the same numbers as drawing them at once.
+    """
+    return low + (rng.random(size) * (high - low + 1)).astype(np.int64)
+
+
+def tree_edges(nb_nodes, rng, chunk_size):
+    """Random tree: node i > 1 is linked to a uniformly random node among 1, ..., i-1."""
+    for start in range(2, nb_nodes + 1, chunk_size):
+        node1 = np.arange(start, min(start + chunk_size, nb_nodes + 1))
+        node2 = 1 + (rng.random(len(node1)) * (node1 - 1)).astype(np.int64)
+        yield node1, node2
+
+
+def edge_keys(node1, node2, nb_nodes):
+    # Clé d'une arête non orientée, indépendante du sens
+    return np.minimum(node1, node2) * (nb_nodes + 1) + np.maximum(node1, node2)
+
+
+def sparse_edges(nb_nodes, nb_edges, tree_rng, extra_rng, chunk_size):
+    """
+    Connected sparse random graph: a random tree plus nb_edges - nb_nodes + 1 uniformly random edges, without
+    loops nor duplicate edges. The candidate edges are read in the order of their random stream and the loops and
+    the edges already present are skipped, hence the edges do not depend on chunk_size.
+    """
+    seen = np.empty(0, dtype=np.int64)
+    for node1, node2 in tree_edges(nb_nodes, tree_rng, chunk_size):
+        seen = np.union1d(seen, edge_keys(node1, node2, nb_nodes))
+        yield node1, node2
+    missing = nb_edges - (nb_nodes - 1)
+    while missing > 0:
+        pairs = uniform_ints(extra_rng, 1, nb_nodes, (min(chunk_size, missing), 2))
+        node1, node2 = pairs[:, 0], pairs[:, 1]
+        keys = edge_keys(node1, node2, nb_nodes)
+        # Première apparition de chaque arête du morceau, dans l'ordre du tirage
+        first = np.sort(np.unique(keys, return_index=True)[1])
+        first = first[(node1[first] != node2[first]) & ~np.isin(keys[first], seen)]
+        if len(first):
+            seen = np.union1d(seen, keys[first])
+            missing -= len(first)
+            yield node1[first], node2[first]
+
+
+def grid_edges(width, height, chunk_size):
+    """Road-like grid of width x height nodes: node (x, y) is numbered 1 + x + y * width."""
+    rows = max(1, chunk_size // max(1, 2 * width))
+    for y0 in range(0, height, rows):
+        y = np.arange(y0, min(y0 + rows, height))
+        # Arêtes horizontales (x, y) - (x + 1, y)
+        x = np.arange(width - 1)
+        left = (1 + x[None, :] + y[:, None] * width).ravel()
+        # Arêtes verticales (x, y) - (x, y + 1)
+        y_up = y[y < height - 1]
+        bottom = (1 + np.arange(width)[None, :] + y_up[:, None] * width).ravel()
+        yield np.concatenate((left, bottom)), np.concatenate((left + 1, bottom + width))
+
+
+def path_edges(nb_nodes, chunk_size):
+    """Long path 1 - 2 - ... - nb_nodes: the deepest possible spanning tree."""
+    for start in range(1, nb_nodes, chunk_size):
+        node1 = np.arange(start, min(start + chunk_size, nb_nodes))
+        yield node1, node1 + 1
+
+
+def write_network(filename, kind="sparse", nb_nodes=1000, nb_edges=None, seed=0, max_power=10 ** 6, max_dist=10 ** 4,
+                  with_dist=True, chunk_size=10 ** 5, base_path=None):
+    """
+    Writes a random network in the format of network.x.in.
+
+    Parameters:
+    -----------
+    kind: str, optional
+        "tree" (random tree), "sparse" (random tree plus random edges, nb_edges in total, 3 * nb_nodes by default),
+        "grid" (road-like grid of about nb_nodes nodes) or "path" (long path, with powers decreasing along the path
+        so that every algorithm on the spanning tree meets its worst case). Default is "sparse".
+    seed: int, optional
+        Seed of the random generator, the same seed always gives the same file.
+    with_dist: bool, optional
+        If False, the lines have 3 columns (no distance).
+
+    Outputs:
+    -----------
+    nb_nodes, nb_edges: int
+        The size of the written network.
+    """
+    # Un flux aléatoire par colonne : le tirage ne dépend pas du découpage en morceaux
+    tree_rng, extra_rng, power_rng, dist_rng = (np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(4))
+    if kind == "tree":
+        nb_edges = nb_nodes - 1
+        chunks = tree_edges(nb_nodes, tree_rng, chunk_size)
+    elif kind == "sparse":
+        nb_edges = 3 * nb_nodes if nb_edges is None else nb_edges
+        if nb_edges < nb_nodes - 1:
+            raise ValueError("A connected graph needs at least nb_nodes - 1 edges")
+        if nb_edges > nb_nodes * (nb_nodes - 1) // 2:
+            raise ValueError("A graph without loops nor duplicate edges has at most nb_nodes * (nb_nodes - 1) / 2 edges")
+        chunks = sparse_edges(nb_nodes, nb_edges, tree_rng, extra_rng, chunk_size)
+    elif kind == "grid":
+        width = max(1, int(np.sqrt(nb_nodes)))
+        height = max(1, nb_nodes // width)
+        nb_nodes = width * height
+        nb_edges = (width - 1) * height + width * (height - 1)
+        chunks = grid_edges(width, height, chunk_size)
+    elif kind == "path":
+        nb_edges = nb_nodes - 1
+        chunks = path_edges(nb_nodes, chunk_size)
+    else:
+        raise ValueError(f"Unknown kind {kind}, expected one of {KINDS}")
+    written = 0
+    with open(full_path(filename, base_path), "w") as fichier:
+        fichier.write(f"{nb_nodes} {nb_edges}\n")
+        for node1, node2 in chunks:
+            if kind == "path":
+                power = max_power - (node1 * (max_power - 1)) // nb_nodes
+            else:
+                power = uniform_ints(power_rng, 1, max_power, len(node1))
+            columns = [node1, node2, power]
+            if with_dist:
+                columns.append(uniform_ints(dist_rng, 1, max_dist, len(node1)))
+            np.savetxt(fichier, np.column_stack(columns), fmt="%d")
+            written += len(node1)
+    assert written == nb_edges
+    return nb_nodes, nb_edges
+
+
+def write_routes(filename, nb_nodes, nb_routes, seed=0, max_utility=10 ** 4, chunk_size=10 ** 5, base_path=None):
+    """
+    Writes nb_routes random routes 'city1 city2 utility' between the nodes 1..nb_nodes, in the format of routes.x.in.
+    """
+    city_rng, utility_rng = (np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(2))
+    with open(full_path(filename, base_path), "w") as fichier:
+        fichier.write(f"{nb_routes}\n")
+        for start in range(0, nb_routes, chunk_size):
+            size = min(chunk_size, nb_routes - start)
+            cities = uniform_ints(city_rng, 1, nb_nodes, (size, 2))
+            routes = np.column_stack((cities, uniform_ints(utility_rng, 1, max_utility, size)))
+            np.savetxt(fichier, routes, fmt="%d")
+
+
+def write_trucks(filename, nb_trucks, seed=0, max_power=10 ** 7, base_path=None):
+    """
+    Writes a catalog of nb_trucks random truck models 'power cost', in the format of trucks.x.in.
+    The cost grows with the power, with some noise so that the catalog contains dominated trucks.
+    """
+    rng = np.random.default_rng(seed)
+    power = np.sort(rng.integers(1, max_power + 1, nb_trucks))
+    cost = np.maximum(1, (power * rng.uniform(0.05, 0.2, nb_trucks)).astype(np.int64))
+    with open(full_path(filename, base_path), "w") as fichier:
+        fichier.write(f"{nb_trucks}\n")
+        np.savetxt(fichier, np.column_stack((power, cost)), fmt="%d")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("type", choices=("network", "routes", "trucks"))
+    parser.add_argument("filename")
+    parser.add_argument("--kind", choices=KINDS, default="sparse")
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--edges", type=int)
+    parser.add_argument("--routes", type=int, default=1000)
+    parser.add_argument("--trucks", type=int, default=100)
+    parser.add_argument("--no-dist", action="store_true", help="write networks with 3 columns")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.type == "network":
+        print(write_network(args.filename, args.kind, args.nodes, args.edges, args.seed, with_dist=not args.no_dist))
+    elif args.type == "routes":
+        write_routes(args.filename, args.nodes, args.routes, args.seed)
+    else:
+        write_trucks(args.filename, args.trucks, args.seed)
+
+
+if __name__ == "__main__":
+    main()
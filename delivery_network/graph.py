@@ -1,5 +1,20 @@
-import graphviz
+import gc
 import heapq
+import os
+import numpy as np
+import instrumentation
+from instrumentation import instrumented
+from query_cache import LRUCache, cached_query
+from tree_index import TreeIndex
+from dynamic_tree import DynamicTreeIndex
+from heavy_light import HeavyLightIndex
+from union_find import ComponentIndex, kruskal_edges
+from reconstruction_tree import ReconstructionTree
+import visualization
+import depots as depots_module
+
+# Dossier racine du dépôt : les noms de fichiers relatifs (par exemple "input/network.1.in") sont lus à partir de ce dossier
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class Graph:
     """
@@ -17,6 +32,23 @@ class Graph:
         The number of nodes.
     nb_edges: int
         The number of edges.
+    edge_list: list
+        The raw list of the edges (node1, node2, power_min, dist), in the order they were added.
+    tree_index: TreeIndex or None
+        The min-power query index used by min_power_kruskal, built on the first query.
+    version: int
+        Incremented by every add_edge, so that the results computed before can be recognized as stale.
+    query_cache: LRUCache or None
+        The cache of the results of get_path_with_power and min_power, None (disabled) by default, see cache_queries.
+    dynamic_tree: DynamicTreeIndex or None
+        The minimal spanning tree kept up to date by add_edge, None by default, see maintain_spanning_tree.
+    components: ComponentIndex or None
+        The component label of each node, built by the first query (see component_index) and kept up to date by add_edge.
+    mst_index: tuple or None
+        (version, TreeIndex of a minimal spanning tree of the graph), built by spanning_tree_index and
+        rebuilt when the graph has changed since.
+    csr_copy: tuple or None
+        (version, CSRGraph copy of the graph), built by to_csr and rebuilt when the graph has changed since.
     """
 
     def __init__(self, nodes=[]):
@@ -31,6 +63,14 @@ class Graph:
         self.graph = dict([(n, []) for n in nodes])
         self.nb_nodes = len(nodes)
         self.nb_edges = 0
+        self.edge_list = []
+        self.tree_index = None
+        self.version = 0
+        self.query_cache = None
+        self.dynamic_tree = None
+        self.components = None
+        self.mst_index = None
+        self.csr_copy = None
 
     def __str__(self):
         """Prints the graph as a list of neighbors for each node (one per line)"""
@@ -72,13 +112,45 @@ class Graph:
         self.graph[node2].append([node1, power_min, dist])
         # Le nombre d'arrete augmente de 1
         self.nb_edges += 1
+        self.edge_list.append((node1, node2, power_min, dist))
+        # L'index de l'arbre et les résultats en cache ne sont plus valables
+        self.tree_index = None
+        self.version += 1
+        # L'arbre couvrant maintenu et les composantes sont mis à jour sans tout recalculer
+        if self.dynamic_tree is not None:
+            self.dynamic_tree.add_edge(node1, node2, power_min, dist)
+        if self.components is not None:
+            self.components.add_edge(node1, node2)
+
+    def maintain_spanning_tree(self):
+        """
+        Switches the graph to the incremental mode: a minimal spanning tree is built once with kruskal(),
+        then every add_edge updates it (and its min-power index) in place, see dynamic_tree.DynamicTreeIndex.
+        min_power_batch then uses it directly. Returns the DynamicTreeIndex.
+        """
+        if self.dynamic_tree is None:
+            self.dynamic_tree = DynamicTreeIndex(self.kruskal())
+        return self.dynamic_tree
+
+    def cache_queries(self, maxsize=1024):
+        """
+        Enables (or resizes) the LRU cache of the results of get_path_with_power and min_power, keyed on the
+        unordered pair of nodes and the other arguments. maxsize=0 disables the cache.
+        Returns the cache, whose stats() gives the number of hits and misses.
+        """
+        self.query_cache = LRUCache(maxsize) if maxsize > 0 else None
+        return self.query_cache
 
+    @instrumented("get_path_with_power")
+    @cached_query("get_path_with_power")
     def get_path_with_power(self, src, dest, power):
-        # On définit la distance de chaque node à +inf grâce à un dictionnaire
-        dist = {n: float('inf') for n in self.nodes}
-        # On définit les prédécesseurs de chaque node grâce à un dictionnaire
-        # (initialement égal à elle même)
-        pred = {n: None for n in self.nodes}
+        # Si src et dest ne sont pas reliées, inutile de chercher
+        if not self.same_component(src, dest):
+            return None
+        # Distance et prédécesseur des nodes atteintes seulement (les autres sont à +inf) :
+        # on ne construit pas de dictionnaire de taille n à chaque requête
+        dist = {}
+        pred = {src: None}
         # On définit un ensemble visite pour
         # ne pas repasser par les mêmes chemins
         visite = set()
@@ -86,6 +158,7 @@ class Graph:
         heap = [(0, src)]
         # Distance de la source à elle-même
         dist[src] = 0
+        pushes = 0
         # Parcours
         while heap:
             (d, node) = heapq.heappop(heap)
@@ -97,6 +170,8 @@ class Graph:
                     node = pred[node]
                 path.append(src)
                 path.reverse()
+                if instrumentation.enabled:
+                    instrumentation.record("get_path_with_power", expanded=len(visite) + 1, pushes=pushes)
                 return path
             # On redéfinit la distance des voisins de la node
             # en prenant les distances minimum
@@ -107,13 +182,91 @@ class Graph:
                 if voisin[1] > power:
                     continue
                 alt = dist[node] + voisin[2]
-                if alt < dist[voisin[0]]:
+                if alt < dist.get(voisin[0], float('inf')):
                     dist[voisin[0]] = alt
                     pred[voisin[0]] = node
                     heapq.heappush(heap, (alt, voisin[0]))
+                    pushes += 1
         # Pas de chemin trouvé
+        if instrumentation.enabled:
+            instrumentation.record("get_path_with_power", expanded=len(visite), pushes=pushes)
         return None
 
+    @instrumented("shortest_path_tree")
+    def shortest_path_tree(self, src, power):
+        """
+        Runs the Dijkstra of get_path_with_power from src without stopping at a destination: one search answers
+        the queries from src to every node with a truck of the given power.
+
+        Outputs:
+        -----------
+        dist: dict
+            dist[node] is the length of a shortest path from src to node using edges of power at most power.
+            Nodes that cannot be reached are missing.
+        pred: dict
+            pred[node] is the predecessor of node on this path (None for src).
+        """
+        dist = {src: 0}
+        pred = {src: None}
+        visite = set()
+        heap = [(0, src)]
+        pushes = 0
+        while heap:
+            (d, node) = heapq.heappop(heap)
+            if node in visite:
+                continue
+            visite.add(node)
+            for voisin, p_edge, d_edge in self.graph[node]:
+                if voisin in visite or p_edge > power:
+                    continue
+                alt = d + d_edge
+                if voisin not in dist or alt < dist[voisin]:
+                    dist[voisin] = alt
+                    pred[voisin] = node
+                    heapq.heappush(heap, (alt, voisin))
+                    pushes += 1
+        if instrumentation.enabled:
+            instrumentation.record("shortest_path_tree", expanded=len(visite), pushes=pushes)
+        return dist, pred
+
+    @instrumented("get_paths_with_power")
+    def get_paths_with_power(self, src, dests, power):
+        """
+        Returns the list of the paths given by get_path_with_power(src, dest, power) for each dest of dests
+        (None if dest cannot be reached), with a single search from src.
+        """
+        if not any(self.same_component(src, dest) for dest in dests):
+            return [None] * len(dests)
+        dist, pred = self.shortest_path_tree(src, power)
+        paths = []
+        for dest in dests:
+            if dest not in dist:
+                paths.append(None)
+                continue
+            path = []
+            node = dest
+            while node is not None:
+                path.append(node)
+                node = pred[node]
+            path.reverse()
+            paths.append(path)
+        return paths
+
+    def get_path_with_power_batch(self, queries):
+        """
+        Answers a list of queries (src, dest, power) like get_path_with_power. The queries are grouped by (src, power)
+        and each group is answered by a single search with get_paths_with_power.
+        Returns the list of the paths, in the order of the queries.
+        """
+        groups = {}
+        for i, (src, dest, power) in enumerate(queries):
+            groups.setdefault((src, power), []).append(i)
+        paths = [None] * len(queries)
+        for (src, power), positions in groups.items():
+            for i, path in zip(positions, self.get_paths_with_power(src, [queries[i][1] for i in positions], power)):
+                paths[i] = path
+        return paths
+
     # Pour les petit graphe :
 
     def connected_components_set_petit_graph(self):
@@ -147,122 +300,323 @@ class Graph:
 
     # On effectue un parcours en profondeur mais cette fois ci itératif
     # L'execution est plus rapide
-    def connected_components_set(self):
+    def component_labels(self):
         """
-        The result should be a set of frozensets (one per component),
-        For instance, for network01.in: {frozenset({1, 2, 3}), frozenset({4, 5, 6, 7})}
+        Returns the list of the component labels of the nodes (in the order of self.nodes), with one traversal:
+        the label of a node is the position in self.nodes of the first node of its component.
         """
-        visited = set()
-        connected_components = []
-        for node in self.nodes:
-            if node not in visited:
-                visited.add(node)
-                component = []
+        index = {node: i for i, node in enumerate(self.nodes)}
+        labels = [-1] * len(self.nodes)
+        for i, node in enumerate(self.nodes):
+            if labels[i] == -1:
+                labels[i] = i
                 pile = [node]
                 while pile:
                     current_node = pile.pop()
-                    component.append(current_node)
                     for neighbour in self.graph[current_node]:
-                        if neighbour[0] not in visited:
-                            visited.add(neighbour[0])
+                        j = index[neighbour[0]]
+                        if labels[j] == -1:
+                            labels[j] = i
                             pile.append(neighbour[0])
-                connected_components.append(component)
-        return set(map(frozenset, connected_components))
+        return labels
+
+    def component_index(self):
+        """
+        Returns the ComponentIndex of the graph (see union_find.ComponentIndex), built on the first call
+        with component_labels and then kept up to date by add_edge.
+        """
+        if self.components is None:
+            self.components = ComponentIndex(self.nodes, self.component_labels())
+        return self.components
 
-    def min_power(self, src, dest):
+    def same_component(self, node1, node2):
+        """Returns True if node1 and node2 are connected, in (amortized) constant time once the index is built."""
+        return self.component_index().same_component(node1, node2)
+
+    def component_sizes(self):
+        """Returns the dictionary {component label: number of nodes} (see component_index)."""
+        return dict(self.component_index().sizes)
+
+    @instrumented("connected_components_set")
+    def connected_components_set(self):
+        """
+        The result should be a set of frozensets (one per component),
+        For instance, for network01.in: {frozenset({1, 2, 3}), frozenset({4, 5, 6, 7})}
+        The components are read from the component labels of component_index.
+        """
+        return self.component_index().components()
+
+    def bottleneck_search(self, src, dest=None):
+        """
+        Minimax version of Dijkstra: the key of a node in the heap is the maximal power
+        on the best path found from src, instead of its distance.
+        If dest is given, the search stops as soon as dest is popped from the heap.
+
+        Outputs:
+        -----------
+        power: dict
+            power[node] is the minimal power needed to go from src to node (exact for every popped node).
+            Nodes that cannot be reached from src are missing.
+        pred: dict
+            pred[node] is the predecessor of node on a path of minimal power.
+        """
+        power = {src: 0}
+        pred = {src: None}
+        visite = set()
+        heap = [(0, src)]
+        pushes = 0
+        while heap:
+            (p, node) = heapq.heappop(heap)
+            if node in visite:
+                continue
+            if node == dest:
+                break
+            visite.add(node)
+            for voisin, p_edge, d in self.graph[node]:
+                if voisin in visite:
+                    continue
+                # La puissance d'un chemin est la puissance maximale de ses arêtes
+                alt = p if p >= p_edge else p_edge
+                if voisin not in power or alt < power[voisin]:
+                    power[voisin] = alt
+                    pred[voisin] = node
+                    heapq.heappush(heap, (alt, voisin))
+                    pushes += 1
+        if instrumentation.enabled:
+            instrumentation.record("bottleneck_search", expanded=len(visite), pushes=pushes)
+        return power, pred
+
+    @instrumented("min_power")
+    @cached_query("min_power")
+    def min_power(self, src, dest, tie_break=False):
         """
         Should return path, min_power.
+        The minimal power is exact and found with a single bottleneck_search.
+        If tie_break is True, the path returned is the shortest (in distance) among the paths of minimal power,
+        at the cost of an additional get_path_with_power.
+        Returns None if there is no path between src and dest.
         """
-        # On determine la puissance maximal du graphe
-        max_power = 0
-        for node in self.nodes:
-            for i in range(len(self.graph[node])):
-                if self.graph[node][i][1] > max_power:
-                    max_power = self.graph[node][i][1]
-        # Si malgrès la puissance maximal trouvé on a aucun chemin on retourne None
-        # On pourra enlever cette condition pour des arbres couvrant
-        if self.get_path_with_power(src, dest, max_power) is None:
+        if not self.same_component(src, dest):
+            return None
+        power, pred = self.bottleneck_search(src, dest)
+        if dest not in power:
             return None
-        min_power = 0
-        eps = 0.9
-        # On effectue une recherche dichotomique sur la puissance
-        # pour trouver le chemin avec une puissance minimal
-        while max_power - min_power > eps:
-            a = self.get_path_with_power(src, dest, (max_power + min_power)/2)
-            if a is not None:
-                max_power = (max_power + min_power)/2
-            else:
-                min_power = (max_power + min_power)/2
-        # On retourne le tuple
-        return (self.get_path_with_power(src, dest, max_power), int(max_power))
-
-    def representation_graph(self, filname, src, dest):
-        # On créé notre graph en donant l'emplacement du fichier.
-        representation = graphviz.Digraph('G', filename='/home/onyxia/work/ensae-prog23/representation_graph.gv', strict=True)
-        # On représente la source en vert
-        representation.node(str(src), color='green')
-        # On représente la destination en rouge
-        representation.node(str(dest), color='red')
-        # On représente les edges entre chaque node
-        for node1 in self.nodes:
-            for node2 in self.graph[node1]:
-                representation.edge(str(node1), str(node2[0]), label=str(node2[1]))
-        path, power = self.min_power(src, dest)
-        # On représente en bleu le chemin de puissance minimal
-        for i in range(len(path)-1):
-            representation.edge(str(path[i]), str(path[i+1]), color='blue')
-        representation.attr(label='Graph de ' + filname + '\npuissance minimal requise pour aller de ' + str(src) + ' à ' + str(dest) + ' : ' + str(power))
+        if tie_break:
+            return (self.get_path_with_power(src, dest, power[dest]), power[dest])
+        # On reconstruit le chemin grâce aux prédécesseurs
+        path = []
+        node = dest
+        while node is not None:
+            path.append(node)
+            node = pred[node]
+        path.reverse()
+        return (path, power[dest])
+
+    def spanning_tree_index(self):
+        """
+        Returns the TreeIndex of a minimal spanning tree of the graph, built with kruskal() on the first call
+        and kept until the graph changes (see version), so that repeated batches do not run kruskal again.
+        """
+        if self.mst_index is None or self.mst_index[0] != self.version:
+            self.mst_index = (self.version, TreeIndex(self.kruskal()))
+        return self.mst_index[1]
+
+    @instrumented("min_power_batch")
+    def min_power_batch(self, pairs):
+        """
+        Returns the list of the minimal powers of the queries (src, dest) of pairs (None if src and dest are not connected).
+        The minimal power between two nodes is the one of the path between them in a minimal spanning tree,
+        hence all the queries are answered together with TreeIndex.power_batch.
+        The spanning tree of the incremental mode (see maintain_spanning_tree) is used if there is one,
+        otherwise the index of spanning_tree_index, which is only built again when the graph changes.
+        """
+        index = self.dynamic_tree if self.dynamic_tree is not None else self.spanning_tree_index()
+        srcs = [pair[0] for pair in pairs]
+        dests = [pair[1] for pair in pairs]
+        return [None if p == -1 else p for p in index.power_batch(srcs, dests).tolist()]
+
+    def _shortest_bottleneck_path(self, src, dest, power):
+        """
+        Dijkstra on the edges of power at most power, where a path is labelled by (distance, maximal power on the path)
+        in lexicographic order: among the shortest paths, the one of smallest power is found.
+        Returns (distance, power of the path, path), or None if dest cannot be reached.
+        """
+        label = {src: (0, 0)}
+        pred = {src: None}
+        visite = set()
+        heap = [(0, 0, src)]
+        while heap:
+            (d, p, node) = heapq.heappop(heap)
+            if node in visite:
+                continue
+            if node == dest:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = pred[node]
+                path.reverse()
+                return d, p, path
+            visite.add(node)
+            for voisin, p_edge, d_edge in self.graph[node]:
+                if voisin in visite or p_edge > power:
+                    continue
+                alt = (d + d_edge, p if p >= p_edge else p_edge)
+                if voisin not in label or alt < label[voisin]:
+                    label[voisin] = alt
+                    pred[voisin] = node
+                    heapq.heappush(heap, (alt[0], alt[1], voisin))
+        return None
+
+    def distinct_powers(self):
+        """Returns the sorted array of the distinct powers of the edges."""
+        return np.unique(np.array([edge[2] for edge in self.edge_list]))
+
+    @instrumented("power_distance_frontier")
+    def power_distance_frontier(self, src, dest, powers=None):
+        """
+        Returns the Pareto frontier of the paths between src and dest: the list of the triples (power, distance, path)
+        such that no path needs at most power and is shorter than distance, by increasing power (and decreasing distance).
+        The first triple is the min_power of the pair, the last one the shortest path without any power constraint.
+
+        The search goes down from the shortest path without constraint: among the shortest paths, the one of smallest
+        power p is found, then the search is restarted on the edges of power strictly less than p, until dest cannot be
+        reached anymore. This costs one search per point of the frontier (plus one).
+        powers is the array of distinct_powers(), which can be given to avoid computing it at each call.
+        Returns an empty list if src and dest are not connected.
+        """
+        if not self.same_component(src, dest):
+            return []
+        if powers is None:
+            powers = self.distinct_powers()
+        frontier = []
+        limit = float('inf')
+        while True:
+            result = self._shortest_bottleneck_path(src, dest, limit)
+            if result is None:
+                break
+            d, p, path = result
+            frontier.append((p, d, path))
+            # Plus grande puissance d'arête strictement inférieure à p
+            i = int(np.searchsorted(powers, p, side='left'))
+            if i == 0:
+                break
+            limit = powers[i - 1].item()
+        if instrumentation.enabled:
+            instrumentation.record("power_distance_frontier", searches=len(frontier) + 1, points=len(frontier))
+        frontier.reverse()
+        return frontier
+
+    def power_distance_frontier_batch(self, pairs):
+        """
+        Returns the list of the power_distance_frontier of the pairs (src, dest) of pairs, e.g. the routes of a routes file.
+        The distinct powers of the edges are only computed once.
+        """
+        powers = self.distinct_powers()
+        return [self.power_distance_frontier(src, dest, powers) for src, dest in pairs]
+
+    @instrumented("nearest_depots")
+    def nearest_depots(self, depots, power):
+        """
+        Labels every node with its nearest depot reachable with the given power, in a single Dijkstra seeded with
+        all the depots at once (see depots.multi_source_search), instead of one search per depot.
+        Returns a DepotIndex: lookup(cities) gives the depots and distances of a list of cities, path(city) the path
+        from its depot. The search runs on the CSR version of the graph (to_csr), which is only rebuilt after add_edge.
+        """
+        return depots_module.multi_source_search(self, depots, power)
+
+    @instrumented("depot_min_power")
+    def depot_min_power(self, depots):
+        """
+        Bottleneck version of nearest_depots: returns a DepotIndex whose values are the minimal power needed to go from
+        each node to some depot, with the depot that needs it and the path (minimax Dijkstra seeded with all the depots).
+        """
+        return depots_module.multi_source_search(self, depots)
+
+    def representation_graph(self, filname, src, dest, output="representation_graph.gv", mode="full", hops=1, view=True):
+        """
+        Draws the graph with graphviz: src in green, dest in red and the min-power path between them in blue,
+        each edge once, labelled with its power. For large networks, mode="path" only draws the path and the edges
+        leaving it, and mode="neighborhood" the nodes at most hops edges away from src and dest (see visualization.py).
+        The drawing is saved in output (relative to the current folder) and displayed if view is True,
+        otherwise the graphviz.Graph is returned.
+        """
+        representation = visualization.to_graphviz(self, src, dest, mode, hops, label=filname, filename=output)
         # Enfin on affiche le graph
-        return representation.view()
-
-    def find(self, parent, i):
-        if parent[i] == i:
-            return i
-        return self.find(parent, parent[i])
-
-    def apply_union(self, parent, rank, x, y):
-        xroot = self.find(parent, x)
-        yroot = self.find(parent, y)
-        if rank[xroot] < rank[yroot]:
-            parent[xroot] = yroot
-        elif rank[xroot] > rank[yroot]:
-            parent[yroot] = xroot
-        else:
-            parent[yroot] = xroot
-            rank[xroot] += 1
+        if view:
+            return representation.view()
+        return representation
+
+    def write_dot(self, filename, src=None, dest=None, mode="full", hops=1):
+        """
+        Writes the same drawing as representation_graph in a DOT file, line by line, without the graphviz package.
+        Returns the number of edges written.
+        """
+        return visualization.write_dot(filename, self, src, dest, mode, hops)
+
+    def edges(self):
+        """
+        Returns the list of the edges (node1, node2, power_min, dist) of the graph, each undirected edge once,
+        in the order they were added.
+        """
+        return list(self.edge_list)
+
+    def to_csr(self):
+        """
+        Returns a compact and read-only copy of the graph as a CSRGraph. The copy is kept until the graph changes
+        (see version), so that repeated calls (e.g. nearest_depots) do not convert the whole graph again.
+        """
+        from csr_graph import CSRGraph
+        if self.csr_copy is None or self.csr_copy[0] != self.version:
+            self.csr_copy = (self.version, CSRGraph.from_edges(self.nodes, self.edges()))
+        return self.csr_copy[1]
 
+    # Une fois le graphe construit avec add_edge, on le fige dans sa version compacte
+    freeze = to_csr
+
+    @instrumented("kruskal")
     def kruskal(self):
-        a = Graph(self.nodes)
-        edges_memory = {}
-        weigth_edge = []
-        for node1 in self.nodes:
-            for edge in self.graph[node1]:
-                node2, p, d = edge
-                if not ((node1, node2) in edges_memory):
-                    edges_memory[(node1, node2)] = True
-                    edges_memory[(node2, node1)] = True
-                    weigth_edge.append((node1, node2, p, d))
-        weigth_edge.sort(key=lambda x: x[2])
-        parent = {}
-        rank = {}
-        for node in self.nodes:
-            parent[node] = node
-            rank[node] = 0
-        for i in range(len(weigth_edge)):
-            node1, node2, p, d = weigth_edge[i]
-            x = self.find(parent, node1)
-            y = self.find(parent, node2)
-            if x != y:
-                a.add_edge(node1, node2, p, d)
-                self.apply_union(parent, rank, x, y)
-        return a
+        """
+        Returns a minimal spanning tree (or forest) of the graph as a CSRGraph.
+        The raw list of edges is sorted with NumPy and the tree is built with a UnionFind (see union_find.kruskal_edges).
+        """
+        from csr_graph import CSRGraph
+        index = {node: i for i, node in enumerate(self.nodes)}
+        node1 = np.array([index[edge[0]] for edge in self.edge_list], dtype=np.int64)
+        node2 = np.array([index[edge[1]] for edge in self.edge_list], dtype=np.int64)
+        power = np.array([edge[2] for edge in self.edge_list])
+        dist = np.array([edge[3] for edge in self.edge_list], dtype=np.float64)
+        selected = kruskal_edges(self.nb_nodes, node1, node2, power)
+        return CSRGraph(self.nodes, node1[selected], node2[selected], power[selected], dist[selected])
+
+    def heavy_light_index(self):
+        """
+        Returns a HeavyLightIndex of the graph (see heavy_light.py): min-power queries in O(log² n) on a minimal
+        spanning forest that stays minimal while the powers of the edges are updated (update_edge_power) or
+        edges are closed (close_edge), e.g. for road restrictions, without running kruskal again.
+        """
+        return HeavyLightIndex(self)
+
+    def reconstruction_tree(self):
+        """
+        Returns the Kruskal reconstruction tree of the graph (see reconstruction_tree.py), built with the same
+        sorted edges as kruskal(). It answers reachable(src, dest, power), min_power_value(src, dest) and
+        reachable_count / reachable_set(node, power) in O(log n), without any traversal of the graph.
+        """
+        index = {node: i for i, node in enumerate(self.nodes)}
+        node1 = [index[edge[0]] for edge in self.edge_list]
+        node2 = [index[edge[1]] for edge in self.edge_list]
+        power = [edge[2] for edge in self.edge_list]
+        return ReconstructionTree(self.nodes, node1, node2, power)
 
     # J'ai repris Djikstra mais que j'ai changé pour un arbre
+    @instrumented("get_path_tree")
     def get_path_tree(self, src, dest):
         """
         Find a path between src and dest in a tree, and return it as a list of nodes.
         If no path is found, return None.
         """
+        if not self.same_component(src, dest):
+            return None
         # Initialisation
         dist = {n: float('inf') for n in self.nodes}
         pred = {n: None for n in self.nodes}
@@ -270,6 +624,7 @@ class Graph:
         heap = [(0, src)]
         # Distance de la source à elle-même
         dist[src] = 0
+        pushes = 0
         # Parcours
         while heap:
             (d, node) = heapq.heappop(heap)
@@ -281,6 +636,8 @@ class Graph:
                     node = pred[node]
                 path.append(src)
                 path.reverse()
+                if instrumentation.enabled:
+                    instrumentation.record("get_path_tree", expanded=len(visite) + 1, pushes=pushes)
                 return path
             visite.add(node)
             for neighbor in self.graph[node]:
@@ -291,31 +648,91 @@ class Graph:
                     dist[neighbor[0]] = alt
                     pred[neighbor[0]] = node
                     heapq.heappush(heap, (alt, neighbor[0]))
+                    pushes += 1
         # Pas de chemin trouvé
+        if instrumentation.enabled:
+            instrumentation.record("get_path_tree", expanded=len(visite), pushes=pushes)
         return None
 
+    @instrumented("min_power_kruskal")
     def min_power_kruskal(self, src, dest):
         """
-        Should return path, min_power.
+        Should return path, min_power. The graph must be a tree (or a forest), e.g. the result of kruskal().
+        The first call builds a TreeIndex, then each query costs O(log n) plus the length of the path.
         """
-        # On recherche le chemin dans l'arbre
-        path = self.get_path_tree(src, dest)
-        # Si le chemin n'existe pas, on retourne None
-        if not path:
-            return None
-        # On détermine la puissance minimale nécessaire pour le chemin trouvé
-        min_power = 0
-        for i in range(len(path)-1):
-            u, v = path[i], path[i+1]
-            for neighbor in self.graph[u]:
-                if neighbor[0] == v:
-                    min_power = max(min_power, neighbor[1])
-                    break
-        return (path, min_power)
-
-def graph_from_file(filename):
+        if self.tree_index is None:
+            self.tree_index = TreeIndex(self)
+        return self.tree_index.min_power(src, dest)
+
+def full_path(filename, base_path=None):
+    """
+    Returns the path of filename relative to base_path (BASE_PATH by default).
+    Absolute filenames are returned unchanged.
+    """
+    return os.path.join(BASE_PATH if base_path is None else base_path, filename)
+
+
+@instrumented("read_table")
+def read_table(filename, base_path=None):
+    """
+    Reads an input file in a single pass and parses all its numbers at once.
+
+    Outputs:
+    -----------
+    header: list
+        The integers of the first line.
+    counts: numpy.ndarray
+        The number of columns of each following (non empty) line.
+    values: numpy.ndarray
+        All the numbers of the following lines, as floats, in order.
+    """
+    with open(full_path(filename, base_path), "rb") as fichier:
+        header = [int(x) for x in fichier.readline().split()]
+        body = fichier.read()
+    values = np.array(body.split(), dtype=np.float64)
+    # On compte les débuts de mots de chaque ligne, sans redécouper le fichier
+    buf = np.frombuffer(body, dtype=np.uint8)
+    space = (buf == 32) | (buf == 9) | (buf == 10) | (buf == 13)
+    starts = ~space
+    starts[1:] &= space[:-1]
+    line = np.cumsum(buf == 10)
+    counts = np.bincount(line[starts], minlength=1)
+    return header, counts[counts > 0], values
+
+
+def table_columns(counts, values, defaults):
+    """
+    Returns the columns of a table read with read_table. Lines can have different numbers of columns:
+    a missing column j takes the value defaults[j] (None if the column is mandatory).
+    """
+    nb_columns = len(defaults)
+    if counts.size and counts.min() == counts.max() == nb_columns:
+        table = values.reshape(-1, nb_columns)
+        return [table[:, j] for j in range(nb_columns)]
+    line_starts = np.cumsum(counts) - counts
+    columns = []
+    for j, default in enumerate(defaults):
+        present = counts > j
+        if default is None and not present.all():
+            raise ValueError(f"Missing column {j + 1} in some lines")
+        column = np.full(len(counts), np.nan if default is None else default, dtype=np.float64)
+        column[present] = values[line_starts[present] + j]
+        columns.append(column)
+    return columns
+
+
+def as_numbers(column):
+    """Converts a column of floats to integers when all its values are integers."""
+    if np.array_equal(column, np.floor(column)):
+        return column.astype(np.int64)
+    return column
+
+
+@instrumented("graph_from_file")
+def graph_from_file(filename, csr=False, base_path=None):
     """
-    Reads a text file and returns the graph as an object of the Graph class.
+    Reads a text file and returns the graph as an object of the Graph class
+    (or of the CSRGraph class if csr is True).
 
     The file should have the following format:
         The first line of the file is 'n m'
@@ -327,46 +744,94 @@ def graph_from_file(filename):
     -----------
     filename: str
         The name of the file
+    csr: bool, optional
+        If True, the arrays of a CSRGraph are built directly from the file. Default is False: the adjacency lists
+        and the edge list of the Graph are filled in bulk from the parsed table, without calling add_edge per edge.
+    base_path: str, optional
+        The folder filename is relative to. Default is BASE_PATH (the root of the repository).
 
     Outputs:
     -----------
     G: Graph
-        An object of the class Graph with the graph from file_name.
+        An object of the class Graph (or CSRGraph) with the graph from file_name.
     """
-    fichier = open("/home/onyxia/work/ensae-prog23/" + filename, "r")
-    # On créer une liste séparant chaque ligne
-    L1 = fichier.read().replace(" ", ",").split()
-    # Pour sépare les sous-éléments de la liste afin d'avoir une liste de liste
-    L2 = [x.replace(",", " ").split() for x in L1]
-    g = Graph()
-    # On initialise le graphe grâce au nombre de nodes
-    g.__init__([i+1 for i in range(int(L2[0][0]))])
-    # Cette condition signifique que le graphe prend comme distance de base 1 pour chaque edge
-    if len(L2[1]) == 3:
-        # On ajoute les edges
-        for node in L2[1:]:
-            g.add_edge(int(node[0]), int(node[1]), int(node[2]))
-        return g
-    # Sinon la distance est spécifié
-    else:
-        # On ajoute les edges
-        for node in L2[1:]:
-            g.add_edge(int(node[0]), int(node[1]), int(node[2]), float(node[3]))
-        # On renvoit le graph
+    header, counts, values = read_table(filename, base_path)
+    n = header[0]
+    node1, node2, power, dist = table_columns(counts, values, [None, None, None, 1])
+    node1, node2, power = node1.astype(np.int64), node2.astype(np.int64), as_numbers(power)
+    nodes = [i+1 for i in range(n)]
+    if csr:
+        from csr_graph import CSRGraph
+        return CSRGraph(nodes, node1 - 1, node2 - 1, power, dist)
+    node1, node2, power = node1.tolist(), node2.tolist(), power.tolist()
+    # Si aucune distance n'est précisée, chaque edge a une distance de 1
+    dist = [1] * len(node1) if counts.size and counts.max() == 3 else dist.tolist()
+    if min(node1 + node2, default=1) < 1 or max(node1 + node2, default=n) > n:
+        # Des nodes hors de 1..n : add_edge les ajoute une par une
+        g = Graph(nodes)
+        for a, b, p, d in zip(node1, node2, power, dist):
+            g.add_edge(a, b, p, d)
         return g
+    # On remplit les listes d'adjacence et la liste des edges d'un coup, sans passer par add_edge.
+    # Le ramasse-miettes est suspendu : il parcourrait sinon sans cesse les centaines de milliers de listes créées
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        g = Graph(nodes)
+        adjacency = g.graph
+        for a, b, p, d in zip(node1, node2, power, dist):
+            adjacency[a].append([b, p, d])
+            adjacency[b].append([a, p, d])
+        g.edge_list = list(zip(node1, node2, power, dist))
+        g.nb_edges = len(g.edge_list)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return g
+
+
+@instrumented("routes_from_file")
+def routes_from_file(filename, base_path=None):
+    """
+    Reads a routes.x.in file: the first line is the number T of routes,
+    the next T lines are 'city1 city2 utility'.
+
+    Outputs:
+    -----------
+    src, dest, utility: numpy.ndarray
+        The columns of the file.
+    """
+    header, counts, values = read_table(filename, base_path)
+    src, dest, utility = table_columns(counts, values, [None, None, None])
+    return src.astype(np.int64), dest.astype(np.int64), as_numbers(utility)
+
+
+@instrumented("trucks_from_file")
+def trucks_from_file(filename, base_path=None):
+    """
+    Reads a trucks.x.in file: the first line is the number of truck models,
+    the next lines are 'power cost'.
+
+    Outputs:
+    -----------
+    power, cost: numpy.ndarray
+        The columns of the file.
+    """
+    header, counts, values = read_table(filename, base_path)
+    power, cost = table_columns(counts, values, [None, None])
+    return as_numbers(power), as_numbers(cost)
+
 
 # J'ai repris le principe de graph_from_file pour les fichiers routes.x.in
-def routes_extract(filename):
-    fichier = open("/home/onyxia/work/ensae-prog23/" + filename, "r")
-    L1 = fichier.read().replace(" ", ",").split()
-    L2 = [x.replace(",", " ").split() for x in L1]
-    return L2
+def routes_extract(filename, base_path=None):
+    with open(full_path(filename, base_path), "r") as fichier:
+        return [line.split() for line in fichier if line.strip()]
 
 # Ici je ne prend que le nombre de sommets
 # et le nombre de trajet des fichier routes
-def little_routes_extract(file_nb):
-    fichier1 = open("/home/onyxia/work/ensae-prog23/input/network." + file_nb + ".in", "r")
-    fichier2 = open("/home/onyxia/work/ensae-prog23/input/routes." + file_nb + ".in", "r")
-    L1 = fichier1.read().replace(" ", ",").split()[0]
-    L2 = fichier2.read().replace(" ", ",").split()[0]
-    return L1.replace(",", " ").split(), L2.replace(",", " ").split()
+def little_routes_extract(file_nb, base_path=None):
+    with open(full_path("input/network." + file_nb + ".in", base_path), "r") as fichier1:
+        L1 = fichier1.readline().split()
+    with open(full_path("input/routes." + file_nb + ".in", base_path), "r") as fichier2:
+        L2 = fichier2.readline().split()
+    return L1, L2
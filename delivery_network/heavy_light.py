@@ -0,0 +1,451 @@
+import heapq
+import numpy as np
+import instrumentation
+from union_find import kruskal_edges
+
+
+class MaxSegmentTree:
+    """
+    Segment tree over the positions 0, ..., capacity-1 giving the maximal value (and its position) of any range
+    of positions in O(log n). Unused positions hold -inf.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = 1
+        while self.capacity < capacity:
+            self.capacity *= 2
+        self.value = [float('-inf')] * (2 * self.capacity)
+        self.arg = [0] * (2 * self.capacity)
+        for i in range(self.capacity):
+            self.arg[self.capacity + i] = i
+
+    def update(self, i, value):
+        value_, arg = self.value, self.arg
+        i += self.capacity
+        value_[i] = value
+        i //= 2
+        while i:
+            left, right = 2 * i, 2 * i + 1
+            if value_[left] >= value_[right]:
+                value_[i], arg[i] = value_[left], arg[left]
+            else:
+                value_[i], arg[i] = value_[right], arg[right]
+            i //= 2
+
+    def set_leaf(self, i, value):
+        """Sets the value at position i without updating the ranges containing it: build() must be called afterwards."""
+        self.value[self.capacity + i] = value
+
+    def build(self):
+        """Recomputes all the ranges from the values of the positions, in O(capacity)."""
+        value, arg = self.value, self.arg
+        for i in range(self.capacity - 1, 0, -1):
+            left, right = 2 * i, 2 * i + 1
+            if value[left] >= value[right]:
+                value[i], arg[i] = value[left], arg[left]
+            else:
+                value[i], arg[i] = value[right], arg[right]
+
+    def query(self, left, right):
+        """Returns (maximal value, position of this value) over the positions left, ..., right (included)."""
+        value, arg = self.value, self.arg
+        best, best_arg = float('-inf'), -1
+        left += self.capacity
+        right += self.capacity + 1
+        while left < right:
+            if left & 1:
+                if value[left] > best:
+                    best, best_arg = value[left], arg[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                if value[right] > best:
+                    best, best_arg = value[right], arg[right]
+            left //= 2
+            right //= 2
+        return best, best_arg
+
+
+class HeavyLightIndex:
+    """
+    Min-power queries on a minimal spanning forest of a graph whose edges change: the power of an edge can be
+    updated (update_edge_power) and an edge can be closed (close_edge) without rebuilding anything globally.
+
+    The forest is cut into heavy paths (heavy-light decomposition): each heavy path occupies consecutive positions
+    of a MaxSegmentTree which holds at the position of each node the power of the edge to its parent. The path
+    between two nodes crosses O(log n) heavy paths, hence a path-max query costs O(log² n), and so does the update
+    of the power of a tree edge.
+    When a tree edge gets worse (or is closed), the cheapest edge of the graph reconnecting the two sides replaces it
+    if it is better. If no edge outside the tree is cheaper than its new power (see spare), nothing is scanned;
+    otherwise only the smaller of the two sides is scanned for the reconnecting edges. When an edge outside the tree
+    gets better, it replaces the worst edge of the tree path between its end nodes if it is better. The subtree that
+    moves is re-rooted and laid out again at the end of the segment tree (its cost is proportional to its size),
+    the rest of the decomposition is unchanged. Once as many nodes as the graph has were moved, the whole
+    decomposition is rebuilt to restore the O(log n) heavy paths.
+    With parallel edges, the edge between u and v designates the one used by the tree if there is one, else the first one.
+    Attributes:
+    -----------
+    nodes: list
+        The nodes. Node nodes[i] has the dense id i.
+    index: dict
+        The dense id of each node.
+    node1, node2, power: list
+        The edges of the graph (dense ids of the end nodes and current power, inf once closed).
+    in_tree: list
+        in_tree[e] is True if the edge e is in the spanning forest.
+    parent, tree_edge: list
+        The parent of each node in the forest and the edge to it (the roots are their own parent, with edge -1).
+    depth, head, pos, component: list
+        The depth of each node, the first node of its heavy path, its position in the segment tree and the root of its tree.
+    spare: list
+        Heap of the (power, edge) of the open edges outside the tree. Entries become stale when the edge enters
+        the tree, is closed or changes power, and are dropped when they reach the top (see _cheapest_spare).
+    """
+
+    def __init__(self, g):
+        """
+        Parameters:
+        -----------
+        g: Graph
+            The graph (Graph or CSRGraph): the spanning forest is computed with kruskal_edges.
+        """
+        self.nodes = list(g.nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+        self.nb_nodes = n
+        edges = g.edges()
+        self.node1 = [self.index[edge[0]] for edge in edges]
+        self.node2 = [self.index[edge[1]] for edge in edges]
+        self.power = [edge[2] for edge in edges]
+        self.closed = [False] * len(edges)
+        self.incident = [[] for _ in range(n)]
+        self.pairs = {}
+        for e, (a, b) in enumerate(zip(self.node1, self.node2)):
+            self.incident[a].append(e)
+            if b != a:
+                self.incident[b].append(e)
+            self.pairs.setdefault((min(a, b), max(a, b)), []).append(e)
+        self.in_tree = [False] * len(edges)
+        selected = kruskal_edges(n, np.array(self.node1, dtype=np.int64), np.array(self.node2, dtype=np.int64), np.array(self.power))
+        for e in selected.tolist():
+            self.in_tree[e] = True
+        self.rebuild()
+
+    def rebuild(self):
+        """Roots the forest again and lays out all its heavy paths from scratch, in O(n log n)."""
+        n = self.nb_nodes
+        self.parent = list(range(n))
+        self.tree_edge = [-1] * n
+        self.children = [set() for _ in range(n)]
+        visited = bytearray(n)
+        for root in range(n):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            pile = [root]
+            while pile:
+                u = pile.pop()
+                for e in self.incident[u]:
+                    if not self.in_tree[e]:
+                        continue
+                    v = self.node1[e] + self.node2[e] - u
+                    if not visited[v]:
+                        visited[v] = 1
+                        self.parent[v] = u
+                        self.tree_edge[v] = e
+                        self.children[u].add(v)
+                        pile.append(v)
+        self.depth = [0] * n
+        self.head = list(range(n))
+        self.pos = [0] * n
+        self.component = list(range(n))
+        self.sizes = {}
+        self.node_at = []
+        self.segment_tree = MaxSegmentTree(n)
+        self.moved = 0
+        self.spare = [(p, e) for e, p in enumerate(self.power) if not self.in_tree[e] and not self.closed[e]]
+        heapq.heapify(self.spare)
+        for root in range(n):
+            if self.parent[root] == root:
+                self.sizes[root] = self._layout(root, bulk=True)
+        self.segment_tree.build()
+
+    def _edge_power(self, e):
+        return 0 if e == -1 else self.power[e]
+
+    def _layout(self, root, bulk=False):
+        """
+        Computes the depths, components and heavy paths of the subtree of root (whose parent is already set)
+        and gives it new positions at the end of the segment tree. Returns the size of the subtree.
+        If bulk is True, only the positions are written and the segment tree must be built afterwards.
+        """
+        parent, children = self.parent, self.children
+        order = [root]
+        for x in order:
+            order.extend(children[x])
+        is_root = parent[root] == root
+        self.depth[root] = 0 if is_root else self.depth[parent[root]] + 1
+        component = root if is_root else self.component[parent[root]]
+        for x in order:
+            self.component[x] = component
+            if x != root:
+                self.depth[x] = self.depth[parent[x]] + 1
+        size = {x: 1 for x in order}
+        for x in reversed(order):
+            if x != root:
+                size[parent[x]] += size[x]
+        if len(self.node_at) + len(order) > self.segment_tree.capacity:
+            self._grow(len(self.node_at) + len(order))
+        # Chaque chemin lourd (on descend toujours vers le plus gros fils) occupe des positions consécutives
+        self.head[root] = root
+        pile = [root]
+        while pile:
+            x = pile.pop()
+            while x is not None:
+                self.pos[x] = len(self.node_at)
+                self.node_at.append(x)
+                if bulk:
+                    self.segment_tree.set_leaf(self.pos[x], self._edge_power(self.tree_edge[x]))
+                else:
+                    self.segment_tree.update(self.pos[x], self._edge_power(self.tree_edge[x]))
+                heavy = max(children[x], key=size.__getitem__, default=None)
+                for c in children[x]:
+                    if c != heavy:
+                        self.head[c] = c
+                        pile.append(c)
+                if heavy is not None:
+                    self.head[heavy] = self.head[x]
+                x = heavy
+        return len(order)
+
+    def _grow(self, capacity):
+        old = self.segment_tree
+        self.segment_tree = MaxSegmentTree(max(capacity, 2 * old.capacity))
+        for i in range(len(self.node_at)):
+            self.segment_tree.update(i, old.value[old.capacity + i])
+
+    def _subtree(self, x):
+        order = [x]
+        for y in order:
+            order.extend(self.children[y])
+        return order
+
+    def _path_max(self, u, v):
+        """Returns (maximal power, dense id of the node below the edge of maximal power) on the path between u and v."""
+        head, depth, parent, pos = self.head, self.depth, self.parent, self.pos
+        best, best_pos = float('-inf'), -1
+        while head[u] != head[v]:
+            if depth[head[u]] < depth[head[v]]:
+                u, v = v, u
+            value, arg = self.segment_tree.query(pos[head[u]], pos[u])
+            if value > best:
+                best, best_pos = value, arg
+            u = parent[head[u]]
+        if u != v:
+            if depth[u] < depth[v]:
+                u, v = v, u
+            value, arg = self.segment_tree.query(pos[v] + 1, pos[u])
+            if value > best:
+                best, best_pos = value, arg
+        if best_pos == -1:
+            return 0, -1
+        return best, self.node_at[best_pos]
+
+    def power_between(self, src, dest):
+        """Returns the minimal power needed to go from src to dest, in O(log² n), or None if they are not connected."""
+        u, v = self.index[src], self.index[dest]
+        if self.component[u] != self.component[v]:
+            return None
+        return self._path_max(u, v)[0]
+
+    def path(self, src, dest):
+        """Returns the path between src and dest in the current spanning forest, or None if they are not connected."""
+        u, v = self.index[src], self.index[dest]
+        if self.component[u] != self.component[v]:
+            return None
+        left, right = [], []
+        while u != v:
+            if self.depth[u] >= self.depth[v]:
+                left.append(self.nodes[u])
+                u = self.parent[u]
+            else:
+                right.append(self.nodes[v])
+                v = self.parent[v]
+        left.append(self.nodes[u])
+        right.reverse()
+        return left + right
+
+    def min_power(self, src, dest):
+        """Returns (path, min_power) like Graph.min_power, or None if src and dest are not connected."""
+        power = self.power_between(src, dest)
+        if power is None:
+            return None
+        return (self.path(src, dest), power)
+
+    def _edge(self, u, v):
+        edges = self.pairs.get((min(u, v), max(u, v)))
+        if not edges:
+            raise KeyError(f"No edge between {self.nodes[u]} and {self.nodes[v]}")
+        for e in edges:
+            if self.in_tree[e]:
+                return e
+        return edges[0]
+
+    def update_edge_power(self, node1, node2, power):
+        """
+        Sets the power of the edge between node1 and node2 (and reopens it if it was closed), then restores
+        a minimal spanning forest by swapping at most one edge in or out of the tree.
+        """
+        e = self._edge(self.index[node1], self.index[node2])
+        old = self.power[e]
+        self.power[e] = power
+        self.closed[e] = False
+        if self.in_tree[e]:
+            x = self._lower_end(e)
+            self.segment_tree.update(self.pos[x], power)
+            if power > old:
+                self._replace(e)
+        else:
+            heapq.heappush(self.spare, (power, e))
+            if power < old:
+                self._insert(e)
+        self._check_rebuild()
+
+    def close_edge(self, node1, node2):
+        """
+        Closes the edge between node1 and node2: it can no longer be used (update_edge_power reopens it).
+        If it was in the tree, the cheapest edge reconnecting the two sides replaces it, if there is one.
+        """
+        e = self._edge(self.index[node1], self.index[node2])
+        self.power[e] = float('inf')
+        self.closed[e] = True
+        if self.in_tree[e]:
+            self._replace(e)
+        self._check_rebuild()
+
+    def _lower_end(self, e):
+        a, b = self.node1[e], self.node2[e]
+        return a if self.tree_edge[a] == e else b
+
+    def _cheapest_spare(self):
+        """Returns the minimal power of the open edges outside the tree (inf if there is none), in amortized O(log m)."""
+        spare = self.spare
+        while spare:
+            p, f = spare[0]
+            if not self.in_tree[f] and not self.closed[f] and self.power[f] == p:
+                return p
+            heapq.heappop(spare)
+        return float('inf')
+
+    def _smaller_side(self, x):
+        """
+        Explores alternately the subtree of x and the rest of its tree, one node at a time, until one of them is
+        complete: returns (its nodes, True if it is the subtree of x), in O(size of the smaller side).
+        """
+        below, above = [x], [self.component[x]]
+        i = j = 0
+        while True:
+            if i == len(below):
+                return below, True
+            below.extend(self.children[below[i]])
+            i += 1
+            if j == len(above):
+                return above, False
+            above.extend(c for c in self.children[above[j]] if c != x)
+            j += 1
+
+    def _replace(self, e):
+        # L'arête e de l'arbre est devenue pire : on cherche la meilleure arête qui relie les deux côtés
+        if not self.closed[e] and self._cheapest_spare() >= self.power[e]:
+            # Aucune arête hors de l'arbre ne peut la remplacer : inutile de parcourir un côté
+            return
+        x = self._lower_end(e)
+        side, below = self._smaller_side(x)
+        inside = set(side)
+        best = -1
+        for y in side:
+            for f in self.incident[y]:
+                if self.in_tree[f] or self.closed[f]:
+                    continue
+                other = self.node1[f] + self.node2[f] - y
+                if other not in inside and (best == -1 or self.power[f] < self.power[best]):
+                    best = f
+        size = len(side) if below else self.sizes[self.component[x]] - len(side)
+        if instrumentation.enabled:
+            instrumentation.record("heavy_light", scanned=len(side))
+        if best != -1 and self.power[best] < self.power[e]:
+            # a est l'extrémité de best dans le sous-arbre de x
+            a = self.node1[best] if (self.node1[best] in inside) == below else self.node2[best]
+            self._cut(x, size)
+            self._hang(a, self.node1[best] + self.node2[best] - a, x, best)
+        elif self.closed[e]:
+            # Aucune arête ne relie les deux côtés : le sous-arbre devient un arbre à part
+            self._cut(x, size)
+            self._relayout(x)
+
+    def _insert(self, f):
+        # L'arête f hors de l'arbre est devenue meilleure : elle remplace la pire arête du cycle qu'elle forme
+        a, b = self.node1[f], self.node2[f]
+        if a == b:
+            return
+        if self.component[a] != self.component[b]:
+            # Elle relie deux arbres : on accroche le plus petit au plus grand
+            if self.sizes[self.component[a]] > self.sizes[self.component[b]]:
+                a, b = b, a
+            self._hang(a, b, self.component[a], f)
+            return
+        worst, x = self._path_max(a, b)
+        if worst <= self.power[f]:
+            return
+        subtree = self._subtree(x)
+        if a not in set(subtree):
+            a, b = b, a
+        self._cut(x, len(subtree))
+        self._hang(a, b, x, f)
+
+    def _cut(self, x, size):
+        # On détache le sous-arbre de x, qui devient un arbre de racine x
+        e = self.tree_edge[x]
+        self.in_tree[e] = False
+        if not self.closed[e]:
+            heapq.heappush(self.spare, (self.power[e], e))
+        self.children[self.parent[x]].discard(x)
+        self.sizes[self.component[x]] -= size
+        self.parent[x] = x
+        self.tree_edge[x] = -1
+        self.sizes[x] = size
+
+    def _hang(self, a, b, top, f):
+        """
+        Re-roots at a the tree of root top (which contains a), makes a a child of b through the edge f
+        and lays out the moved nodes again.
+        """
+        chemin = [a]
+        while chemin[-1] != top:
+            chemin.append(self.parent[chemin[-1]])
+        for child, node in zip(reversed(chemin[:-1]), reversed(chemin[1:])):
+            # L'arête entre child et node était portée par child, elle est désormais portée par node
+            self.children[node].discard(child)
+            self.children[child].add(node)
+            self.parent[node] = child
+            self.tree_edge[node] = self.tree_edge[child]
+        size = self.sizes.pop(top)
+        self.parent[a] = b
+        self.tree_edge[a] = f
+        self.in_tree[f] = True
+        self.children[b].add(a)
+        self.sizes[self.component[b]] += size
+        self._relayout(a)
+        if instrumentation.enabled:
+            instrumentation.record("heavy_light", swaps=1, moved=size)
+
+    def _relayout(self, root):
+        # Les anciennes positions des nodes déplacées ne servent plus
+        for x in self._subtree(root):
+            self.segment_tree.update(self.pos[x], float('-inf'))
+        self.moved += self._layout(root)
+
+    def _check_rebuild(self):
+        # Après beaucoup de déplacements, les chemins lourds ne sont plus équilibrés et le segment tree est plein de trous
+        if self.moved > self.nb_nodes:
+            self.rebuild()
@@ -0,0 +1,130 @@
+"""
+Opt-in instrumentation of the hot paths of the package: counters (nodes expanded, heap pushes, union-find steps...),
+timers and latency histograms. Everything is disabled by default: the instrumented functions then only pay
+a test of the module-level flag `enabled` per call.
+
+Usage:
+    import instrumentation
+    instrumentation.enable()
+    g.min_power(1, 4)
+    print(instrumentation.report())
+"""
+import functools
+import json
+import time
+from collections import defaultdict, deque
+import numpy as np
+
+enabled = False
+counters = defaultdict(int)
+timers = defaultdict(float)
+# Seules les dernières durées de chaque nom sont gardées pour les histogrammes : la mémoire reste bornée
+# dans un processus qui tourne longtemps (query_server), les compteurs et les temps totaux restent exacts
+MAX_SAMPLES = 10000
+samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+
+
+def enable():
+    """Starts recording (without resetting what was already recorded)."""
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Forgets all the counters, timers and latencies."""
+    counters.clear()
+    timers.clear()
+    samples.clear()
+
+
+def add(name, value=1):
+    """Adds value to the counter name. Callers test `enabled` first, so that nothing is done when disabled."""
+    counters[name] += value
+
+
+def record(prefix, **values):
+    """Adds several values at once to the counters prefix.name, e.g. record("kruskal", edges=10, find_steps=25)."""
+    for name, value in values.items():
+        counters[prefix + "." + name] += value
+
+
+def maximum(name, value):
+    """Keeps in the counter name the largest value seen, e.g. maximum("kruskal.max_depth", 7)."""
+    counters[name] = max(counters[name], value)
+
+
+def observe(name, seconds):
+    """Records a duration: adds it to the timer name and keeps it for the latency histogram of name (the last MAX_SAMPLES)."""
+    timers[name] += seconds
+    samples[name].append(seconds)
+    counters[name + ".calls"] += 1
+
+
+def instrumented(name):
+    """
+    Decorator timing every call of a function under name when the instrumentation is enabled.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t0)
+        return wrapper
+    return decorator
+
+
+class timed:
+    """
+    Context manager timing a block under name when the instrumentation is enabled:
+        with instrumentation.timed("solve_routes"):
+            ...
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter() if enabled else None
+        return self
+
+    def __exit__(self, *exc):
+        if self.t0 is not None:
+            observe(self.name, time.perf_counter() - self.t0)
+
+
+def histogram(values):
+    """Returns the count, mean, max and the 50th, 95th and 99th percentiles of a list of durations."""
+    values = np.asarray(values, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"count": len(values), "mean": float(values.mean()), "max": float(values.max()), "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+
+def report():
+    """
+    Returns everything recorded as a dictionary:
+    {"counters": {name: value}, "timers": {name: total seconds}, "latencies": {name: histogram}}.
+    """
+    return {
+        "counters": dict(counters),
+        "timers": dict(timers),
+        "latencies": {name: histogram(list(values)) for name, values in samples.items() if values},
+    }
+
+
+def to_json(filename=None):
+    """Returns the report as a JSON string, and writes it in filename if it is given."""
+    text = json.dumps(report(), indent=1)
+    if filename is not None:
+        with open(filename, "w") as fichier:
+            fichier.write(text)
+    return text
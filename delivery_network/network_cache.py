@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from graph import full_path, graph_from_file
+from csr_graph import CSRGraph
+from tree_index import TreeIndex
+from instrumentation import instrumented
+
+# À changer dès que le contenu du cache change, les anciens caches sont alors reconstruits
+CACHE_VERSION = 1
+
+
+def cache_path(filename, base_path=None):
+    """
+    Returns the folder of the cache of a network file, next to it: network.x.in -> network.x.in.cache
+    """
+    return full_path(filename, base_path) + ".cache"
+
+
+def file_hash(path):
+    """Returns the SHA-1 of the content of a file."""
+    h = hashlib.sha1()
+    with open(path, "rb") as fichier:
+        for block in iter(lambda: fichier.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_meta(folder, meta):
+    # Écriture dans un fichier temporaire puis renommage : meta.json n'est jamais lu à moitié écrit
+    path = os.path.join(folder, "meta.json")
+    with open(path + ".tmp", "w") as fichier:
+        json.dump(meta, fichier)
+    os.replace(path + ".tmp", path)
+
+
+def read_meta(folder):
+    try:
+        with open(os.path.join(folder, "meta.json"), "r") as fichier:
+            return json.load(fichier)
+    except (OSError, ValueError):
+        return None
+
+
+def cache_is_valid(filename, base_path=None):
+    """
+    Returns True if the cache of filename exists, has the current version and was built from the current content of the file.
+    The size and modification time are checked first, the hash is only computed if the modification time changed.
+    If the content did not change, the new modification time is written in the cache, so that the next loads
+    do not compute the hash again.
+    """
+    source = full_path(filename, base_path)
+    folder = cache_path(filename, base_path)
+    meta = read_meta(folder)
+    if meta is None or meta.get("version") != CACHE_VERSION:
+        return False
+    stat = os.stat(source)
+    if stat.st_size != meta["size"]:
+        return False
+    if stat.st_mtime_ns == meta["mtime_ns"]:
+        return True
+    if file_hash(source) != meta["sha1"]:
+        return False
+    meta["mtime_ns"] = stat.st_mtime_ns
+    try:
+        write_meta(folder, meta)
+    except OSError:
+        pass
+    return True
+
+
+def save_cache(filename, g, tree, base_path=None):
+    """
+    Saves the graph g (CSRGraph), its spanning tree and the TreeIndex of the tree in the cache of filename.
+    Each array is saved in its own .npy file so that it can be memory-mapped.
+    """
+    source = full_path(filename, base_path)
+    folder = cache_path(filename, base_path)
+    tmp = folder + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    if tree.tree_index is None:
+        tree.tree_index = TreeIndex(tree)
+    np.save(os.path.join(tmp, "nodes.npy"), np.array(g.nodes))
+    for prefix, arrays in (("graph", g.arrays()), ("tree", tree.arrays()), ("index", tree.tree_index.arrays())):
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, prefix + "." + name + ".npy"), array)
+    stat = os.stat(source)
+    meta = {"version": CACHE_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": file_hash(source)}
+    # meta.json est écrit en dernier : un cache incomplet n'est jamais considéré comme valide
+    write_meta(tmp, meta)
+    shutil.rmtree(folder, ignore_errors=True)
+    os.rename(tmp, folder)
+
+
+def load_cache(filename, base_path=None, mmap_mode='r'):
+    """
+    Loads the graph, its spanning tree and the TreeIndex of the tree from the cache of filename.
+    With mmap_mode='r' (default) the arrays are memory-mapped, nothing is read before it is used.
+    """
+    folder = cache_path(filename, base_path)
+
+    def load(prefix, names):
+        return {name: np.load(os.path.join(folder, prefix + "." + name + ".npy"), mmap_mode=mmap_mode) for name in names}
+
+    nodes = np.load(os.path.join(folder, "nodes.npy")).tolist()
+    g = CSRGraph.from_arrays(nodes, load("graph", CSRGraph.ARRAYS))
+    tree = CSRGraph.from_arrays(nodes, load("tree", CSRGraph.ARRAYS))
+    tree.tree_index = TreeIndex.from_arrays(nodes, load("index", TreeIndex.ARRAYS))
+    return g, tree
+
+
+@instrumented("load_network")
+def load_network(filename, base_path=None, use_cache=True):
+    """
+    Returns the graph of a network.x.in file as a CSRGraph, and its minimal spanning tree with its TreeIndex.
+    If use_cache is True, a valid cache is loaded instead of parsing the file and running kruskal,
+    and the cache is (re)built otherwise. The cache is not written if its folder cannot be written.
+
+    Outputs:
+    -----------
+    g: CSRGraph
+        The graph.
+    tree: CSRGraph
+        The result of g.kruskal(), with tree.tree_index ready (tree.min_power_kruskal is O(log n)).
+    """
+    if use_cache and cache_is_valid(filename, base_path):
+        g, tree = load_cache(filename, base_path)
+    else:
+        g = graph_from_file(filename, csr=True, base_path=base_path)
+        tree = g.kruskal()
+        tree.tree_index = TreeIndex(tree)
+        if use_cache:
+            try:
+                save_cache(filename, g, tree, base_path)
+            except OSError:
+                pass
+    # tree est l'arbre couvrant minimal de g et de lui-même : min_power_batch n'a pas à relancer kruskal
+    g.mst_index = (g.version, tree.tree_index)
+    tree.mst_index = (tree.version, tree.tree_index)
+    return g, tree
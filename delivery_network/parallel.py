@@ -0,0 +1,129 @@
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+import time
+import numpy as np
+import instrumentation
+from tree_index import power_batch_ids
+
+
+class SharedArrays:
+    """
+    A set of NumPy arrays copied once into shared memory blocks, to be used by several processes without any copy.
+    Use it as a context manager: the blocks are freed when the with block ends.
+    Attributes:
+    -----------
+    spec: dict
+        spec[name] = (name of the shared memory block, shape, dtype), what a worker needs to attach the arrays.
+    arrays: dict
+        The arrays in shared memory, seen from the current process.
+    """
+
+    def __init__(self, arrays):
+        self.blocks = []
+        self.spec = {}
+        self.arrays = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            self.blocks.append(block)
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            shared[...] = array
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+            self.arrays[name] = shared
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def attach(spec):
+    """
+    Returns the arrays described by spec (see SharedArrays.spec) without copying them, and the blocks to keep alive.
+    """
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in spec.items():
+        # Les processus de calcul partagent le resource_tracker du processus principal, qui seul libère les blocs
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
+
+
+# Tableaux partagés vus par un processus de calcul (initialisés par init_worker)
+worker_arrays = None
+worker_blocks = None
+
+
+def init_worker(spec):
+    global worker_arrays, worker_blocks
+    worker_arrays, worker_blocks = attach(spec)
+
+
+def solve_chunk(bounds):
+    """Answers the queries worker_arrays["src"][start:stop], worker_arrays["dest"][start:stop]."""
+    start, stop = bounds
+    return power_batch_ids(worker_arrays, worker_arrays["src"][start:stop], worker_arrays["dest"][start:stop])
+
+
+def iter_power_batch(index, srcs, dests, workers=None, chunk_size=20000):
+    """
+    Answers the min-power queries (srcs[j], dests[j]) on a TreeIndex with several processes,
+    and yields the results chunk by chunk, in the order of the queries.
+    The tables of the index and the queries are put once in shared memory: the workers attach them
+    without copying or pickling the graph, and only receive the bounds of their chunks.
+    With workers=1 (or a single chunk) everything runs in the current process.
+
+    Parameters:
+    -----------
+    index: TreeIndex
+        The index of the minimal spanning tree.
+    srcs, dests: sequences of nodes
+        The queries.
+    workers: int, optional
+        Number of processes. Default is os.cpu_count().
+    chunk_size: int, optional
+        Number of queries sent to a worker at once. Default is 20000.
+    """
+    u, v = index.ids(srcs), index.ids(dests)
+    bounds = [(start, min(start + chunk_size, len(u))) for start in range(0, len(u), chunk_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tables = index.arrays()
+    if workers <= 1 or len(bounds) <= 1:
+        for start, stop in bounds:
+            with instrumentation.timed("power_batch.chunk"):
+                result = power_batch_ids(tables, u[start:stop], v[start:stop])
+            yield result
+        return
+    with SharedArrays(dict(tables, src=u, dest=v)) as shared:
+        with multiprocessing.Pool(min(workers, len(bounds)), initializer=init_worker, initargs=(shared.spec,)) as pool:
+            t0 = time.perf_counter()
+            for result in pool.imap(solve_chunk, bounds):
+                if instrumentation.enabled:
+                    # Temps écoulé entre deux morceaux reçus
+                    t1 = time.perf_counter()
+                    instrumentation.observe("power_batch.chunk", t1 - t0)
+                    t0 = t1
+                yield result
+
+
+def parallel_power_batch(index, srcs, dests, workers=None, chunk_size=20000):
+    """
+    Same as TreeIndex.power_batch, with the queries split between several processes (see iter_power_batch).
+    Queries whose nodes are not connected get -1.
+    """
+    chunks = list(iter_power_batch(index, srcs, dests, workers, chunk_size))
+    if not chunks:
+        return np.zeros(0, dtype=index.arrays()["max_power"].dtype)
+    return np.concatenate(chunks)
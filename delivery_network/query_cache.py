@@ -0,0 +1,102 @@
+import functools
+from collections import OrderedDict
+
+# Valeur par défaut de get, distincte de None qui est un résultat possible (src et dest non reliées)
+MISSING = object()
+
+
+class LRUCache:
+    """
+    A bounded cache of query results: when it is full, the least recently used result is evicted.
+    Attributes:
+    -----------
+    maxsize: int
+        The maximal number of results kept.
+    version: int
+        The version of the graph the results were computed on (see Graph.version).
+    hits, misses: int
+        The number of queries answered by the cache and computed.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.results = OrderedDict()
+
+    def __len__(self):
+        return len(self.results)
+
+    def get(self, key, default=MISSING):
+        try:
+            value = self.results[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.results.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.results[key] = value
+        self.results.move_to_end(key)
+        if len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+
+    def clear(self):
+        """Forgets the results (the statistics are kept)."""
+        self.results.clear()
+
+    def stats(self):
+        return {"size": len(self.results), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+def oriented(result, reverse):
+    """
+    Returns a copy of a cached result (a path, a pair (path, power) or None), with the path reversed if reverse is True.
+    The cached result itself is never given to the caller, who may modify it.
+    """
+    if result is None:
+        return None
+    if isinstance(result, tuple):
+        return (oriented(result[0], reverse), result[1])
+    return result[::-1] if reverse else list(result)
+
+
+def is_reversed(src, dest):
+    """Returns True if the pair is stored as (dest, src) in the cache, i.e. if dest comes before src."""
+    try:
+        return dest < src
+    except TypeError:
+        # Nodes qui ne se comparent pas (par exemple 1 et "a") : on compare le nom de leur type puis leur repr
+        return (type(dest).__name__, repr(dest)) < (type(src).__name__, repr(src))
+
+
+def cached_query(name):
+    """
+    Decorator of the query methods (self, src, dest, ...) of a graph, whose results are kept in self.query_cache
+    when the cache is enabled (see Graph.cache_queries). Graphs are not oriented, hence (src, dest) and (dest, src)
+    share the same entry: the key is the sorted pair, the other arguments and name.
+    The cache is emptied as soon as the version of the graph changes (Graph.add_edge), so that a result is never stale.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(self, src, dest, *args, **kwargs):
+            cache = self.query_cache
+            if cache is None:
+                return function(self, src, dest, *args, **kwargs)
+            if cache.version != self.version:
+                cache.clear()
+                cache.version = self.version
+            reverse = is_reversed(src, dest)
+            if reverse:
+                src, dest = dest, src
+            key = (name, src, dest) + args + tuple(sorted(kwargs.items()))
+            result = cache.get(key)
+            if result is MISSING:
+                result = function(self, src, dest, *args, **kwargs)
+                cache.put(key, result)
+            return oriented(result, reverse)
+        return wrapper
+    return decorator
@@ -0,0 +1,303 @@
+"""
+Long-running query service: the networks are loaded once (with network_cache.load_network) and their graphs and
+indexes stay in memory, then min_power / get_path_with_power / reachable queries are answered over a local socket
+(localhost TCP or Unix socket), with asyncio.
+
+The protocol is one JSON object per line, in both directions:
+    {"id": 1, "op": "min_power", "network": "2", "src": 1, "dest": 4}            -> {"id": 1, "result": [path, power]}
+    {"id": 2, "op": "get_path_with_power", "network": "2", "src": 1, "dest": 4, "power": 10}  -> {"id": 2, "result": path}
+    {"id": 3, "op": "reachable", "network": "2", "src": 1, "dest": 4, "power": 10}   -> {"id": 3, "result": true}
+    {"id": 4, "op": "stats"}                                                       -> {"id": 4, "result": {...}}
+Unreachable pairs give null, errors give {"id": ..., "error": message}: unknown cities or a power that is not a number
+are rejected before any search. min_power only returns the power when "path": false is given. Requests of the same kind
+arriving within batch_window seconds are answered together (TreeIndex.power_batch, Graph.get_path_with_power_batch),
+in a worker thread so that the event loop keeps serving the other connections during a large batch.
+
+Usage (from the root folder):
+    python delivery_network/query_server.py --network 1=input/network.1.in --network 2=input/network.2.in --port 8765
+    python delivery_network/query_server.py --network 2=input/network.2.in --unix /tmp/delivery_network.sock
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from instrumentation import histogram
+from network_cache import load_network
+
+OPERATIONS = ("min_power", "get_path_with_power", "reachable", "stats")
+# Opérations dont les requêtes doivent donner une puissance
+WITH_POWER = ("get_path_with_power", "reachable")
+
+
+class QueryServer:
+    """
+    Keeps the networks in memory and answers the queries in batches.
+    Attributes:
+    -----------
+    networks: dict
+        networks[name] is the pair (g, tree) returned by load_network: the CSRGraph and its minimal spanning tree
+        with its TreeIndex.
+    batch_window: float
+        How long (in seconds) the first query of a batch waits for others.
+    pending: dict
+        pending[(network, op)] is the list of the (request, future) waiting for the next batch.
+    executor: ThreadPoolExecutor
+        The thread that answers the batches. There is only one, because the searches of a CSRGraph
+        share its scratch arrays: the batches are answered one after the other.
+    """
+
+    def __init__(self, networks, base_path=None, use_cache=True, batch_window=0.002, max_batch=10000, nb_latencies=10000):
+        """
+        Parameters:
+        -----------
+        networks: dict
+            {name: network file}, the names are the "network" field of the requests.
+        """
+        self.networks = {name: load_network(filename, base_path, use_cache) for name, filename in networks.items()}
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.pending = {}
+        self.started = time.perf_counter()
+        self.nb_requests = 0
+        self.nb_batches = 0
+        self.nb_errors = 0
+        self.latencies = deque(maxlen=nb_latencies)
+        self.server = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.tasks = set()
+
+    def stats(self):
+        """Returns the number of requests and batches, the throughput (requests per second) and the latencies."""
+        elapsed = time.perf_counter() - self.started
+        result = {
+            "requests": self.nb_requests,
+            "batches": self.nb_batches,
+            "errors": self.nb_errors,
+            "mean_batch_size": self.nb_requests / self.nb_batches if self.nb_batches else 0,
+            "uptime_s": elapsed,
+            "throughput": self.nb_requests / elapsed if elapsed else 0,
+            "networks": {name: {"nb_nodes": g.nb_nodes, "nb_edges": g.nb_edges} for name, (g, tree) in self.networks.items()},
+        }
+        if self.latencies:
+            result["latency_s"] = histogram(list(self.latencies))
+        return result
+
+    async def submit(self, request):
+        """Queues a request for the next batch of its kind and returns its result."""
+        op = request.get("op")
+        if op == "stats":
+            return self.stats()
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown op {op}, expected one of {OPERATIONS}")
+        name = str(request.get("network"))
+        if name not in self.networks:
+            raise ValueError(f"Unknown network {name}")
+        self.check(self.networks[name][0], op, request)
+        key = (name, op)
+        future = asyncio.get_running_loop().create_future()
+        batch = self.pending.setdefault(key, [])
+        batch.append((request, future))
+        if len(batch) == 1:
+            asyncio.get_running_loop().call_later(self.batch_window, self.flush, key)
+        elif len(batch) >= self.max_batch:
+            self.flush(key)
+        return await future
+
+    @staticmethod
+    def check(g, op, request):
+        """Raises ValueError if the cities of request are not nodes of g, or if its power is not a number."""
+        for field in ("src", "dest"):
+            node = request.get(field)
+            if isinstance(node, (bool, list, dict)) or node not in g.index:
+                raise ValueError(f"Unknown {field} {node!r}")
+        if op in WITH_POWER:
+            power = request.get("power")
+            if isinstance(power, bool) or not isinstance(power, (int, float)):
+                raise ValueError(f"power must be a number, got {power!r}")
+
+    def flush(self, key):
+        """Starts answering all the pending requests of key at once, in the thread of self.executor."""
+        batch = self.pending.pop(key, None)
+        if not batch:
+            return
+        self.nb_batches += 1
+        task = asyncio.get_running_loop().create_task(self.answer(key, batch))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def answer(self, key, batch):
+        requests = [request for request, future in batch]
+        results = await asyncio.get_running_loop().run_in_executor(self.executor, self.solve, key, requests)
+        for (request, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def solve(self, key, requests):
+        """Returns the results of the requests of key (an Exception for each request that failed)."""
+        name, op = key
+        g, tree = self.networks[name]
+        try:
+            results = getattr(self, "batch_" + op)(g, tree, requests)
+        except Exception:
+            # Une requête invalide ne doit pas faire échouer tout le lot : on les reprend une par une
+            results = []
+            for request in requests:
+                try:
+                    results.append(getattr(self, "batch_" + op)(g, tree, [request])[0])
+                except Exception as error:
+                    results.append(error)
+        return results
+
+    def powers(self, tree, requests):
+        index = tree.tree_index
+        return index.power_batch([request["src"] for request in requests], [request["dest"] for request in requests]).tolist()
+
+    def batch_min_power(self, g, tree, requests):
+        results = []
+        for request, power in zip(requests, self.powers(tree, requests)):
+            if power == -1:
+                results.append(None)
+            elif request.get("path", True):
+                results.append([tree.tree_index.path(request["src"], request["dest"]), power])
+            else:
+                results.append(power)
+        return results
+
+    def batch_reachable(self, g, tree, requests):
+        return [power != -1 and power <= request["power"] for request, power in zip(requests, self.powers(tree, requests))]
+
+    def batch_get_path_with_power(self, g, tree, requests):
+        return g.get_path_with_power_batch([(request["src"], request["dest"], request["power"]) for request in requests])
+
+    async def handle(self, reader, writer):
+        """Serves one connection: the requests of a connection are answered concurrently, in any order."""
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line):
+            t0 = time.perf_counter()
+            request = {}
+            try:
+                request = json.loads(line)
+                response = {"id": request.get("id"), "result": await self.submit(request)}
+            except Exception as error:
+                self.nb_errors += 1
+                response = {"id": request.get("id") if isinstance(request, dict) else None, "error": f"{type(error).__name__}: {error}"}
+            self.nb_requests += 1
+            self.latencies.append(time.perf_counter() - t0)
+            async with lock:
+                writer.write((json.dumps(response, default=to_json) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """
+        Starts listening on host:port (port 0 chooses a free port), or on the Unix socket path if it is given.
+        Returns the asyncio server; the address is in server.sockets[0].getsockname().
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+
+def to_json(value):
+    # Les entiers et flottants NumPy des index ne sont pas sérialisables tels quels
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class QueryClient:
+    """
+    Client of a QueryServer: requests can be sent concurrently on the same connection,
+    the responses are matched to them with their id.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.waiting = {}
+        self.listener = asyncio.create_task(self.listen())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def listen(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self.waiting.pop(response.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self.waiting.values():
+            future.set_exception(ConnectionError("connection closed"))
+
+    async def request(self, op, **fields):
+        """Sends a request and returns its result, or raises RuntimeError with the message of the server."""
+        self.next_id += 1
+        request_id = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write((json.dumps(dict(fields, id=request_id, op=op)) + "\n").encode())
+        await self.writer.drain()
+        response = await future
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    async def close(self):
+        self.writer.close()
+        await self.listener
+
+
+async def serve(networks, host="127.0.0.1", port=8765, path=None, batch_window=0.002):
+    server = QueryServer(networks, batch_window=batch_window)
+    await server.start(host, port, path)
+    print(f"Listening on {path if path is not None else f'{host}:{port}'} with networks {sorted(networks)}")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--network", action="append", required=True, help="NAME=FILE, can be repeated")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="path of a Unix socket (instead of TCP)")
+    parser.add_argument("--batch-window", type=float, default=0.002, help="seconds")
+    args = parser.parse_args(argv)
+    networks = dict(item.split("=", 1) for item in args.network)
+    asyncio.run(serve(networks, args.host, args.port, args.unix, args.batch_window))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import numpy as np
+from union_find import UnionFind, kruskal_edges
+
+
+class ReconstructionTree:
+    """
+    Kruskal reconstruction tree of a graph, answering power-threshold connectivity queries in O(log n).
+    Its leaves are the n nodes of the graph (ids 0, ..., n-1). Each time Kruskal's algorithm adds an edge of power p
+    between two components, a new internal node of weight p becomes the parent of the roots of both components.
+    Weights increase towards the roots, hence two nodes are connected with a power p if and only if
+    their lowest common ancestor has a weight at most p, and the nodes reachable from a node with a power p
+    are the leaves under its highest ancestor of weight at most p. The leaves under each node are contiguous in leaf_order.
+    Attributes:
+    -----------
+    nodes: list
+        The nodes of the graph. Node nodes[i] is the leaf of id i.
+    index: dict
+        The dense id of each node.
+    parent: numpy.ndarray
+        parent[x] is the parent of x in the reconstruction tree (roots are their own parent).
+    weight: numpy.ndarray
+        weight[x] is the power of the edge that created the internal node x (0 for leaves).
+    depth: numpy.ndarray
+        depth[x] is the depth of x.
+    root: numpy.ndarray
+        root[x] is the root of the tree of x (one tree per connected component of the graph).
+    up: numpy.ndarray
+        up[k][x] is the 2^k-th ancestor of x.
+    leaf_order: numpy.ndarray
+        The leaves in depth-first order.
+    first, last: numpy.ndarray
+        The leaves under x are leaf_order[first[x]:last[x]].
+    """
+
+    def __init__(self, nodes, node1, node2, power):
+        """
+        Builds the reconstruction tree from the raw list of edges of a graph.
+        Parameters:
+        -----------
+        nodes: list
+            The nodes of the graph.
+        node1, node2: array-like of int
+            Dense ids (positions in nodes) of the end nodes of each edge.
+        power: array-like
+            Minimal power of each edge.
+        """
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+        self.nb_nodes = n
+        node1, node2, power = np.asarray(node1), np.asarray(node2), np.asarray(power)
+        selected = kruskal_edges(n, node1, node2, power).tolist()
+        size = n + len(selected)
+        parent = list(range(size))
+        weight = [0] * size
+        # top[r] est le sommet de l'arbre de reconstruction qui représente la composante de racine r
+        top = list(range(n))
+        uf = UnionFind(n)
+        for j, (a, b, p) in enumerate(zip(node1[selected].tolist(), node2[selected].tolist(), power[selected].tolist())):
+            x = n + j
+            a, b = uf.find(a), uf.find(b)
+            parent[top[a]] = x
+            parent[top[b]] = x
+            weight[x] = p
+            uf.union(a, b)
+            top[uf.find(a)] = x
+        self.parent = np.array(parent, dtype=np.int64)
+        self.weight = np.array(weight)
+        # Un parent est toujours créé après ses enfants : on calcule les profondeurs des racines vers les feuilles
+        depth = [0] * size
+        root = list(range(size))
+        for x in range(size - 1, -1, -1):
+            if parent[x] != x:
+                depth[x] = depth[parent[x]] + 1
+                root[x] = root[parent[x]]
+        self.depth = np.array(depth, dtype=np.int64)
+        self.root = np.array(root, dtype=np.int64)
+        # Ordre des feuilles : les feuilles sous un sommet forment un intervalle de leaf_order
+        children = [[] for _ in range(size)]
+        for x in range(size):
+            if parent[x] != x:
+                children[parent[x]].append(x)
+        first = [0] * size
+        last = [0] * size
+        leaf_order = []
+        for r in range(size - 1, -1, -1):
+            if parent[r] != r:
+                continue
+            pile = [(r, False)]
+            while pile:
+                x, done = pile.pop()
+                if done:
+                    last[x] = len(leaf_order)
+                    continue
+                first[x] = len(leaf_order)
+                if x < n:
+                    leaf_order.append(x)
+                    last[x] = len(leaf_order)
+                    continue
+                pile.append((x, True))
+                pile.extend((child, False) for child in children[x])
+        self.leaf_order = np.array(leaf_order, dtype=np.int64)
+        self.first = np.array(first, dtype=np.int64)
+        self.last = np.array(last, dtype=np.int64)
+        # Tables de binary lifting
+        log = max(1, int(self.depth.max(initial=0)).bit_length())
+        up = [self.parent]
+        for k in range(1, log):
+            up.append(up[-1][up[-1]])
+        self.up = np.array(up)
+        # Vues utilisées par les requêtes : l'accès à un élément renvoie un int Python
+        self._up = [memoryview(row) for row in self.up]
+        self._weight = memoryview(self.weight)
+        self._depth = memoryview(self.depth)
+        self._root = memoryview(self.root)
+        self._first = memoryview(self.first)
+        self._last = memoryview(self.last)
+
+    def _highest(self, x, power):
+        """Returns the highest ancestor of x whose weight is at most power."""
+        weight = self._weight
+        for row in reversed(self._up):
+            if weight[row[x]] <= power:
+                x = row[x]
+        return x
+
+    def _lca(self, u, v):
+        up, depth = self._up, self._depth
+        if depth[u] < depth[v]:
+            u, v = v, u
+        diff = depth[u] - depth[v]
+        k = 0
+        while diff:
+            if diff & 1:
+                u = up[k][u]
+            diff >>= 1
+            k += 1
+        if u == v:
+            return u
+        for row in reversed(up):
+            if row[u] != row[v]:
+                u, v = row[u], row[v]
+        return up[0][u]
+
+    def reachable(self, src, dest, power):
+        """
+        Returns True if a truck of power power can go from src to dest, in O(log n).
+        """
+        x = self._highest(self.index[src], power)
+        position = self._first[self.index[dest]]
+        return self._first[x] <= position < self._last[x]
+
+    def min_power_value(self, src, dest):
+        """
+        Returns the minimal power needed to go from src to dest (without the path), or None if they are not connected.
+        """
+        u, v = self.index[src], self.index[dest]
+        if self._root[u] != self._root[v]:
+            return None
+        return self._weight[self._lca(u, v)]
+
+    def reachable_count(self, node, power):
+        """
+        Returns the number of nodes reachable from node with a power power (node included), in O(log n).
+        """
+        x = self._highest(self.index[node], power)
+        return self._last[x] - self._first[x]
+
+    def reachable_set(self, node, power):
+        """
+        Returns the set of the nodes reachable from node with a power power (node included),
+        without any traversal of the graph.
+        """
+        x = self._highest(self.index[node], power)
+        return {self.nodes[i] for i in self.leaf_order[self._first[x]:self._last[x]].tolist()}
@@ -0,0 +1,149 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+import instrumentation
+from graph import routes_from_file, full_path
+from network_cache import load_network
+from parallel import parallel_power_batch
+from instrumentation import instrumented
+
+
+@instrumented("solve_routes")
+def solve_routes(network_file, routes_file, out_file, base_path=None, use_cache=True, workers=1):
+    """
+    Computes the minimal power of every route of a routes.x.in file and writes them in out_file
+    (routes.x.out), one power per line in the order of the routes ("None" if the cities are not connected).
+    The network is loaded with network_cache.load_network, then all the routes are answered at once
+    with TreeIndex.power_batch on the minimal spanning tree.
+    With workers > 1 (or None for all the cores), the routes are split between several processes (see parallel.py).
+
+    Outputs:
+    -----------
+    powers: numpy.ndarray
+        The minimal power of each route (-1 if the cities are not connected).
+    """
+    g, tree = load_network(network_file, base_path, use_cache)
+    src, dest, utility = routes_from_file(routes_file, base_path)
+    if workers == 1:
+        powers = tree.tree_index.power_batch(src, dest)
+    else:
+        powers = parallel_power_batch(tree.tree_index, src, dest, workers)
+    with open(full_path(out_file, base_path), "w") as fichier:
+        fichier.writelines("None\n" if p == -1 else f"{p}\n" for p in powers.tolist())
+    return powers
+
+
+def iter_route_chunks(path, chunk_size=100000, offset=0):
+    """
+    Reads the routes of a routes.x.in file lazily, chunk_size lines at a time, from the byte offset offset
+    (0 means the beginning of the file: the first line, the number of routes, is skipped).
+    Only one chunk is in memory at a time.
+
+    Outputs (yielded for each chunk):
+    -----------
+    src, dest: numpy.ndarray
+        The cities of the routes of the chunk.
+    offset: int
+        The byte offset of the end of the chunk, from which the next chunk starts.
+    """
+    with open(path, "rb") as fichier:
+        if offset == 0:
+            fichier.readline()
+        else:
+            fichier.seek(offset)
+        while True:
+            lines = []
+            while len(lines) < chunk_size:
+                line = fichier.readline()
+                if not line:
+                    break
+                if line.strip():
+                    lines.append(line.split())
+            if not lines:
+                return
+            src = np.fromiter((int(line[0]) for line in lines), dtype=np.int64, count=len(lines))
+            dest = np.fromiter((int(line[1]) for line in lines), dtype=np.int64, count=len(lines))
+            yield src, dest, fichier.tell()
+
+
+def read_checkpoint(path, routes_path):
+    """Returns the checkpoint saved in path if it exists and was written for routes_path, else None."""
+    try:
+        with open(path) as fichier:
+            checkpoint = json.load(fichier)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get("routes") != os.path.abspath(routes_path):
+        return None
+    return checkpoint
+
+
+def write_checkpoint(path, checkpoint):
+    # On écrit dans un fichier temporaire puis on le renomme : un arrêt pendant l'écriture ne corrompt pas la reprise
+    with open(path + ".tmp", "w") as fichier:
+        json.dump(checkpoint, fichier)
+    os.replace(path + ".tmp", path)
+
+
+@instrumented("stream_routes")
+def stream_routes(network_file, routes_file, out_file, base_path=None, use_cache=True, chunk_size=100000,
+                  checkpoint_every=1, report=None):
+    """
+    Streaming version of solve_routes for route files too large to be loaded at once: the routes are read in chunks
+    of chunk_size lines (see iter_route_chunks), the minimal powers of each chunk are computed with
+    TreeIndex.power_batch and appended to out_file, so that the memory used does not depend on the size of the file.
+    Every checkpoint_every chunks, the byte offset reached in routes_file, the number of routes done and the size of
+    out_file are saved in out_file + ".checkpoint". If the run stops, running it again resumes from the last
+    checkpoint (the lines written after it are removed first). The checkpoint is deleted once all the routes are done.
+    report, if given, is called after each chunk with a dictionary (chunk, routes, total, seconds, routes_per_s, offset).
+    Returns the total number of routes written in out_file.
+    """
+    g, tree = load_network(network_file, base_path, use_cache)
+    index = tree.tree_index
+    routes_path, out_path = full_path(routes_file, base_path), full_path(out_file, base_path)
+    checkpoint_path = out_path + ".checkpoint"
+    checkpoint = read_checkpoint(checkpoint_path, routes_path) if os.path.exists(out_path) else None
+    if checkpoint is None:
+        checkpoint = {"routes": os.path.abspath(routes_path), "offset": 0, "count": 0, "out_offset": 0}
+    with open(out_path, "ab") as fichier:
+        # On efface les résultats écrits après le dernier point de reprise
+        fichier.truncate(checkpoint["out_offset"])
+        chunk = 0
+        t0 = time.perf_counter()
+        for src, dest, offset in iter_route_chunks(routes_path, chunk_size, checkpoint["offset"]):
+            powers = index.power_batch(src, dest)
+            fichier.write("".join("None\n" if p == -1 else f"{p}\n" for p in powers.tolist()).encode())
+            chunk += 1
+            checkpoint["offset"] = offset
+            checkpoint["count"] += len(powers)
+            if chunk % checkpoint_every == 0:
+                fichier.flush()
+                os.fsync(fichier.fileno())
+                checkpoint["out_offset"] = fichier.tell()
+                write_checkpoint(checkpoint_path, checkpoint)
+            t1 = time.perf_counter()
+            if instrumentation.enabled:
+                instrumentation.observe("stream_routes.chunk", t1 - t0)
+            if report is not None:
+                report({"chunk": chunk, "routes": len(powers), "total": checkpoint["count"], "seconds": t1 - t0,
+                        "routes_per_s": len(powers) / (t1 - t0) if t1 > t0 else float('inf'), "offset": offset})
+            t0 = t1
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return checkpoint["count"]
+
+
+def print_report(stats):
+    print(f"chunk {stats['chunk']}: {stats['routes']} routes in {stats['seconds']:.3f} s "
+          f"({stats['routes_per_s']:.0f} routes/s), {stats['total']} done")
+
+
+# Utilisation : python delivery_network/route_solver.py input/network.2.in input/routes.2.in input/routes.2.out
+# Avec une taille de morceau en quatrième argument, les routes sont traitées en flux avec reprise (stream_routes)
+if __name__ == "__main__":
+    if len(sys.argv) > 4:
+        stream_routes(sys.argv[1], sys.argv[2], sys.argv[3], chunk_size=int(sys.argv[4]), report=print_report)
+    else:
+        solve_routes(sys.argv[1], sys.argv[2], sys.argv[3])
@@ -0,0 +1,212 @@
+import numpy as np
+
+
+class TreeIndex:
+    """
+    A class answering min-power queries on a spanning tree (or forest), e.g. the result of Graph.kruskal().
+    The tree is rooted once, then binary lifting tables store for each node its 2^k-th ancestor
+    and the maximal power on the way to it. A query (src, dest) costs O(log n).
+    Attributes:
+    -----------
+    nodes: list
+        The nodes of the tree. Node nodes[i] has the dense id i.
+    index: dict
+        The dense id of each node.
+    depth: list
+        depth[i] is the depth of node i in its rooted component.
+    component: list
+        component[i] is the dense id of the root of the component of node i.
+    up: list
+        up[k][i] is the dense id of the 2^k-th ancestor of node i (roots are their own ancestor).
+    max_power: list
+        max_power[k][i] is the maximal power on the edges between node i and up[k][i].
+    tables: dict or None
+        The same tables as NumPy arrays, used by power_batch (see arrays()).
+    """
+
+    def __init__(self, tree):
+        """
+        Builds the index from a tree. The tree must not contain any cycle.
+        Parameters:
+        -----------
+        tree: Graph
+            The spanning tree (or forest), usually obtained with Graph.kruskal().
+        """
+        self.nodes = list(tree.nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+        self.nb_nodes = n
+        parent = list(range(n))
+        power = [0] * n
+        depth = [0] * n
+        component = [-1] * n
+        # On enracine chaque composante grâce à un parcours en profondeur itératif
+        for root in range(n):
+            if component[root] != -1:
+                continue
+            component[root] = root
+            pile = [root]
+            while pile:
+                u = pile.pop()
+                for neighbor, p, d in tree.graph[self.nodes[u]]:
+                    v = self.index[neighbor]
+                    if component[v] == -1:
+                        component[v] = root
+                        parent[v] = u
+                        power[v] = p
+                        depth[v] = depth[u] + 1
+                        pile.append(v)
+        self.depth = depth
+        self.component = component
+        # Tables de binary lifting : up[k][i] est le 2^k-ième ancêtre de i
+        self.log = max(1, max(depth, default=0).bit_length())
+        self.up = [parent]
+        self.max_power = [power]
+        for k in range(1, self.log):
+            prev_up = self.up[-1]
+            prev_power = self.max_power[-1]
+            self.up.append([prev_up[u] for u in prev_up])
+            self.max_power.append([a if a >= b else b for a, b in zip(prev_power, [prev_power[u] for u in prev_up])])
+        self.tables = None
+
+    # Noms des tableaux qui définissent entièrement un TreeIndex
+    ARRAYS = ("depth", "component", "up", "max_power")
+
+    def arrays(self):
+        """
+        Returns the tables of the index as a dictionary of NumPy arrays, e.g. to save them on disk.
+        The arrays are built on the first call only.
+        """
+        if self.tables is None:
+            self.tables = {name: np.array(getattr(self, name)) for name in self.ARRAYS}
+        return self.tables
+
+    @classmethod
+    def from_arrays(cls, nodes, arrays):
+        """
+        Builds a TreeIndex from arrays returned by arrays(), without any computation.
+        The arrays are read through memoryviews, hence they are not copied (they can be memory-mapped).
+        """
+        index = cls.__new__(cls)
+        index.nodes = list(nodes)
+        index.index = {node: i for i, node in enumerate(index.nodes)}
+        index.nb_nodes = len(index.nodes)
+        index.depth = memoryview(arrays["depth"])
+        index.component = memoryview(arrays["component"])
+        index.up = [memoryview(row) for row in arrays["up"]]
+        index.max_power = [memoryview(row) for row in arrays["max_power"]]
+        index.log = len(index.up)
+        index.tables = arrays
+        return index
+
+    def _climb(self, u, v):
+        """
+        Returns the dense id of the lowest common ancestor of u and v (dense ids of the same component)
+        and the maximal power on the path between u and v.
+        """
+        up, max_power, depth = self.up, self.max_power, self.depth
+        best = 0
+        if depth[u] < depth[v]:
+            u, v = v, u
+        # On remonte u à la profondeur de v
+        diff = depth[u] - depth[v]
+        k = 0
+        while diff:
+            if diff & 1:
+                if max_power[k][u] > best:
+                    best = max_power[k][u]
+                u = up[k][u]
+            diff >>= 1
+            k += 1
+        if u == v:
+            return u, best
+        # On remonte u et v ensemble jusqu'aux fils de leur ancêtre commun
+        for k in range(self.log - 1, -1, -1):
+            if up[k][u] != up[k][v]:
+                best = max(best, max_power[k][u], max_power[k][v])
+                u = up[k][u]
+                v = up[k][v]
+        best = max(best, max_power[0][u], max_power[0][v])
+        return up[0][u], best
+
+    def power(self, src, dest):
+        """
+        Returns the minimal power needed to go from src to dest in the tree, in O(log n).
+        If src and dest are not connected, returns None.
+        """
+        u, v = self.index[src], self.index[dest]
+        if self.component[u] != self.component[v]:
+            return None
+        return self._climb(u, v)[1]
+
+    def ids(self, nodes):
+        """Returns the dense ids of a sequence of nodes as a NumPy array."""
+        return np.fromiter((self.index[node] for node in nodes), dtype=np.int64, count=len(nodes))
+
+    def power_batch(self, srcs, dests):
+        """
+        Returns the minimal power of every query (srcs[j], dests[j]) at once, as a NumPy array.
+        Every step of the binary lifting is applied to all the queries together, hence 100 000 queries
+        cost O(log n) NumPy operations on arrays of size 100 000.
+        Queries whose nodes are not connected get -1.
+        """
+        return power_batch_ids(self.arrays(), self.ids(srcs), self.ids(dests))
+
+    def path(self, src, dest):
+        """
+        Returns the (unique) path between src and dest in the tree as a list of nodes,
+        or None if they are not connected.
+        """
+        u, v = self.index[src], self.index[dest]
+        if self.component[u] != self.component[v]:
+            return None
+        lca = self._climb(u, v)[0]
+        parent = self.up[0]
+        left = []
+        while u != lca:
+            left.append(self.nodes[u])
+            u = parent[u]
+        right = []
+        while v != lca:
+            right.append(self.nodes[v])
+            v = parent[v]
+        left.append(self.nodes[lca])
+        right.reverse()
+        return left + right
+
+    def min_power(self, src, dest):
+        """
+        Returns (path, min_power) like Graph.min_power, or None if src and dest are not connected.
+        """
+        power = self.power(src, dest)
+        if power is None:
+            return None
+        return (self.path(src, dest), power)
+
+
+def power_batch_ids(tables, u, v):
+    """
+    Vectorized min-power queries on the tables of a TreeIndex (see TreeIndex.arrays()),
+    where u and v are NumPy arrays of dense ids. Returns -1 for the queries whose nodes are not connected.
+    Only NumPy arrays are needed, so that this function also runs on tables stored in shared memory.
+    """
+    up, max_power, depth, component = tables["up"], tables["max_power"], tables["depth"], tables["component"]
+    connected = component[u] == component[v]
+    # u est la node la plus profonde de chaque requête
+    swap = depth[u] < depth[v]
+    u, v = np.where(swap, v, u), np.where(swap, u, v)
+    best = np.zeros(len(u), dtype=max_power.dtype)
+    diff = depth[u] - depth[v]
+    log = len(up)
+    for k in range(log):
+        move = (diff >> k) & 1 == 1
+        best = np.where(move, np.maximum(best, max_power[k, u]), best)
+        u = np.where(move, up[k, u], u)
+    for k in range(log - 1, -1, -1):
+        move = up[k, u] != up[k, v]
+        best = np.where(move, np.maximum(best, np.maximum(max_power[k, u], max_power[k, v])), best)
+        u = np.where(move, up[k, u], u)
+        v = np.where(move, up[k, v], v)
+    move = u != v
+    best = np.where(move, np.maximum(best, np.maximum(max_power[0, u], max_power[0, v])), best)
+    return np.where(connected, best, -1)
@@ -0,0 +1,206 @@
+import numpy as np
+import instrumentation
+
+
+class UnionFind:
+    """
+    Union-find (disjoint sets) structure on the dense ids 0, ..., n-1,
+    with iterative path compression and union by rank (no recursion, whatever the shape of the sets).
+    Attributes:
+    -----------
+    parent: list
+        parent[i] is the parent of i in its tree (roots are their own parent).
+    rank: list
+        rank[i] is an upper bound of the height of the tree of root i.
+    """
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+
+    def find(self, x):
+        """Returns the root of the set of x, and attaches all the nodes on the way directly to it."""
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x, y):
+        """Merges the sets of x and y. Returns False if they were already in the same set."""
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return False
+        rank = self.rank
+        if rank[x] < rank[y]:
+            x, y = y, x
+        self.parent[y] = x
+        if rank[x] == rank[y]:
+            rank[x] += 1
+        return True
+
+
+
+class ComponentIndex:
+    """
+    The connected components of a graph as a component label per node, kept up to date as edges are added.
+    The labels are computed by one traversal of the graph, then used as the parent array of a UnionFind
+    (each node points directly to the representative of its component), which merges the components of the new edges.
+    Attributes:
+    -----------
+    nodes: list
+        The nodes. Node nodes[i] has the dense id i.
+    index: dict
+        The dense id of each node.
+    union_find: UnionFind
+        The union-find on the dense ids.
+    sizes: dict
+        sizes[r] is the number of nodes of the component of representative r.
+    """
+
+    def __init__(self, nodes, labels):
+        """
+        Parameters:
+        -----------
+        nodes: list
+            The nodes of the graph.
+        labels: list
+            labels[i] is the dense id of a node of the component of node i, the same for the whole component
+            (e.g. the first node of the component found by a traversal), which is its own label.
+        """
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.union_find = UnionFind(0)
+        self.union_find.parent = list(labels)
+        self.union_find.rank = [1 if labels[i] == i else 0 for i in range(len(labels))]
+        self.sizes = {}
+        for label in labels:
+            self.sizes[label] = self.sizes.get(label, 0) + 1
+
+    def add_node(self, node):
+        i = len(self.nodes)
+        self.nodes.append(node)
+        self.index[node] = i
+        self.union_find.parent.append(i)
+        self.union_find.rank.append(0)
+        self.sizes[i] = 1
+
+    def add_edge(self, node1, node2):
+        """Merges the components of node1 and node2 (adding the nodes that are not known yet)."""
+        for node in (node1, node2):
+            if node not in self.index:
+                self.add_node(node)
+        find = self.union_find.find
+        x, y = find(self.index[node1]), find(self.index[node2])
+        if self.union_find.union(x, y):
+            root = find(x)
+            self.sizes[root] = self.sizes.pop(x) + self.sizes.pop(y)
+
+    def label(self, node):
+        """Returns the component id of node: the dense id of the representative of its component."""
+        return self.union_find.find(self.index[node])
+
+    def same_component(self, node1, node2):
+        """Returns True if node1 and node2 are connected, in (amortized) constant time."""
+        find = self.union_find.find
+        return find(self.index[node1]) == find(self.index[node2])
+
+    def size(self, node):
+        """Returns the number of nodes of the component of node."""
+        return self.sizes[self.label(node)]
+
+    def labels(self):
+        """Returns the list of the component ids of all the nodes, in the order of nodes."""
+        find = self.union_find.find
+        return [find(i) for i in range(len(self.nodes))]
+
+    def components(self):
+        """Returns the components as a set of frozensets, like Graph.connected_components_set."""
+        groups = {}
+        for node, label in zip(self.nodes, self.labels()):
+            groups.setdefault(label, []).append(node)
+        return set(map(frozenset, groups.values()))
+
+def depths(parent):
+    """
+    Returns the NumPy array of the number of steps from each node to its root in the union-find parent array,
+    i.e. the length of the path followed by find (only computed for the instrumentation).
+    """
+    node = np.arange(len(parent), dtype=np.int64)
+    depth = np.zeros(len(parent), dtype=np.int64)
+    while True:
+        up = parent[node]
+        moving = up != node
+        if not moving.any():
+            return depth
+        depth += moving
+        node = up
+
+
+def kruskal_edges(nb_nodes, node1, node2, power):
+    """
+    Kruskal's algorithm on a raw list of edges given as arrays (dense ids of the end nodes and power).
+    The edges are sorted with a stable NumPy argsort and scanned by chunks of increasing size. Before each chunk,
+    the parent array of the union-find is fully compressed with NumPy, so that the edges whose end nodes are
+    already connected are dropped at once; only the remaining edges go through the union-find
+    (iterative path halving and union by rank) in Python.
+
+    Outputs:
+    -----------
+    selected: numpy.ndarray
+        The positions (in the edge arrays) of the edges of the spanning forest, by increasing power.
+    """
+    node1, node2 = np.asarray(node1, dtype=np.int64), np.asarray(node2, dtype=np.int64)
+    order = np.argsort(power, kind='stable')
+    parent = np.arange(nb_nodes, dtype=np.int64)
+    rank = [0] * nb_nodes
+    selected = []
+    remaining = nb_nodes - 1
+    start, chunk = 0, max(nb_nodes, 1024)
+    chunks, candidates = 0, 0
+    while start < len(order) and remaining > 0:
+        edges = order[start:start + chunk]
+        start += chunk
+        chunk *= 2
+        if instrumentation.enabled:
+            # Profondeur de l'union-find avant la compression : longueur des chemins qu'aurait suivis find
+            depth = depths(parent)
+            instrumentation.record("kruskal", find_steps=int(depth.sum()))
+            instrumentation.maximum("kruskal.max_depth", int(depth.max(initial=0)))
+        # Compression complète : parent[i] devient la racine de i
+        while True:
+            grand_parent = parent[parent]
+            if np.array_equal(grand_parent, parent):
+                break
+            parent = grand_parent
+        roots1, roots2 = parent[node1[edges]], parent[node2[edges]]
+        keep = roots1 != roots2
+        chunks += 1
+        candidates += int(keep.sum())
+        parent = parent.tolist()
+        # find et union sont écrits directement dans la boucle, qui est la partie la plus coûteuse
+        for e, x, y in zip(edges[keep].tolist(), roots1[keep].tolist(), roots2[keep].tolist()):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            while parent[y] != y:
+                parent[y] = parent[parent[y]]
+                y = parent[y]
+            if x == y:
+                continue
+            if rank[x] < rank[y]:
+                x, y = y, x
+            parent[y] = x
+            if rank[x] == rank[y]:
+                rank[x] += 1
+            selected.append(e)
+            remaining -= 1
+            if remaining == 0:
+                break
+        parent = np.array(parent, dtype=np.int64)
+    if instrumentation.enabled:
+        # candidates : arêtes non écartées par le filtrage numpy, passées à la boucle de l'union-find
+        instrumentation.record("kruskal", edges=len(order), chunks=chunks, candidates=candidates, selected=len(selected))
+    return np.array(selected, dtype=np.int64)
@@ -0,0 +1,154 @@
+"""
+Drawing of (parts of) a graph. Only the relevant subgraph is drawn: the whole graph for small networks, or
+the k-hop neighborhood of a node, or the min-power path between two nodes and its frontier (the edges leaving the path).
+Each undirected edge is drawn once. write_dot streams the DOT file and does not need the graphviz package,
+which is only imported by to_graphviz, to render or display the drawing.
+"""
+from collections import deque
+
+MODES = ("full", "neighborhood", "path")
+
+
+def neighborhood(g, center, hops=1):
+    """Returns the list of the nodes at most hops edges away from center (breadth-first order)."""
+    seen = {center}
+    order = [center]
+    queue = deque([(center, 0)])
+    while queue:
+        node, depth = queue.popleft()
+        if depth == hops:
+            continue
+        for neighbor, p, d in g.graph[node]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                order.append(neighbor)
+                queue.append((neighbor, depth + 1))
+    return order
+
+
+def path_frontier(g, path):
+    """Returns the list of the nodes of path followed by their neighbors outside the path."""
+    seen = set(path)
+    order = list(path)
+    for node in path:
+        for neighbor, p, d in g.graph[node]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                order.append(neighbor)
+    return order
+
+
+def subgraph_edges(g, nodes):
+    """
+    Yields the edges (node1, node2, power, dist) of g between the given nodes, each undirected edge once:
+    an edge appears in the adjacency of both its end nodes, it is only kept from the end that comes first in nodes.
+    """
+    position = {node: i for i, node in enumerate(nodes)}
+    for i, node in enumerate(nodes):
+        loops = 0
+        for neighbor, p, d in g.graph[node]:
+            j = position.get(neighbor)
+            if j is None or j < i:
+                continue
+            if j == i:
+                # Une boucle apparaît deux fois dans la liste d'adjacence de sa node
+                loops += 1
+                if loops % 2 == 0:
+                    continue
+            yield node, neighbor, p, d
+
+
+def select(g, src=None, dest=None, mode="full", hops=1):
+    """
+    Returns (nodes, path, power): the nodes to draw according to mode, and the min-power path between src and dest
+    with its power (None if dest is not given or cannot be reached).
+        - "full": all the nodes;
+        - "neighborhood": the nodes at most hops edges away from src (and from dest if it is given);
+        - "path": the min-power path between src and dest and its frontier.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode}, expected one of {MODES}")
+    path, power = None, None
+    if src is not None and dest is not None:
+        result = g.min_power(src, dest)
+        if result is not None:
+            path, power = result
+    if mode == "full":
+        nodes = list(g.nodes)
+    elif mode == "neighborhood":
+        nodes = neighborhood(g, src, hops)
+        if dest is not None:
+            seen = set(nodes)
+            nodes += [node for node in neighborhood(g, dest, hops) if node not in seen]
+    else:
+        nodes = path_frontier(g, path if path is not None else [node for node in (src, dest) if node is not None])
+    return nodes, path, power
+
+
+def edge_set(path):
+    """Returns the set of the pairs of consecutive nodes of path, in both directions (empty if path is None)."""
+    if path is None:
+        return set()
+    return set(zip(path, path[1:])) | set(zip(path[1:], path))
+
+
+def caption(label, src, dest, power):
+    text = "" if label is None else "Graph de " + str(label)
+    if power is not None:
+        text += "\npuissance minimal requise pour aller de " + str(src) + " à " + str(dest) + " : " + str(power)
+    return text
+
+
+def quote(value):
+    return '"' + str(value).replace('"', '\\"') + '"'
+
+
+def write_dot(filename, g, src=None, dest=None, mode="full", hops=1, label=None):
+    """
+    Writes the selected subgraph (see select) in the DOT format, line by line, without the graphviz package.
+    The source is green, the destination red and the edges of the min-power path blue; edges are labelled with their power.
+    Render it with e.g. `dot -Tsvg graph.gv -o graph.svg`. Returns the number of edges written.
+    """
+    nodes, path, power = select(g, src, dest, mode, hops)
+    path_edges = edge_set(path)
+    nb_edges = 0
+    with open(filename, "w") as fichier:
+        fichier.write("graph G {\n")
+        if label is not None or power is not None:
+            fichier.write(f"  label={quote(caption(label, src, dest, power))};\n")
+        for node, color in ((src, "green"), (dest, "red")):
+            if node is not None:
+                fichier.write(f"  {quote(node)} [color={color}];\n")
+        for node in nodes:
+            fichier.write(f"  {quote(node)};\n")
+        for node1, node2, p, d in subgraph_edges(g, nodes):
+            style = ", color=blue" if (node1, node2) in path_edges else ""
+            fichier.write(f"  {quote(node1)} -- {quote(node2)} [label={quote(p)}{style}];\n")
+            nb_edges += 1
+        fichier.write("}\n")
+    return nb_edges
+
+
+def to_graphviz(g, src=None, dest=None, mode="full", hops=1, label=None, filename=None):
+    """
+    Returns the selected subgraph (see select) as a graphviz.Graph, with the same colors as write_dot.
+    graphviz is imported here only, so that the rest of the package does not need it.
+    """
+    import graphviz
+    nodes, path, power = select(g, src, dest, mode, hops)
+    representation = graphviz.Graph('G', filename=filename)
+    for node in nodes:
+        representation.node(str(node))
+    if src is not None:
+        representation.node(str(src), color='green')
+    if dest is not None:
+        representation.node(str(dest), color='red')
+    path_edges = edge_set(path)
+    for node1, node2, p, d in subgraph_edges(g, nodes):
+        if (node1, node2) in path_edges:
+            representation.edge(str(node1), str(node2), label=str(p), color='blue')
+        else:
+            representation.edge(str(node1), str(node2), label=str(p))
+    if label is not None or power is not None:
+        representation.attr(label=caption(label, src, dest, power))
+    return representation
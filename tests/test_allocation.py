@@ -0,0 +1,58 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import itertools
+import shutil
+import tempfile
+import unittest   # The test framework
+import numpy as np
+from allocation import prune_trucks, cheapest_trucks, greedy_selection, knapsack_selection, allocate
+
+class Test_Allocation(unittest.TestCase):
+    def test_prune_trucks(self):
+        power = [10, 20, 15, 30, 20, 5]
+        cost = [100, 150, 200, 300, 140, 100]
+        self.assertEqual(prune_trucks(power, cost).tolist(), [0, 4, 3])
+
+    def test_cheapest_trucks(self):
+        power = [10, 20, 15, 30, 20]
+        cost = [100, 150, 200, 300, 140]
+        self.assertEqual(cheapest_trucks([5, 10, 11, 20, 30, 31, -1], power, cost).tolist(), [0, 0, 4, 4, 3, -1, -1])
+
+    def test_zero_cost(self):
+        utility = np.array([5, 0, 7, 3, 9])
+        cost = np.array([0, 0, 40, 30, 50])
+        selected = knapsack_selection(utility, cost, 60, precision=1)
+        self.assertEqual(selected.tolist(), [0, 4])
+        self.assertEqual(sorted(greedy_selection(utility, cost, 60).tolist())[:1], [0])
+
+    def test_knapsack_exact(self):
+        rng = np.random.default_rng(0)
+        utility = rng.integers(1, 50, 10)
+        cost = rng.integers(1, 30, 10)
+        budget = 60
+        best = max(sum(utility[list(s)]) for r in range(11) for s in itertools.combinations(range(10), r) if sum(cost[list(s)]) <= budget)
+        selected = knapsack_selection(utility, cost, budget, precision=1)
+        self.assertLessEqual(cost[selected].sum(), budget)
+        self.assertEqual(utility[selected].sum(), best)
+        greedy = greedy_selection(utility, cost, budget)
+        self.assertLessEqual(cost[greedy].sum(), budget)
+        self.assertLessEqual(utility[greedy].sum(), best)
+
+    def test_allocate(self):
+        folder = tempfile.mkdtemp()
+        try:
+            for name in ("network.1.in", "routes.1.in", "trucks.1.in"):
+                shutil.copy("input/" + name, folder)
+            fleet, utility, cost = allocate("network.1.in", "routes.1.in", "trucks.1.in", budget=10 ** 6, base_path=folder)
+            self.assertLessEqual(cost, 10 ** 6)
+            self.assertEqual(len({route for route, truck in fleet}), len(fleet))
+            fleet2, utility2, cost2 = allocate("network.1.in", "routes.1.in", "trucks.1.in", budget=10 ** 6, method="knapsack", precision=10 ** 4, base_path=folder)
+            self.assertLessEqual(cost2, 10 ** 6)
+            self.assertGreaterEqual(utility2, utility * 0.9)
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import os
+import tempfile
+import unittest   # The test framework
+from benchmarks.run_benchmarks import run, save, load, compare, random_graph
+
+class Test_Benchmarks(unittest.TestCase):
+    def test_run(self):
+        results = run(["input/network.1.in"], [(200, 500)], nb_queries=50, nb_single=3, repeat=2, seed=1)
+        operations = {(result["network"], result["operation"]) for result in results}
+        self.assertIn(("input/network.1.in", "load"), operations)
+        self.assertIn(("random-200-500", "power_batch"), operations)
+        self.assertTrue(all(result["median_s"] >= 0 for result in results))
+        # Chaque opération est chronométrée plusieurs fois après un tour d'échauffement
+        self.assertTrue(all(result["repeat"] == 2 for result in results))
+        expanded = {result["operation"]: result["expanded"] for result in results if result["network"] == "random-200-500" and "expanded" in result}
+        methods = ("get_path_with_power", "bidirectional_path_with_power", "alt_path_with_power")
+        self.assertEqual(set(expanded), {method + "@" + limit for method in methods for limit in ("min_power", "median")})
+        self.assertTrue(all(value > 0 for value in expanded.values()))
+        with tempfile.TemporaryDirectory() as folder:
+            for name in ("bench.json", "bench.csv"):
+                save(results, os.path.join(folder, name))
+                loaded = load(os.path.join(folder, name))
+                self.assertEqual(len(loaded), len(results))
+                self.assertEqual(len(compare(results, loaded)), len(results))
+
+    def test_random_graph(self):
+        g = random_graph(1000, 3000, seed=2)
+        self.assertEqual(g.nb_edges, 3000)
+        self.assertEqual(len(g.connected_components_set()), 1)
+        self.assertEqual(random_graph(1000, 3000, seed=2).edges(), g.edges())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file
+from benchmarks.run_benchmarks import random_graph
+import unittest   # The test framework
+
+class Test_Bidirectional(unittest.TestCase):
+    def path_length(self, g, path, power):
+        # min échoue si deux nodes consécutives ne sont reliées par aucune arête autorisée
+        return sum(min(d for v, p, d in g.graph[a] if v == b and p <= power) for a, b in zip(path, path[1:]))
+
+    def check(self, g, queries):
+        for src, dest, power in queries:
+            expected = g.get_path_with_power(src, dest, power)
+            for path in (g.bidirectional_path_with_power(src, dest, power), g.alt_path_with_power(src, dest, power)):
+                if expected is None:
+                    self.assertIsNone(path)
+                else:
+                    self.assertEqual((path[0], path[-1]), (src, dest))
+                    self.assertEqual(self.path_length(g, path, power), self.path_length(g, expected, power))
+
+    def test_network1(self):
+        g = graph_from_file("input/network.1.in", csr=True)
+        self.check(g, [(src, dest, power) for src in (1, 7) for dest in g.nodes for power in (4, 10, 10 ** 9)])
+
+    def test_disconnected(self):
+        g = graph_from_file("input/network.01.in", csr=True)
+        self.assertIsNone(g.bidirectional_path_with_power(1, 4, 10 ** 9))
+        self.assertIsNone(g.alt_path_with_power(1, 4, 10 ** 9))
+        self.assertEqual(g.bidirectional_path_with_power(4, 4, 0), [4])
+
+    def test_random_graph(self):
+        g = random_graph(2000, 6000, seed=3)
+        landmarks = g.build_landmarks(4, seed=1)
+        self.assertEqual(len(set(landmarks)), 4)
+        powers = sorted(g.edge_power.tolist())
+        self.check(g, [(1 + 37 * i % 2000, 1 + 101 * i % 2000, powers[len(powers) * k // 4]) for i in range(20) for k in (2, 3)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file
+import unittest   # The test framework
+
+class Test_Components(unittest.TestCase):
+    def test_network01(self):
+        for csr in (False, True):
+            g = graph_from_file("input/network.01.in", csr=csr)
+            self.assertEqual(g.component_labels(), [0, 0, 0, 3, 3, 3, 3])
+            self.assertTrue(g.same_component(1, 3))
+            self.assertFalse(g.same_component(1, 4))
+            self.assertEqual(sorted(g.component_sizes().values()), [3, 4])
+            self.assertEqual(g.component_index().size(5), 4)
+            self.assertEqual(g.connected_components_set(), {frozenset({1, 2, 3}), frozenset({4, 5, 6, 7})})
+
+    def test_add_edge(self):
+        g = graph_from_file("input/network.01.in")
+        self.assertIsNone(g.min_power(1, 4))
+        g.add_edge(3, 4, 8)
+        g.add_edge(8, 9, 1)
+        self.assertTrue(g.same_component(1, 4))
+        self.assertEqual(g.min_power(1, 4)[1], g.min_power(4, 1)[1])
+        self.assertEqual(g.connected_components_set(), {frozenset({1, 2, 3, 4, 5, 6, 7}), frozenset({8, 9})})
+        self.assertEqual(sorted(g.component_sizes().values()), [2, 7])
+
+    def test_unreachable_without_search(self):
+        g = graph_from_file("input/network.01.in", csr=True)
+        g.component_index()
+        # Aucune recherche n'est lancée : les tableaux de travail ne sont jamais alloués
+        self.assertIsNone(g.get_path_with_power(1, 4, 10 ** 9))
+        self.assertEqual(g.get_paths_with_power(1, [4, 5], 10 ** 9), [None, None])
+        self.assertIsNone(g.min_power(1, 4))
+        self.assertIsNone(g.bidirectional_path_with_power(1, 4, 10 ** 9))
+        self.assertEqual(g.power_distance_frontier(1, 4), [])
+        self.assertIsNone(g.scratch)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file
+from csr_graph import CSRGraph
+import unittest   # The test framework
+
+class Test_CSRGraph(unittest.TestCase):
+    def test_loading(self):
+        g = graph_from_file("input/network.04.in", csr=True)
+        self.assertIsInstance(g, CSRGraph)
+        self.assertEqual(g.nb_nodes, 10)
+        self.assertEqual(g.nb_edges, 4)
+        self.assertEqual(g.graph[1][0][2], 6)
+        self.assertEqual(g.graph[1], graph_from_file("input/network.04.in").graph[1])
+
+    def test_connected_components(self):
+        g = graph_from_file("input/network.01.in", csr=True)
+        self.assertEqual(g.connected_components_set(), {frozenset({1, 2, 3}), frozenset({4, 5, 6, 7})})
+
+    def test_get_path_with_power(self):
+        g = graph_from_file("input/network.04.in", csr=True)
+        self.assertEqual(g.get_path_with_power(1, 4, 11), [1, 4])
+        self.assertEqual(g.get_path_with_power(1, 4, 10), [1, 2, 3, 4])
+        self.assertIsNone(g.get_path_with_power(1, 4, 3))
+
+    def test_min_power(self):
+        g = graph_from_file("input/network.1.in")
+        c = graph_from_file("input/network.1.in", csr=True)
+        for dest in range(1, 21):
+            self.assertEqual(c.min_power(1, dest)[1], g.min_power(1, dest)[1])
+        self.assertEqual(c.bottleneck_search(1)[0], g.bottleneck_search(1)[0])
+
+    def test_kruskal(self):
+        g = graph_from_file("input/network.1.in")
+        k = g.to_csr().kruskal()
+        self.assertIsInstance(k, CSRGraph)
+        self.assertEqual(k.nb_edges, 19)
+        for dest in range(1, 21):
+            self.assertEqual(k.min_power_kruskal(1, dest)[1], g.min_power(1, dest)[1])
+
+    def test_freeze(self):
+        g = Graph(["a", "b", "c"])
+        g.add_edge("a", "b", 3, 2)
+        g.add_edge("b", "c", 1, 5)
+        c = g.freeze()
+        self.assertEqual(c.min_power("a", "c"), (["a", "b", "c"], 3))
+        self.assertEqual(c.to_graph().graph, g.graph)
+        with self.assertRaises(TypeError):
+            c.add_edge("a", "c", 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file
+import unittest   # The test framework
+
+class Test_Depots(unittest.TestCase):
+    def test_nearest_depots(self):
+        for csr in (False, True):
+            g = graph_from_file("input/network.1.in", csr=csr)
+            depots = [1, 9, 17]
+            for power in (30, 50, 100):
+                index = g.nearest_depots(depots, power)
+                trees = {depot: g.shortest_path_tree(depot, power)[0] for depot in depots}
+                for node in g.nodes:
+                    best = min((trees[depot][node] for depot in depots if node in trees[depot]), default=None)
+                    if best is None:
+                        self.assertIsNone(index.nearest(node))
+                        self.assertIsNone(index.path(node))
+                        continue
+                    depot, distance = index.nearest(node)
+                    self.assertEqual(distance, best)
+                    self.assertEqual(trees[depot][node], best)
+                    path = index.path(node)
+                    self.assertEqual((path[0], path[-1]), (depot, node))
+                    self.assertIsNotNone(g.get_path_with_power(depot, node, power))
+
+    def test_lookup(self):
+        g = graph_from_file("input/network.1.in", csr=True)
+        index = g.nearest_depots([1, 9], 50)
+        cities = list(g.nodes)[::-1]
+        found, values = index.lookup(cities)
+        self.assertEqual(len(found), len(cities))
+        for city, depot, value in zip(cities, found, values.tolist()):
+            nearest = index.nearest(city)
+            self.assertEqual(nearest, None if depot is None else (depot, value))
+        self.assertEqual(index.lookup([1, 9])[0], [1, 9])
+        self.assertEqual(index.lookup([1, 9])[1].tolist(), [0, 0])
+
+    def test_depot_min_power(self):
+        for csr in (False, True):
+            g = graph_from_file("input/network.1.in", csr=csr)
+            depots = [2, 15]
+            index = g.depot_min_power(depots)
+            for node in g.nodes:
+                depot, power = index.nearest(node)
+                self.assertEqual(power, min(g.min_power(depot_, node)[1] if depot_ != node else 0 for depot_ in depots))
+                self.assertEqual(g.min_power(depot, node)[1] if depot != node else 0, power)
+
+    def test_unreachable(self):
+        g = Graph([1, 2, 3, 4])
+        g.add_edge(1, 2, 5, 3)
+        g.add_edge(3, 4, 1, 1)
+        index = g.nearest_depots([1], 10)
+        self.assertEqual(index.lookup([2, 3])[0], [1, None])
+        self.assertEqual(index.path(2), [1, 2])
+        self.assertIsNone(g.nearest_depots([1], 4).nearest(2))
+        self.assertIsNone(g.depot_min_power([4]).nearest(1))
+        self.assertEqual(g.depot_min_power([4]).nearest(3), (4, 1))
+
+    def test_csr_reused(self):
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 5, 3)
+        csr = g.to_csr()
+        g.nearest_depots([1], 10)
+        g.depot_min_power([1])
+        # La copie compacte n'est refaite qu'après une modification du graphe
+        self.assertIs(g.to_csr(), csr)
+        g.add_edge(2, 3, 1, 1)
+        self.assertIsNot(g.to_csr(), csr)
+        self.assertEqual(g.nearest_depots([1], 10).nearest(3), (1, 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import random
+from graph import Graph, graph_from_file
+from tree_index import TreeIndex
+import unittest   # The test framework
+
+class Test_DynamicTree(unittest.TestCase):
+    def check(self, g):
+        # L'arbre maintenu doit avoir le poids d'un arbre couvrant minimal et donner les mêmes puissances
+        tree = g.dynamic_tree
+        expected = TreeIndex(g.kruskal())
+        self.assertEqual(sum(edge[2] for edge in tree.edges()), sum(edge[2] for edge in g.kruskal().edges()))
+        pairs = [(a, b) for a in g.nodes[:15] for b in g.nodes]
+        self.assertEqual([tree.power(a, b) for a, b in pairs], [expected.power(a, b) for a, b in pairs])
+        self.assertEqual(g.min_power_batch(pairs), [expected.power(a, b) for a, b in pairs])
+
+    def test_random_updates(self):
+        rng = random.Random(4)
+        g = Graph(list(range(1, 61)))
+        for _ in range(30):
+            g.add_edge(rng.randint(1, 60), rng.randint(1, 60), rng.randint(1, 50), rng.randint(1, 9))
+        g.maintain_spanning_tree()
+        for step in range(200):
+            # Quelques nouvelles nodes au passage
+            g.add_edge(rng.randint(1, 70), rng.randint(1, 60), rng.randint(1, 50), rng.randint(1, 9))
+            if step % 40 == 0:
+                self.check(g)
+        self.check(g)
+        path, power = g.dynamic_tree.min_power(1, 2)
+        self.assertEqual(power, g.min_power(1, 2)[1])
+        self.assertEqual((path[0], path[-1]), (1, 2))
+
+    def test_deep_tree(self):
+        # Un long chemin dont la profondeur dépasse les tables initiales
+        g = Graph([1, 2])
+        g.add_edge(1, 2, 1)
+        tree = g.maintain_spanning_tree()
+        for node in range(3, 300):
+            g.add_edge(node - 1, node, node)
+        g.add_edge(1, 299, 1000)
+        g.add_edge(1, 299, 10)
+        self.assertGreater(tree.log, 1)
+        self.check(g)
+
+    def test_loop_on_new_node(self):
+        g = Graph([1, 2])
+        g.add_edge(1, 2, 5)
+        g.maintain_spanning_tree()
+        self.assertEqual(g.min_power_batch([(1, 2)]), [5])
+        # Une boucle sur une nouvelle node ne change pas l'arbre mais ajoute une node à l'index
+        g.add_edge(3, 3, 1)
+        self.assertEqual(g.min_power_batch([(3, 3), (1, 3), (2, 1)]), [0, None, 5])
+
+    def test_network1(self):
+        g = graph_from_file("input/network.1.in")
+        tree = g.maintain_spanning_tree()
+        g.add_edge(1, 20, 0, 5)
+        self.assertEqual(tree.power(1, 20), 0)
+        self.check(g)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network/")
+
+import os
+import tempfile
+import unittest 
+from graph import Graph, graph_from_file, routes_from_file, trucks_from_file, routes_extract, little_routes_extract
+
+class Test_FileLoading(unittest.TestCase):
+    def test_mixed_columns(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "network.in"), "w") as fichier:
+                fichier.write("4 3\n1 2 5\n2 3 7 2.5\n\n3 4 1 4\n")
+            g = graph_from_file("network.in", base_path=folder)
+            self.assertEqual(g.nb_nodes, 4)
+            self.assertEqual(g.nb_edges, 3)
+            self.assertEqual(g.graph[2], [[1, 5, 1], [3, 7, 2.5]])
+            c = graph_from_file(os.path.join(folder, "network.in"), csr=True)
+            self.assertEqual(c.graph[2], g.graph[2])
+
+    def test_bulk_same_as_add_edge(self):
+        for filename in ("input/network.00.in", "input/network.04.in", "input/network.1.in"):
+            g = graph_from_file(filename)
+            expected = Graph(list(g.nodes))
+            for node1, node2, power, dist in g.edges():
+                expected.add_edge(node1, node2, power, dist)
+            self.assertEqual(g.graph, expected.graph)
+            self.assertEqual(g.edge_list, expected.edge_list)
+            self.assertEqual(g.nb_edges, expected.nb_edges)
+            self.assertEqual(g.connected_components_set(), expected.connected_components_set())
+        self.assertEqual(graph_from_file("input/network.00.in").graph[1][0], [2, 11, 1])
+
+    def test_routes(self):
+        src, dest, utility = routes_from_file("input/routes.1.in")
+        self.assertEqual(len(src), 140)
+        self.assertEqual((src[0], dest[0], utility[0]), (6, 11, 9664))
+        self.assertEqual(routes_extract("input/routes.1.in")[1], ["6", "11", "9664"])
+        self.assertEqual(little_routes_extract("1"), (["20", "100"], ["140"]))
+
+    def test_trucks(self):
+        power, cost = trucks_from_file("input/trucks.1.in")
+        self.assertEqual(len(power), 20)
+        self.assertEqual((power[0], cost[0]), (500000, 50000))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import os
+import tempfile
+import unittest   # The test framework
+from graph import graph_from_file, routes_from_file, trucks_from_file
+from generator import write_network, write_routes, write_trucks
+
+class Test_Generator(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = self.folder.name
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_kinds(self):
+        for kind, nb_nodes, nb_edges in (("tree", 500, 499), ("sparse", 500, 1500), ("grid", 484, 924), ("path", 500, 499)):
+            n, m = write_network("network.in", kind, 500, seed=3, chunk_size=64, base_path=self.path)
+            self.assertEqual((n, m), (nb_nodes, nb_edges))
+            g = graph_from_file("network.in", csr=True, base_path=self.path)
+            self.assertEqual((g.nb_nodes, g.nb_edges), (n, m))
+            self.assertEqual(len(g.connected_components_set()), 1)
+
+    def read(self, name):
+        with open(os.path.join(self.path, name)) as fichier:
+            return fichier.read()
+
+    def test_seed(self):
+        write_network("a.in", "sparse", 300, 700, seed=5, base_path=self.path)
+        write_network("b.in", "sparse", 300, 700, seed=5, chunk_size=50, base_path=self.path)
+        write_network("c.in", "sparse", 300, 700, seed=5, chunk_size=7, base_path=self.path)
+        # Le même tirage quel que soit le découpage en morceaux
+        self.assertEqual(self.read("a.in"), self.read("b.in"))
+        self.assertEqual(self.read("a.in"), self.read("c.in"))
+        write_network("d.in", "sparse", 300, 700, seed=6, base_path=self.path)
+        self.assertNotEqual(self.read("a.in"), self.read("d.in"))
+        write_routes("r1.in", 50, 500, seed=2, base_path=self.path)
+        write_routes("r2.in", 50, 500, seed=2, chunk_size=33, base_path=self.path)
+        self.assertEqual(self.read("r1.in"), self.read("r2.in"))
+
+    def test_no_loops_nor_duplicates(self):
+        write_network("dense.in", "sparse", 40, 500, seed=1, chunk_size=64, base_path=self.path)
+        lines = self.read("dense.in").split("\n")[1:-1]
+        edges = [tuple(int(x) for x in line.split()[:2]) for line in lines]
+        self.assertEqual(len(edges), 500)
+        self.assertTrue(all(a != b for a, b in edges))
+        self.assertEqual(len({(min(a, b), max(a, b)) for a, b in edges}), 500)
+        with self.assertRaises(ValueError):
+            write_network("full.in", "sparse", 10, 46, base_path=self.path)
+
+    def test_path_and_no_dist(self):
+        write_network("path.in", "path", 100, with_dist=False, base_path=self.path)
+        g = graph_from_file("path.in", base_path=self.path)
+        self.assertEqual(len(g.graph[1][0]), 3)
+        self.assertEqual(g.min_power(1, 100)[1], g.graph[1][0][1])
+        self.assertGreater(g.graph[1][0][1], g.graph[100][0][1])
+
+    def test_routes_trucks(self):
+        write_routes("routes.in", 50, 1000, seed=1, chunk_size=300, base_path=self.path)
+        src, dest, utility = routes_from_file("routes.in", base_path=self.path)
+        self.assertEqual(len(src), 1000)
+        self.assertTrue(1 <= src.min() and src.max() <= 50)
+        write_trucks("trucks.in", 20, base_path=self.path)
+        power, cost = trucks_from_file("trucks.in", base_path=self.path)
+        self.assertEqual(len(power), 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import random
+import time
+import instrumentation
+from graph import Graph, graph_from_file
+from heavy_light import HeavyLightIndex, MaxSegmentTree
+import unittest   # The test framework
+
+class Test_HeavyLight(unittest.TestCase):
+    def current_graph(self, index):
+        # Graphe avec les puissances courantes de l'index, sans les arêtes fermées
+        g = Graph(list(index.nodes))
+        for a, b, p, closed in zip(index.node1, index.node2, index.power, index.closed):
+            if not closed:
+                g.add_edge(index.nodes[a], index.nodes[b], p)
+        return g
+
+    def check(self, index, pairs):
+        g = self.current_graph(index)
+        for src, dest in pairs:
+            expected = g.min_power(src, dest)
+            if expected is None:
+                self.assertIsNone(index.min_power(src, dest))
+            else:
+                path, power = index.min_power(src, dest)
+                self.assertEqual(power, expected[1])
+                self.assertEqual((path[0], path[-1]), (src, dest))
+
+    def test_segment_tree(self):
+        tree = MaxSegmentTree(5)
+        for i, value in enumerate([3, 9, 2, 7, 1]):
+            tree.update(i, value)
+        self.assertEqual(tree.query(0, 4), (9, 1))
+        self.assertEqual(tree.query(2, 4), (7, 3))
+        tree.update(3, 0)
+        self.assertEqual(tree.query(2, 4), (2, 2))
+
+    def test_network1(self):
+        g = graph_from_file("input/network.1.in")
+        index = g.heavy_light_index()
+        pairs = [(1, dest) for dest in g.nodes] + [(7, dest) for dest in g.nodes]
+        self.check(index, pairs)
+        path, power = g.min_power(1, 20)
+        # On rend plus chère une arête du chemin, puis on la ferme
+        index.update_edge_power(path[0], path[1], 10 ** 6)
+        self.check(index, pairs)
+        index.close_edge(path[0], path[1])
+        self.check(index, pairs)
+        index.update_edge_power(path[0], path[1], 1)
+        self.assertEqual(index.power_between(path[0], path[1]), 1)
+        self.check(index, pairs)
+
+    def test_random_updates(self):
+        rng = random.Random(7)
+        g = Graph(list(range(1, 41)))
+        for _ in range(90):
+            g.add_edge(rng.randint(1, 40), rng.randint(1, 40), rng.randint(1, 100))
+        index = HeavyLightIndex(g)
+        edges = g.edges()
+        pairs = [(rng.randint(1, 40), rng.randint(1, 40)) for _ in range(60)]
+        for step in range(300):
+            a, b, p, d = rng.choice(edges)
+            if rng.random() < 0.2:
+                index.close_edge(a, b)
+            else:
+                index.update_edge_power(a, b, rng.randint(1, 100))
+            if step % 10 == 0:
+                self.check(index, pairs)
+        self.check(index, pairs)
+        self.assertEqual(sum(index.in_tree), 40 - len({index.component[i] for i in range(40)}))
+
+    def test_path_updates_scan_little(self):
+        # Chemin 1 - 2 - ... - n de puissance 1, plus une arête (1, n) de puissance 100 hors de l'arbre
+        n = 20000
+        g = Graph(list(range(1, n + 1)))
+        for i in range(1, n):
+            g.add_edge(i, i + 1, 1)
+        g.add_edge(1, n, 100)
+        index = g.heavy_light_index()
+        instrumentation.reset()
+        instrumentation.enable()
+        try:
+            # Moins chère que l'arête hors de l'arbre : aucun parcours
+            t0 = time.perf_counter()
+            for i in range(2, 1002):
+                index.update_edge_power(i, i + 1, 50)
+            elapsed = time.perf_counter() - t0
+            self.assertNotIn("heavy_light.scanned", instrumentation.counters)
+            # Plus chère : seul le plus petit côté, de 2 nodes, est parcouru
+            index.update_edge_power(2, 3, 200)
+            self.assertEqual(instrumentation.counters["heavy_light.scanned"], 2)
+            self.assertEqual(instrumentation.counters["heavy_light.swaps"], 1)
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+        self.assertEqual(index.power_between(2, 3), 100)
+        self.assertEqual(index.power_between(1, 2), 1)
+        # 1000 mises à jour en O(log² n) chacune, bien moins qu'un parcours du chemin à chaque fois
+        self.assertLess(elapsed, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import json
+import os
+import tempfile
+from graph import graph_from_file
+import instrumentation
+import unittest   # The test framework
+
+class Test_Instrumentation(unittest.TestCase):
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled(self):
+        g = graph_from_file("input/network.00.in")
+        g.min_power(1, 4)
+        g.kruskal()
+        self.assertEqual(instrumentation.report(), {"counters": {}, "timers": {}, "latencies": {}})
+
+    def test_counters(self):
+        for csr in (False, True):
+            instrumentation.reset()
+            g = graph_from_file("input/network.00.in", csr=csr)
+            instrumentation.enable()
+            self.assertEqual(g.get_path_with_power(1, 4, 11), [1, 2, 3, 4])
+            g.kruskal()
+            counters = instrumentation.report()["counters"]
+            self.assertEqual(counters["get_path_with_power.calls"], 1)
+            self.assertGreaterEqual(counters["get_path_with_power.expanded"], 4)
+            self.assertGreaterEqual(counters["get_path_with_power.pushes"], 3)
+            self.assertEqual(counters["kruskal.selected"], g.nb_nodes - 1)
+
+    def test_union_find_depth(self):
+        import numpy as np
+        from union_find import depths, kruskal_edges
+        self.assertEqual(depths(np.array([0, 0, 1, 2, 4])).tolist(), [0, 1, 2, 3, 0])
+        # Assez d'arêtes pour plusieurs morceaux : l'union-find a été construit entre deux compressions
+        rng = np.random.default_rng(0)
+        node1, node2 = rng.integers(0, 3000, 20000), rng.integers(0, 3000, 20000)
+        instrumentation.enable()
+        kruskal_edges(3000, node1, node2, rng.integers(1, 100, 20000))
+        counters = instrumentation.report()["counters"]
+        self.assertGreaterEqual(counters["kruskal.chunks"], 2)
+        self.assertGreaterEqual(counters["kruskal.max_depth"], 1)
+        self.assertGreaterEqual(counters["kruskal.find_steps"], counters["kruskal.max_depth"])
+
+    def test_latencies(self):
+        g = graph_from_file("input/network.1.in", csr=True)
+        instrumentation.enable()
+        for dest in g.nodes:
+            g.min_power(1, dest)
+        latencies = instrumentation.report()["latencies"]["min_power"]
+        self.assertEqual(latencies["count"], g.nb_nodes)
+        self.assertLessEqual(latencies["p50"], latencies["p95"])
+        self.assertLessEqual(latencies["p95"], latencies["p99"])
+        self.assertLessEqual(latencies["p99"], latencies["max"])
+
+    def test_to_json(self):
+        instrumentation.enable()
+        with instrumentation.timed("bloc"):
+            graph_from_file("input/network.00.in")
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "report.json")
+            instrumentation.to_json(filename)
+            with open(filename) as fichier:
+                report = json.load(fichier)
+        self.assertEqual(report["counters"]["bloc.calls"], 1)
+        self.assertEqual(report["counters"]["graph_from_file.calls"], 1)
+        self.assertIn("bloc", report["latencies"])
+
+    def test_bounded_samples(self):
+        instrumentation.enable()
+        for _ in range(instrumentation.MAX_SAMPLES + 500):
+            instrumentation.observe("requete", 0.001)
+        self.assertEqual(len(instrumentation.samples["requete"]), instrumentation.MAX_SAMPLES)
+        report = instrumentation.report()
+        # Les compteurs restent exacts, l'histogramme porte sur les dernières durées
+        self.assertEqual(report["counters"]["requete.calls"], instrumentation.MAX_SAMPLES + 500)
+        self.assertEqual(report["latencies"]["requete"]["count"], instrumentation.MAX_SAMPLES)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import json
+import os
+import shutil
+import tempfile
+import unittest   # The test framework
+from graph import graph_from_file
+from network_cache import load_network, cache_is_valid, cache_path
+
+class Test_NetworkCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        shutil.copy("input/network.1.in", self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_cache_reused(self):
+        self.assertFalse(cache_is_valid("network.1.in", self.folder))
+        g1, tree1 = load_network("network.1.in", self.folder)
+        self.assertTrue(os.path.isdir(cache_path("network.1.in", self.folder)))
+        self.assertTrue(cache_is_valid("network.1.in", self.folder))
+        g2, tree2 = load_network("network.1.in", self.folder)
+        self.assertEqual(g2.nb_edges, 100)
+        self.assertEqual(tree2.nb_edges, 19)
+        self.assertEqual(g2.graph[1], g1.graph[1])
+        reference = graph_from_file("input/network.1.in")
+        for dest in range(1, 21):
+            self.assertEqual(tree2.min_power_kruskal(1, dest), tree1.min_power_kruskal(1, dest))
+            self.assertEqual(tree2.min_power_kruskal(1, dest)[1], reference.min_power(1, dest)[1])
+            self.assertEqual(g2.min_power(1, dest), g1.min_power(1, dest))
+
+    def test_cache_invalidated(self):
+        load_network("network.1.in", self.folder)
+        with open(os.path.join(self.folder, "network.1.in"), "a") as fichier:
+            fichier.write("1 20 1 1\n")
+        self.assertFalse(cache_is_valid("network.1.in", self.folder))
+        g, tree = load_network("network.1.in", self.folder)
+        self.assertEqual(g.nb_edges, 101)
+        self.assertEqual(tree.min_power_kruskal(1, 20), ([1, 20], 1))
+
+    def test_touched_file(self):
+        load_network("network.1.in", self.folder)
+        os.utime(os.path.join(self.folder, "network.1.in"), ns=(0, 0))
+        self.assertTrue(cache_is_valid("network.1.in", self.folder))
+        # La nouvelle date est enregistrée : le hash n'est plus recalculé aux chargements suivants
+        with open(os.path.join(self.folder, "network.1.in.cache", "meta.json")) as fichier:
+            self.assertEqual(json.load(fichier)["mtime_ns"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
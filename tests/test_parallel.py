@@ -0,0 +1,41 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import unittest   # The test framework
+import numpy as np
+from graph import graph_from_file, routes_from_file
+from tree_index import TreeIndex
+from parallel import SharedArrays, attach, parallel_power_batch, iter_power_batch
+
+class Test_Parallel(unittest.TestCase):
+    def setUp(self):
+        g = graph_from_file("input/network.1.in", csr=True)
+        self.index = TreeIndex(g.kruskal())
+        self.src, self.dest, utility = routes_from_file("input/routes.1.in")
+        self.expected = self.index.power_batch(self.src, self.dest)
+
+    def test_workers(self):
+        for workers in (1, 2, 3):
+            result = parallel_power_batch(self.index, self.src, self.dest, workers=workers, chunk_size=25)
+            self.assertTrue(np.array_equal(result, self.expected))
+
+    def test_chunks_in_order(self):
+        chunks = list(iter_power_batch(self.index, self.src, self.dest, workers=2, chunk_size=50))
+        self.assertEqual([len(chunk) for chunk in chunks], [50, 50, 40])
+        self.assertTrue(np.array_equal(np.concatenate(chunks), self.expected))
+
+    def test_empty(self):
+        self.assertEqual(len(parallel_power_batch(self.index, [], [], workers=2)), 0)
+
+    def test_shared_arrays(self):
+        with SharedArrays({"a": np.arange(10), "b": np.ones((2, 3))}) as shared:
+            arrays, blocks = attach(shared.spec)
+            self.assertTrue(np.array_equal(arrays["a"], np.arange(10)))
+            self.assertEqual(arrays["b"].shape, (2, 3))
+            del arrays
+            for block in blocks:
+                block.close()
+
+if __name__ == '__main__':
+    unittest.main()
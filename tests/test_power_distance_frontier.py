@@ -0,0 +1,38 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file
+import unittest   # The test framework
+
+class Test_PowerDistanceFrontier(unittest.TestCase):
+    def brute_force(self, g, src, dest):
+        # Plus courte distance pour chaque puissance d'arête, en gardant les points où elle diminue strictement
+        frontier = []
+        for power in [0] + g.distinct_powers().tolist():
+            dist, pred = g.shortest_path_tree(src, power)
+            if dest in dist and (not frontier or dist[dest] < frontier[-1][1]):
+                frontier.append((power, dist[dest]))
+        return frontier
+
+    def test_network1(self):
+        for csr in (False, True):
+            g = graph_from_file("input/network.1.in", csr=csr)
+            pairs = [(src, dest) for src in (1, 9) for dest in g.nodes]
+            for (src, dest), frontier in zip(pairs, g.power_distance_frontier_batch(pairs)):
+                self.assertEqual([(p, d) for p, d, path in frontier], self.brute_force(g, src, dest))
+                self.assertEqual(frontier[0][0], g.min_power(src, dest)[1])
+                for p, d, path in frontier:
+                    self.assertEqual((path[0], path[-1]), (src, dest))
+
+    def test_small(self):
+        g = Graph([1, 2, 3, 4])
+        g.add_edge(1, 2, 5, 1)
+        g.add_edge(2, 3, 5, 1)
+        g.add_edge(1, 3, 2, 10)
+        self.assertEqual(g.power_distance_frontier(1, 3), [(2, 10, [1, 3]), (5, 2, [1, 2, 3])])
+        self.assertEqual(g.power_distance_frontier(1, 1), [(0, 0, [1])])
+        self.assertEqual(g.power_distance_frontier(1, 4), [])
+
+if __name__ == '__main__':
+    unittest.main()
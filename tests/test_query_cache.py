@@ -0,0 +1,65 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file
+from query_cache import LRUCache
+import unittest   # The test framework
+
+class Test_QueryCache(unittest.TestCase):
+    def test_lru(self):
+        cache = LRUCache(2)
+        cache.put(1, "a")
+        cache.put(2, "b")
+        self.assertEqual(cache.get(1), "a")
+        cache.put(3, "c")
+        # 2 est le moins récemment utilisé
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(2, None))
+        self.assertEqual(cache.get(3), "c")
+        self.assertEqual(cache.stats(), {"size": 2, "maxsize": 2, "hits": 2, "misses": 1})
+
+    def test_mirrored_pairs(self):
+        for csr in (False, True):
+            g = graph_from_file("input/network.1.in", csr=csr)
+            expected = g.min_power(6, 11)
+            cache = g.cache_queries(16)
+            self.assertEqual(g.min_power(6, 11), expected)
+            path, power = g.min_power(11, 6)
+            self.assertEqual((path[::-1], power), expected)
+            self.assertEqual(g.get_path_with_power(11, 6, power), g.get_path_with_power(6, 11, power)[::-1])
+            self.assertEqual(cache.stats()["hits"], 2)
+            self.assertEqual(cache.stats()["misses"], 2)
+            # Le résultat renvoyé est une copie
+            path.append(0)
+            self.assertEqual(g.min_power(6, 11), expected)
+
+    def test_add_edge_invalidates(self):
+        g = graph_from_file("input/network.00.in")
+        cache = g.cache_queries()
+        self.assertEqual(g.min_power(1, 4), ([1, 2, 3, 4], 11))
+        self.assertIsNone(g.get_path_with_power(1, 4, 10))
+        g.add_edge(1, 4, 5)
+        self.assertEqual(g.min_power(1, 4), ([1, 4], 5))
+        self.assertEqual(g.get_path_with_power(1, 4, 10), [1, 4])
+        self.assertEqual(cache.stats()["hits"], 0)
+
+    def test_mixed_node_types(self):
+        g = Graph([1, "a", (2, 3)])
+        g.add_edge(1, "a", 4)
+        g.add_edge("a", (2, 3), 7)
+        cache = g.cache_queries()
+        self.assertEqual(g.get_path_with_power(1, (2, 3), 10), [1, "a", (2, 3)])
+        self.assertEqual(g.get_path_with_power((2, 3), 1, 10), [(2, 3), "a", 1])
+        self.assertEqual(g.min_power("a", 1), (["a", 1], 4))
+        self.assertEqual(g.min_power(1, "a"), ([1, "a"], 4))
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_disabled(self):
+        g = Graph([1, 2])
+        g.add_edge(1, 2, 3)
+        self.assertIsNone(g.cache_queries(0))
+        self.assertEqual(g.min_power(2, 1), ([2, 1], 3))
+
+if __name__ == '__main__':
+    unittest.main()
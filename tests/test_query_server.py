@@ -0,0 +1,109 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest   # The test framework
+from graph import graph_from_file
+from query_server import QueryServer, QueryClient
+
+class Test_QueryServer(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        for name in ("network.1.in", "network.01.in"):
+            shutil.copy(os.path.join("input", name), self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def run_client(self, scenario, path=None):
+        async def main():
+            server = QueryServer({"1": "network.1.in", "01": "network.01.in"}, base_path=self.folder, batch_window=0.01)
+            await server.start(path=path)
+            if path is None:
+                host, port = server.server.sockets[0].getsockname()[:2]
+                client = await QueryClient.connect(host, port)
+            else:
+                client = await QueryClient.connect(path=path)
+            try:
+                return await scenario(client), server
+            finally:
+                await client.close()
+                server.server.close()
+                await server.server.wait_closed()
+        return asyncio.run(main())
+
+    def test_queries(self):
+        g = graph_from_file("input/network.1.in")
+        pairs = [(1, dest) for dest in g.nodes] + [(7, dest) for dest in g.nodes]
+
+        async def scenario(client):
+            # Toutes les requêtes sont envoyées en même temps : elles sont regroupées en lots
+            min_powers = await asyncio.gather(*(client.request("min_power", network="1", src=a, dest=b) for a, b in pairs))
+            powers = await asyncio.gather(*(client.request("min_power", network="1", src=a, dest=b, path=False) for a, b in pairs))
+            paths = await asyncio.gather(*(client.request("get_path_with_power", network="1", src=a, dest=b, power=20) for a, b in pairs))
+            reachable = await asyncio.gather(*(client.request("reachable", network="01", src=1, dest=dest, power=10 ** 6) for dest in range(1, 8)))
+            return min_powers, powers, paths, reachable, await client.request("stats")
+
+        (min_powers, powers, paths, reachable, stats), server = self.run_client(scenario)
+        expected = [g.min_power(a, b)[1] for a, b in pairs]
+        self.assertEqual([result[1] for result in min_powers], expected)
+        self.assertEqual(powers, expected)
+        self.assertTrue(all(result[0][0] == a and result[0][-1] == b for result, (a, b) in zip(min_powers, pairs)))
+        self.assertEqual([path is None for path in paths], [g.get_path_with_power(a, b, 20) is None for a, b in pairs])
+        self.assertEqual(reachable, [True, True, True, False, False, False, False])
+        self.assertEqual(stats["requests"], 3 * len(pairs) + 7)
+        self.assertLess(stats["batches"], 20)
+        self.assertIn("p99", stats["latency_s"])
+
+    def test_errors(self):
+        async def scenario(client):
+            errors = []
+            for fields in ({"op": "min_power", "network": "3", "src": 1, "dest": 2}, {"op": "other"},
+                           {"op": "min_power", "network": "1", "src": 1, "dest": 999}):
+                try:
+                    await client.request(**fields)
+                except RuntimeError as error:
+                    errors.append(str(error))
+            # Le serveur répond toujours après des erreurs
+            return errors, await client.request("min_power", network="1", src=1, dest=2, path=False)
+
+        (errors, power), server = self.run_client(scenario)
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(power, graph_from_file("input/network.1.in").min_power(1, 2)[1])
+
+    def test_malformed_requests(self):
+        g = graph_from_file("input/network.1.in")
+        pairs = [(1, dest) for dest in g.nodes]
+
+        async def scenario(client):
+            errors = []
+            for fields in ({"op": "get_path_with_power", "network": "1", "src": 1, "dest": 4, "power": "big"},
+                           {"op": "reachable", "network": "1", "src": 1, "dest": 4},
+                           {"op": "get_path_with_power", "network": "1", "src": [1], "dest": 4, "power": 10}):
+                try:
+                    await client.request(**fields)
+                except RuntimeError as error:
+                    errors.append(str(error))
+            # Les requêtes suivantes sont toujours justes
+            paths = await asyncio.gather(*(client.request("get_path_with_power", network="1", src=a, dest=b, power=10 ** 6) for a, b in pairs))
+            return errors, paths
+
+        (errors, paths), server = self.run_client(scenario)
+        self.assertEqual(len(errors), 3)
+        self.assertIn("power", errors[0])
+        self.assertEqual(paths, [g.get_path_with_power(a, b, 10 ** 6) for a, b in pairs])
+
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "no Unix sockets")
+    def test_unix_socket(self):
+        async def scenario(client):
+            return await client.request("min_power", network="01", src=1, dest=4)
+
+        result, server = self.run_client(scenario, path=os.path.join(self.folder, "server.sock"))
+        self.assertIsNone(result)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file
+import unittest   # The test framework
+
+class Test_ReconstructionTree(unittest.TestCase):
+    def test_network1(self):
+        g = graph_from_file("input/network.1.in")
+        krt = g.reconstruction_tree()
+        for src in (1, 7, 13):
+            for dest in range(1, 21):
+                power = g.min_power(src, dest)[1]
+                self.assertEqual(krt.min_power_value(src, dest), power)
+                self.assertTrue(krt.reachable(src, dest, power))
+                self.assertEqual(krt.reachable(src, dest, power - 1), src == dest)
+        for power in (0, 10, 20, 40, 100):
+            component = {node for node in g.nodes if g.get_path_with_power(1, node, power) is not None}
+            self.assertEqual(krt.reachable_set(1, power), component)
+            self.assertEqual(krt.reachable_count(1, power), len(component))
+
+    def test_forest(self):
+        g = graph_from_file("input/network.01.in", csr=True)
+        krt = g.reconstruction_tree()
+        self.assertIsNone(krt.min_power_value(1, 4))
+        self.assertFalse(krt.reachable(1, 4, 10 ** 9))
+        self.assertEqual(krt.reachable_set(4, 10 ** 9), {4, 5, 6, 7})
+        self.assertEqual(krt.reachable_count(2, -1), 1)
+
+    def test_isolated_node(self):
+        g = Graph(["a", "b", "c"])
+        g.add_edge("a", "b", 4)
+        krt = g.reconstruction_tree()
+        self.assertEqual(krt.min_power_value("a", "b"), 4)
+        self.assertIsNone(krt.min_power_value("a", "c"))
+        self.assertEqual(krt.min_power_value("c", "c"), 0)
+        self.assertEqual(krt.reachable_set("c", 100), {"c"})
+
+if __name__ == '__main__':
+    unittest.main()
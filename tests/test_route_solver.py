@@ -0,0 +1,92 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import os
+import shutil
+import tempfile
+import unittest   # The test framework
+from graph import Graph, graph_from_file, routes_extract
+from route_solver import solve_routes, stream_routes, iter_route_chunks
+
+class Test_RouteSolver(unittest.TestCase):
+    def test_min_power_batch(self):
+        g = graph_from_file("input/network.1.in")
+        pairs = [(int(route[0]), int(route[1])) for route in routes_extract("input/routes.1.in")[1:]]
+        expected = [g.min_power(src, dest)[1] for src, dest in pairs]
+        self.assertEqual(g.min_power_batch(pairs), expected)
+        self.assertEqual(g.to_csr().min_power_batch(pairs), expected)
+
+    def test_spanning_tree_index_cached(self):
+        g = graph_from_file("input/network.01.in")
+        pairs = [(1, 3), (1, 4), (4, 7)]
+        self.assertEqual(g.min_power_batch(pairs), [g.min_power(a, b)[1] for a, b in [(1, 3)]] + [None, g.min_power(4, 7)[1]])
+        index = g.spanning_tree_index()
+        g.min_power_batch(pairs)
+        self.assertIs(g.spanning_tree_index(), index)
+        # Après add_edge, l'arbre couvrant est reconstruit
+        g.add_edge(3, 4, 1)
+        self.assertIsNot(g.spanning_tree_index(), index)
+        self.assertEqual(g.min_power_batch(pairs), [g.min_power(a, b)[1] for a, b in pairs])
+
+    def test_unreachable(self):
+        g = graph_from_file("input/network.01.in")
+        self.assertEqual(g.min_power_batch([(1, 4), (1, 3), (5, 5)]), [None, g.min_power(1, 3)[1], 0])
+
+    def test_solve_routes(self):
+        folder = tempfile.mkdtemp()
+        try:
+            shutil.copy("input/network.1.in", folder)
+            shutil.copy("input/routes.1.in", folder)
+            solve_routes("network.1.in", "routes.1.in", "routes.1.out", base_path=folder)
+            with open(os.path.join(folder, "routes.1.out")) as fichier:
+                powers = [int(line) for line in fichier]
+        finally:
+            shutil.rmtree(folder)
+        g = graph_from_file("input/network.1.in")
+        routes = routes_extract("input/routes.1.in")[1:]
+        self.assertEqual(len(powers), 140)
+        for route, power in zip(routes, powers):
+            self.assertEqual(power, g.min_power(int(route[0]), int(route[1]))[1])
+
+    def test_iter_route_chunks(self):
+        chunks = list(iter_route_chunks("input/routes.1.in", 30))
+        self.assertEqual([len(src) for src, dest, offset in chunks], [30, 30, 30, 30, 20])
+        routes = routes_extract("input/routes.1.in")[1:]
+        self.assertEqual([int(route[0]) for route in routes], [int(x) for src, dest, offset in chunks for x in src])
+        # On reprend à partir de la fin du deuxième morceau
+        rest = list(iter_route_chunks("input/routes.1.in", 50, chunks[1][2]))
+        self.assertEqual([len(src) for src, dest, offset in rest], [50, 30])
+        self.assertEqual(rest[0][1].tolist(), chunks[2][1].tolist() + chunks[3][1].tolist()[:20])
+
+    def test_stream_routes_resume(self):
+        folder = tempfile.mkdtemp()
+        try:
+            shutil.copy("input/network.1.in", folder)
+            shutil.copy("input/routes.1.in", folder)
+            solve_routes("network.1.in", "routes.1.in", "expected.out", base_path=folder)
+
+            def crash(stats):
+                if stats["chunk"] == 2:
+                    raise KeyboardInterrupt
+            with self.assertRaises(KeyboardInterrupt):
+                stream_routes("network.1.in", "routes.1.in", "routes.1.out", base_path=folder, chunk_size=30,
+                              checkpoint_every=2, report=crash)
+            checkpoint = os.path.join(folder, "routes.1.out.checkpoint")
+            self.assertTrue(os.path.exists(checkpoint))
+            # Des lignes écrites après le point de reprise doivent être effacées
+            with open(os.path.join(folder, "routes.1.out"), "a") as fichier:
+                fichier.write("1\n2\n")
+            reports = []
+            total = stream_routes("network.1.in", "routes.1.in", "routes.1.out", base_path=folder, chunk_size=30,
+                                  report=reports.append)
+            self.assertEqual(total, 140)
+            self.assertEqual([stats["routes"] for stats in reports], [30, 30, 20])
+            self.assertFalse(os.path.exists(checkpoint))
+            with open(os.path.join(folder, "routes.1.out")) as out, open(os.path.join(folder, "expected.out")) as expected:
+                self.assertEqual(out.read(), expected.read())
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    unittest.main()
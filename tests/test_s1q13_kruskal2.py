@@ -0,0 +1,48 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network/")
+
+import unittest 
+import numpy as np
+from graph import Graph, graph_from_file
+from csr_graph import CSRGraph
+from union_find import UnionFind, kruskal_edges
+
+class Test_Kruskal(unittest.TestCase):
+    def test_compact_tree(self):
+        g = graph_from_file("input/network.1.in")
+        k = g.kruskal()
+        self.assertIsInstance(k, CSRGraph)
+        self.assertEqual(k.edges(), g.to_csr().kruskal().edges())
+        self.assertEqual(sum(edge[2] for edge in k.edges()), 208)
+
+    def test_union_find_long_chain(self):
+        n = 200000
+        uf = UnionFind(n)
+        # Sans union par rang ni compression, ce serait une chaîne de longueur n
+        for i in range(n - 1):
+            uf.parent[i] = i + 1
+        self.assertEqual(uf.find(0), n - 1)
+        self.assertEqual(uf.parent[0], n - 1)
+        self.assertFalse(uf.union(5, 17))
+        uf2 = UnionFind(4)
+        self.assertTrue(uf2.union(0, 1))
+        self.assertTrue(uf2.union(2, 3))
+        self.assertTrue(uf2.union(1, 3))
+        self.assertEqual(len({uf2.find(i) for i in range(4)}), 1)
+
+    def test_path_graph(self):
+        n = 100000
+        g = Graph([i + 1 for i in range(n)])
+        for i in range(1, n):
+            g.add_edge(i, i + 1, n - i)
+        k = g.kruskal()
+        self.assertEqual(k.nb_edges, n - 1)
+        self.assertEqual(k.min_power_kruskal(1, n)[1], n - 1)
+
+    def test_kruskal_edges(self):
+        selected = kruskal_edges(3, [0, 1, 0, 0], [1, 2, 2, 1], [5, 1, 3, 2])
+        self.assertEqual(selected.tolist(), [1, 3])
+
+if __name__ == '__main__':
+    unittest.main()
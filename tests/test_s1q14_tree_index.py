@@ -0,0 +1,42 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, routes_extract
+from tree_index import TreeIndex
+import unittest   # The test framework
+
+class Test_TreeIndex(unittest.TestCase):
+    def test_network0(self):
+        g = graph_from_file("input/network.00.in")
+        index = TreeIndex(g.kruskal())
+        self.assertEqual(index.power(1, 4), 11)
+        self.assertEqual(index.power(2, 4), 10)
+        self.assertEqual(index.path(1, 4), [1, 2, 3, 4])
+        self.assertEqual(index.min_power(7, 7), ([7], 0))
+
+    def test_network01_forest(self):
+        g = graph_from_file("input/network.01.in")
+        k = g.kruskal()
+        self.assertIsNone(k.min_power_kruskal(1, 4))
+        self.assertEqual(k.min_power_kruskal(4, 7)[1], g.min_power(4, 7)[1])
+
+    def test_network1_routes(self):
+        g = graph_from_file("input/network.1.in")
+        k = g.kruskal()
+        for route in routes_extract("input/routes.1.in")[1:]:
+            src, dest = int(route[0]), int(route[1])
+            path, power = k.min_power_kruskal(src, dest)
+            self.assertEqual(power, g.min_power(src, dest)[1])
+            self.assertEqual(path[0], src)
+            self.assertEqual(path[-1], dest)
+
+    def test_index_reset_by_add_edge(self):
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 5)
+        self.assertIsNone(g.min_power_kruskal(1, 3))
+        g.add_edge(2, 3, 7)
+        self.assertEqual(g.min_power_kruskal(1, 3), ([1, 2, 3], 7))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file
+import unittest   # The test framework
+
+class Test_MinimalPower(unittest.TestCase):
+    def test_network0(self):
+        g = graph_from_file("input/network.00.in")
+        self.assertEqual(g.min_power(1, 4), ([1, 2, 3, 4], 11))
+        self.assertEqual(g.min_power(4, 4), ([4], 0))
+
+    def test_network01_unreachable(self):
+        g = graph_from_file("input/network.01.in")
+        self.assertIsNone(g.min_power(1, 4))
+
+    def test_network1_exact(self):
+        g = graph_from_file("input/network.1.in")
+        powers = sorted({edge[1] for node in g.nodes for edge in g.graph[node]})
+        for dest in range(2, 21):
+            path, power = g.min_power(1, dest)
+            exact = next(p for p in powers if g.get_path_with_power(1, dest, p) is not None)
+            self.assertEqual(power, exact)
+            self.assertEqual(path[0], 1)
+            self.assertEqual(path[-1], dest)
+
+    def test_tie_break(self):
+        g = Graph([1, 2, 3, 4])
+        g.add_edge(1, 2, 5, 10)
+        g.add_edge(2, 4, 5, 10)
+        g.add_edge(1, 3, 5, 1)
+        g.add_edge(3, 4, 5, 1)
+        g.add_edge(1, 4, 9, 1)
+        self.assertEqual(g.min_power(1, 4, tie_break=True), ([1, 3, 4], 5))
+        self.assertEqual(g.min_power(1, 4)[1], 5)
+
+    def test_float_power(self):
+        g = Graph([1, 2])
+        g.add_edge(1, 2, 2.5)
+        self.assertEqual(g.min_power(1, 2), ([1, 2], 2.5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file
+import unittest   # The test framework
+
+class Test_ShortestPathTree(unittest.TestCase):
+    def path_length(self, g, path, power):
+        # Longueur d'un chemin : on prend l'arête autorisée la plus courte entre deux nodes consécutives
+        return sum(min(d for v, p, d in g.graph[a] if v == b and p <= power) for a, b in zip(path, path[1:]))
+
+    def test_network00(self):
+        for csr in (False, True):
+            g = graph_from_file("input/network.00.in", csr=csr)
+            dist, pred = g.shortest_path_tree(1, 11)
+            self.assertEqual(pred[1], None)
+            self.assertEqual(dist[1], 0)
+            self.assertEqual(g.get_paths_with_power(1, [4, 1, 2], 11), [[1, 2, 3, 4], [1], [1, 2]])
+            self.assertEqual(g.get_paths_with_power(1, [4, 1], 10), [None, [1]])
+            self.assertNotIn(4, g.shortest_path_tree(1, 10)[0])
+
+    def test_same_as_single_queries(self):
+        for csr in (False, True):
+            g = graph_from_file("input/network.1.in", csr=csr)
+            queries = [(src, dest, power) for src in (1, 5, 12) for dest in g.nodes for power in (3, 10, 10 ** 9)]
+            for (src, dest, power), path in zip(queries, g.get_path_with_power_batch(queries)):
+                expected = g.get_path_with_power(src, dest, power)
+                if expected is None:
+                    self.assertIsNone(path)
+                else:
+                    self.assertEqual((path[0], path[-1]), (src, dest))
+                    self.assertEqual(self.path_length(g, path, power), self.path_length(g, expected, power))
+                    self.assertEqual(self.path_length(g, path, power), g.shortest_path_tree(src, power)[0][dest])
+
+    def test_scratch_reused(self):
+        g = graph_from_file("input/network.1.in", csr=True)
+        g.get_path_with_power(1, 2, 10 ** 9)
+        scratch = g.scratch
+        g.get_paths_with_power(3, g.nodes, 10 ** 9)
+        self.assertIs(g.scratch, scratch)
+        # Les tableaux sont remis à zéro après chaque recherche
+        self.assertEqual(set(scratch[0]), {float('inf')})
+        self.assertEqual(set(scratch[1]), {-1})
+        self.assertFalse(any(scratch[2]))
+
+    def test_scratch_reset_after_error(self):
+        g = graph_from_file("input/network.00.in", csr=True)
+        expected = g.get_path_with_power(1, 4, 11)
+        expected_paths = g.get_paths_with_power(1, [10], 10 ** 9)
+        with self.assertRaises(TypeError):
+            g.get_path_with_power(1, 4, "11")
+        self.assertEqual(g.get_path_with_power(1, 4, 11), expected)
+        with self.assertRaises(TypeError):
+            g.get_paths_with_power(1, [10], "big")
+        self.assertEqual(g.get_paths_with_power(1, [10], 10 ** 9), expected_paths)
+        with self.assertRaises(TypeError):
+            g.shortest_path_tree(1, "big")
+        self.assertEqual(set(g.scratch[0]), {float('inf')})
+        self.assertFalse(any(g.scratch[2]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import os
+import tempfile
+from graph import Graph, graph_from_file
+import visualization
+import unittest   # The test framework
+
+class Test_Visualization(unittest.TestCase):
+    def test_edges_once(self):
+        g = graph_from_file("input/network.00.in")
+        edges = list(visualization.subgraph_edges(g, g.nodes))
+        self.assertEqual(len(edges), g.nb_edges)
+        self.assertEqual(sorted((a, b) for a, b, p, d in edges), sorted((a, b) for a, b, p, d in g.edges()))
+
+    def test_parallel_edges_and_loops(self):
+        g = Graph([1, 2])
+        g.add_edge(1, 2, 3)
+        g.add_edge(2, 1, 4)
+        g.add_edge(1, 1, 5)
+        self.assertEqual(len(list(visualization.subgraph_edges(g, [2, 1]))), 3)
+
+    def test_modes(self):
+        g = graph_from_file("input/network.1.in", csr=True)
+        path, power = g.min_power(1, 20)
+        nodes, selected_path, selected_power = visualization.select(g, 1, 20, mode="path")
+        self.assertEqual((selected_path, selected_power), (path, power))
+        self.assertEqual(nodes[:len(path)], path)
+        self.assertEqual(set(nodes), set(path) | {v for node in path for v, p, d in g.graph[node]})
+        self.assertEqual(visualization.neighborhood(g, 1, 0), [1])
+        self.assertEqual(set(visualization.neighborhood(g, 1, 1)), {1} | {v for v, p, d in g.graph[1]})
+        with self.assertRaises(ValueError):
+            visualization.select(g, 1, 20, mode="other")
+
+    def test_write_dot(self):
+        g = graph_from_file("input/network.1.in")
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "g.gv")
+            nb_edges = g.write_dot(filename, 1, 20, mode="neighborhood", hops=1)
+            with open(filename) as fichier:
+                lines = fichier.read().splitlines()
+        self.assertEqual(lines[0], "graph G {")
+        self.assertEqual(lines[-1], "}")
+        self.assertEqual(sum(" -- " in line for line in lines), nb_edges)
+        self.assertTrue(any("color=blue" in line for line in lines))
+        self.assertIn('  "1" [color=green];', lines)
+
+    def test_graphviz(self):
+        try:
+            import graphviz
+        except ImportError:
+            self.skipTest("graphviz is not installed")
+        g = graph_from_file("input/network.00.in")
+        representation = g.representation_graph("input/network.00.in", 1, 4, view=False)
+        self.assertIn("color=blue", representation.source)
+        self.assertEqual(representation.source.count(" -- "), g.nb_edges)
+
+if __name__ == '__main__':
+    unittest.main()